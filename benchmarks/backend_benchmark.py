@@ -0,0 +1,140 @@
+# benchmarks/backend_benchmark.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+PostgreSQL ↔ gömülü SQLite: açılış süresi ve işlem başına gecikme
+
+Kullanım:
+    python -m benchmarks.backend_benchmark                 # iki arka uç
+    python -m benchmarks.backend_benchmark --arka-uc sqlite --tekrar 500
+
+Açılış: arka ucun kurulması + ilk bağlantı + ilk sorgu (giriş sorgusu).
+SQLite iki kez ölçülür: boş dosya (şema kurulumu dahil) ve hazır dosya.
+
+Her arka uçta geçici bir ölçüm hastası açılır, ölçümler 2099 yılına yazılır
+ve bitişte hasta tüm kayıtlarıyla silinir; gerçek hasta verisine dokunulmaz.
+SQLite geçici bir klasörde çalışır.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from core.database import Database
+from core.db_backends import create_backend
+
+_TC = "00000000047"
+_SIFRE = "bench"
+_SLOT_SAATLERI = (7, 12, 15, 18, 22)
+_BASLANGIC = date(2099, 1, 1)
+
+
+def _ozet(sureler):
+    sureler = sorted(sureler)
+    return dict(
+        ortalama=statistics.fmean(sureler),
+        p50=sureler[len(sureler) // 2],
+        p95=sureler[max(int(len(sureler) * 0.95) - 1, 0)],
+        maks=sureler[-1],
+    )
+
+
+def _acilis(backend_fn):
+    """Arka uç + ilk bağlantı + ilk sorgu süresi (ms); (süre, db) döndürür."""
+    t0 = time.perf_counter()
+    db = Database(backend=backend_fn())
+    db.connect()
+    db.get_user_by_tc(_TC)
+    return (time.perf_counter() - t0) * 1000, db
+
+
+def _hasta_ac(db: Database) -> int:
+    db.add_user(_TC, "Ölçüm", "Hastası", _SIFRE, date(1990, 1, 1),
+                "Diğer", "bench@example.invalid", "hasta")
+    return db.get_user_by_tc(_TC)[0]
+
+
+def _hasta_sil(db: Database, hasta_id: int) -> None:
+    with db.transaction():
+        for tablo in ("kan_sekeri_olcumleri", "insulin_onerileri", "uyarilar",
+                      "doktor_uyari_gunleri", "uyum_ozeti"):
+            db.execute_query(f"DELETE FROM {tablo} WHERE hasta_id = %s;", (hasta_id,))
+        db.execute_query("DELETE FROM kullanicilar WHERE id = %s;", (hasta_id,))
+
+
+def _islemler(db: Database, hasta_id: int, tekrar: int):
+    """İşlem adı → çağrılabilir (her çağrı bir kullanıcı eylemi)."""
+    zamanlar = iter(
+        (datetime.combine(_BASLANGIC + timedelta(days=i // 5), datetime.min.time())
+         .replace(hour=_SLOT_SAATLERI[i % 5], minute=30), 60 + (i * 37) % 200)
+        for i in range(tekrar)
+    )
+    return {
+        "giriş": lambda: db.login_user(_TC, _SIFRE),
+        "ölçüm kaydı": lambda: db.ingest_blood_sugar(hasta_id, *next(zamanlar)),
+        "uyarıları oku": lambda: db.get_alerts(hasta_id),
+        "insülin önerileri": lambda: db.get_insulin_suggestions(hasta_id),
+        "uyum oranı": lambda: db.get_recommendation_progress(hasta_id),
+        "doktor uyarıları": lambda: db.generate_all_doctor_alerts(hasta_id),
+    }
+
+
+def _olc(backend_fn, tekrar: int):
+    sonuc = {}
+    with contextlib.redirect_stdout(io.StringIO()):      # uygulama print'leri ölçüme karışmasın
+        sonuc["açılış"], db = _acilis(backend_fn)
+        hasta_id = db.get_user_by_tc(_TC)
+        hasta_id = hasta_id[0] if hasta_id else _hasta_ac(db)
+        try:
+            for ad, fn in _islemler(db, hasta_id, tekrar).items():
+                sureler = []
+                for _ in range(tekrar):
+                    t0 = time.perf_counter()
+                    fn()
+                    sureler.append((time.perf_counter() - t0) * 1000)
+                sonuc[ad] = _ozet(sureler)
+        finally:
+            _hasta_sil(db, hasta_id)
+            db.close()
+    return sonuc
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--arka-uc", choices=("postgresql", "sqlite", "ikisi"), default="ikisi")
+    ap.add_argument("--tekrar", type=int, default=200, help="işlem başına tekrar sayısı")
+    args = ap.parse_args()
+
+    sonuclar = {}
+    if args.arka_uc in ("sqlite", "ikisi"):
+        yol = os.path.join(tempfile.mkdtemp(prefix="diyabet_bench_"), "bench.db")
+        fn = lambda: create_backend("sqlite", path=yol)
+        sonuclar["sqlite"] = _olc(fn, args.tekrar)            # boş dosya: şema kurulur
+        with contextlib.redirect_stdout(io.StringIO()):
+            hazir, db = _acilis(fn)
+            db.close()
+        sonuclar["sqlite"]["açılış (hazır dosya)"] = hazir
+    if args.arka_uc in ("postgresql", "ikisi"):
+        try:
+            sonuclar["postgresql"] = _olc(lambda: create_backend("postgresql"), args.tekrar)
+        except Exception as e:      # sunucu/psycopg2 yoksa SQLite sonuçları yine yazılsın
+            print(f"PostgreSQL ölçülemedi: {e}")
+
+    for arka_uc, r in sonuclar.items():
+        print(f"\n== {arka_uc} ==")
+        for ad in [k for k in r if k.startswith("açılış")]:
+            print(f"{ad:<24}{r[ad]:>10.1f} ms")
+        print(f"{'işlem':<24}{'ort (ms)':>10}{'p50':>10}{'p95':>10}{'maks':>10}")
+        for ad, o in r.items():
+            if isinstance(o, dict):
+                print(f"{ad:<24}{o['ortalama']:>10.3f}{o['p50']:>10.3f}{o['p95']:>10.3f}{o['maks']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
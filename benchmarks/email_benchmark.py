@@ -0,0 +1,155 @@
+# benchmarks/email_benchmark.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Giriş e-postası: her iletide yeni SMTP oturumu ↔ kalıcı kuyruk + tek oturum
+
+Kullanım:
+    python -m benchmarks.email_benchmark                     # 50 ileti, 300 ms kurulum
+    python -m benchmarks.email_benchmark --ileti 200 --kurulum-ms 800 --parti 50
+
+Gerçek sunucuya bağlanılmaz; süreç içinde küçük bir deneme SMTP sunucusu
+açılır. Her yeni bağlantı karşılamadan önce --kurulum-ms kadar bekletilir
+(gerçek sunucudaki TCP + STARTTLS + AUTH el sıkışmasının yerine). Ölçülenler:
+• eski  → send_login_email'in önceki hâli: ileti başına bağlan/gönder/kapat,
+          hepsi çağıranın (Tk) iş parçacığında
+• kuyruk → core.email_outbox: arayüzü bekleten yalnızca kuyruğa yazma; gönderim
+           arka planda tek oturumla, partiler hâlinde
+"reddet" içeren alıcılar 550 ile reddedilir (kalıcı hata → 'basarisiz').
+Kuyruk geçici klasördeki SQLite veritabanında tutulur.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import smtplib
+import socketserver
+import statistics
+import tempfile
+import threading
+import time
+from email.mime.text import MIMEText
+
+from core.db_backends import create_backend
+from core.email_outbox import EmailOutbox
+from core.email_utils import login_email
+from data.config import EMAIL_CONFIG
+
+
+class _SmtpIsleyici(socketserver.StreamRequestHandler):
+    """EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT — ölçüm için yeterli alt küme"""
+
+    def yaz(self, satir: str) -> None:
+        self.wfile.write((satir + "\r\n").encode())
+
+    def handle(self) -> None:
+        time.sleep(self.server.kurulum_s)
+        self.yaz("220 deneme ESMTP")
+        while True:
+            satir = self.rfile.readline()
+            if not satir:
+                return
+            komut = satir.decode(errors="replace").strip()
+            ust = komut.upper()
+            if ust.startswith("EHLO"):
+                self.yaz("250-deneme")
+                self.yaz("250 8BITMIME")
+            elif ust.startswith(("HELO", "MAIL", "RSET", "NOOP")):
+                self.yaz("250 OK")
+            elif ust.startswith("RCPT"):
+                self.yaz("550 alıcı reddedildi" if "reddet" in komut else "250 OK")
+            elif ust == "DATA":
+                self.yaz("354 devam")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.alinan += 1
+                self.yaz("250 OK")
+            elif ust == "QUIT":
+                self.yaz("221 güle güle")
+                return
+            else:
+                self.yaz("502 desteklenmiyor")
+
+
+class _DenemeSunucusu(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, kurulum_ms: float):
+        super().__init__(("127.0.0.1", 0), _SmtpIsleyici)
+        self.kurulum_s = kurulum_ms / 1000
+        self.alinan = 0
+
+
+def _eski_gonder(port: int, alici: str) -> None:
+    """Önceki send_login_email: her iletide bağlan, gönder, kapat"""
+    konu, mesaj = login_email(alici, "sifre", "12345678901")
+    msg = MIMEText(mesaj, "plain")
+    msg["From"], msg["To"], msg["Subject"] = "bench@example.invalid", alici, konu
+    server = smtplib.SMTP("127.0.0.1", port, timeout=10)
+    server.send_message(msg)
+    server.quit()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--ileti", type=int, default=50, help="gönderilecek ileti sayısı")
+    ap.add_argument("--kurulum-ms", type=float, default=300.0,
+                    help="yeni SMTP bağlantısı başına yapay el sıkışma süresi")
+    ap.add_argument("--parti", type=int, default=EMAIL_CONFIG['batch_size'])
+    ap.add_argument("--reddet", type=int, default=2, help="reddedilecek alıcı sayısı")
+    args = ap.parse_args()
+
+    sunucu = _DenemeSunucusu(args.kurulum_ms)
+    threading.Thread(target=sunucu.serve_forever, daemon=True).start()
+    port = sunucu.server_address[1]
+    alicilar = [f"hasta{i}@example.invalid" for i in range(args.ileti - args.reddet)]
+    alicilar += [f"reddet{i}@example.invalid" for i in range(args.reddet)]
+
+    # Eski yöntem (reddedilenler hata verir; sadece süre ölçülür)
+    eski = []
+    for alici in alicilar:
+        t0 = time.perf_counter()
+        with contextlib.suppress(smtplib.SMTPException):
+            _eski_gonder(port, alici)
+        eski.append((time.perf_counter() - t0) * 1000)
+
+    # Kuyruk
+    yol = os.path.join(tempfile.mkdtemp(prefix="diyabet_bench_"), "bench.db")
+    kuyruk = EmailOutbox(**{**EMAIL_CONFIG, "host": "127.0.0.1", "port": port, "user": None,
+                            "starttls": False, "batch_size": args.parti, "poll_interval": 0.2},
+                         backend=create_backend("sqlite", path=yol))
+    kuyruk.enqueue("isinma@example.invalid", "ısınma", "-")       # şema göçü ve bağlantı ısınsın
+    kuyruk.wait_idle(30)
+    ekleme = []
+    t_bas = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for alici in alicilar:
+            konu, mesaj = login_email(alici, "sifre", "12345678901")
+            t0 = time.perf_counter()
+            kuyruk.enqueue(alici, konu, mesaj)
+            ekleme.append((time.perf_counter() - t0) * 1000)
+        time.sleep(0.05)
+        kuyruk.wait_idle(600)
+    bosalma = time.perf_counter() - t_bas
+    ist = kuyruk.stats()
+    kuyruk.stop()
+    sunucu.shutdown()
+
+    print(f"{args.ileti} ileti, yeni bağlantı başına {args.kurulum_ms:.0f} ms kurulum\n")
+    print(f"{'':<30}{'eski':>12}{'kuyruk':>12}")
+    print(f"{'arayüz bekleme / ileti (medyan)':<30}{statistics.median(eski):>10.1f}ms"
+          f"{statistics.median(ekleme):>10.1f}ms")
+    print(f"{'arayüz bekleme (toplam)':<30}{sum(eski) / 1000:>11.2f}s{sum(ekleme) / 1000:>11.2f}s")
+    print(f"{'tümü teslim':<30}{sum(eski) / 1000:>11.2f}s{bosalma:>11.2f}s")
+    print(f"{'SMTP oturumu':<30}{len(alicilar):>12}{ist['smtp_oturumu']:>12}")
+    print(f"\nkuyruk: {ist['kuyruk']}")
+    if ist["gonderim_ms"]:
+        print(f"gönderim p50 {ist['gonderim_ms']['p50']:.1f} ms, p95 {ist['gonderim_ms']['p95']:.1f} ms; "
+              f"kuyrukta bekleme p95 {ist['bekleme_s']['p95']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/graph_benchmark.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+İlişkisel grafik (show_combined_graph) çizim süresi: nokta başına scatter ↔ vektörel
+
+Kullanım:
+    python -m benchmarks.graph_benchmark                     # 100, 1000, 10000 gün
+    python -m benchmarks.graph_benchmark --gun 100 1000 --tekrar 5
+
+Her gün sayısı için sentetik (tarih, diyet, diyet durumu, egzersiz durumu,
+ortalama) satırları üretilir ve iki yöntemle Agg tuvaline çizilir:
+• eski     → gün başına bir ax.scatter, "%d.%m" metin ekseni (önceki sürüm)
+• vektörel → core.graph_utils.build_combined_figure: grup başına tek scatter,
+             tarih ekseni, piksel genişliğini aşınca LTTB seyreltmesi
+Figür kurulumu + canvas.draw() süresi (medyan) ve çizim nesnesi sayısı yazılır.
+Veritabanı ve ekran gerekmez.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+import matplotlib
+matplotlib.use("Agg")                      # ekran yok; eski yöntemin pyplot figürleri Agg ile açılır
+
+import matplotlib.pyplot as plt            # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg      # noqa: E402
+
+from core.graph_utils import build_combined_figure      # noqa: E402
+
+_DIYETLER = ["Az Şekerli", "Şekersiz", "Dengeli Beslenme"]
+
+
+def _satirlar(gun_sayisi: int):
+    rnd = random.Random(gun_sayisi)
+    bas = date(2000, 1, 1)
+    return [
+        (bas + timedelta(days=i), rnd.choice(_DIYETLER), rnd.random() < 0.6,
+         rnd.random() < 0.5, round(rnd.uniform(70, 250), 2))
+        for i in range(gun_sayisi)
+    ]
+
+
+def _eski_figur(rows):
+    """Önceki _draw_combined_graph çizim döngüsü (lejant hariç)"""
+    renk_haritasi = {}
+    renkler_listesi = ["blue", "green", "orange", "purple", "red", "brown"]
+    marker_map = {True: "o", False: "X"}
+    tarihler, seviyeler, renkler, markerlar = [], [], [], []
+    for tarih, diyet, _, egzersiz_durumu, ort in rows:
+        if diyet not in renk_haritasi:
+            renk_haritasi[diyet] = renkler_listesi[len(renk_haritasi) % len(renkler_listesi)]
+        tarihler.append(tarih.strftime("%d.%m"))
+        seviyeler.append(ort)
+        renkler.append(renk_haritasi[diyet])
+        markerlar.append(marker_map[egzersiz_durumu])
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for i in range(len(tarihler)):
+        ax.scatter(tarihler[i], seviyeler[i], color=renkler[i], marker=markerlar[i], s=100)
+    ax.plot(tarihler, seviyeler, color="gray", linestyle='-', linewidth=1, alpha=0.5)
+    ax.tick_params(axis='x', rotation=45)
+    return fig
+
+
+def _olc(kur, rows, tekrar: int):
+    sureler, nesne = [], 0
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        fig = kur(rows)
+        FigureCanvasAgg(fig).draw()          # pyplot dışı figürün de tuvali olsun
+        sureler.append((time.perf_counter() - t0) * 1000)
+        nesne = sum(len(ax.collections) + len(ax.lines) for ax in fig.axes)
+        plt.close(fig)
+    return statistics.median(sureler), nesne
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--gun", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--tekrar", type=int, default=3, help="boyut başına tekrar sayısı")
+    args = ap.parse_args()
+
+    print(f"{'gün':>7}{'eski ms':>12}{'nesne':>8}{'vektörel ms':>14}{'nesne':>8}{'hızlanma':>10}")
+    for n in args.gun:
+        rows = _satirlar(n)
+        eski, eski_nesne = _olc(_eski_figur, rows, args.tekrar)
+        yeni, yeni_nesne = _olc(lambda r: build_combined_figure("gun", r), rows, args.tekrar)
+        print(f"{n:>7}{eski:>12.1f}{eski_nesne:>8}{yeni:>14.1f}{yeni_nesne:>8}{eski / yeni:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/ingest_benchmark.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Ölçüm kaydı başına gecikme: eski çok adımlı yol ↔ kan_sekeri_ekle (tek round-trip)
+
+Kullanım:
+    python -m benchmarks.ingest_benchmark --hasta-id 3 --adet 200
+
+Ölçümler 2099 yılına yazılır ve bitişte o tarihlere ait tüm kayıtlar
+(ölçüm, insülin önerisi, uyarı) silinir; gerçek hasta verisine dokunulmaz.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from core.database import Database
+
+_SLOT_SAATLERI = (7, 12, 15, 18, 22)   # olcum_zamanlari başlangıç saatleri
+_BASLANGIC = date(2099, 1, 1)
+
+
+def _zamanlar(adet: int, gun_kaydir: int = 0):
+    for i in range(adet):
+        gun = _BASLANGIC + timedelta(days=gun_kaydir + i // len(_SLOT_SAATLERI))
+        saat = _SLOT_SAATLERI[i % len(_SLOT_SAATLERI)]
+        yield datetime(gun.year, gun.month, gun.day, saat, 30), 60 + (i * 37) % 200
+
+
+def _eski_kaydet(db: Database, hasta_id: int, olcum_dt: datetime, seviye: int) -> None:
+    """patient_window.kaydet'in tek round-trip öncesi akışı."""
+    with db.transaction():
+        zaman_kayitlari = db.fetch_all(
+            "SELECT id, saat_baslangic, saat_bitis FROM olcum_zamanlari"
+        )
+        zaman_id = None
+        for z_id, bas, bit in zaman_kayitlari:
+            if bas <= olcum_dt.time() <= bit:
+                zaman_id = z_id
+                break
+        if zaman_id is not None and db.fetch_one(
+            """
+            SELECT id FROM kan_sekeri_olcumleri
+            WHERE hasta_id = %s AND DATE(olcum_zamani) = %s AND olcum_zamani_id = %s
+            """,
+            (hasta_id, olcum_dt.date(), zaman_id),
+        ):
+            return
+        db.add_blood_sugar_log(hasta_id, olcum_dt, zaman_id, seviye)
+        db.check_insulin_data_alert(hasta_id, olcum_dt.date())
+
+
+def _yeni_kaydet(db: Database, hasta_id: int, olcum_dt: datetime, seviye: int) -> None:
+    db.ingest_blood_sugar(hasta_id, olcum_dt, seviye)
+
+
+def _olc(fn, db: Database, hasta_id: int, adet: int, gun_kaydir: int):
+    sureler = []
+    for olcum_dt, seviye in _zamanlar(adet, gun_kaydir):
+        t0 = time.perf_counter()
+        fn(db, hasta_id, olcum_dt, seviye)
+        sureler.append((time.perf_counter() - t0) * 1000)
+    sureler.sort()
+    return dict(
+        ortalama=statistics.fmean(sureler),
+        p50=sureler[len(sureler) // 2],
+        p95=sureler[int(len(sureler) * 0.95) - 1],
+        maks=sureler[-1],
+    )
+
+
+def _temizle(db: Database, hasta_id: int) -> None:
+    with db.transaction():
+        db.execute_query(
+            "DELETE FROM kan_sekeri_olcumleri WHERE hasta_id = %s AND olcum_zamani >= %s;",
+            (hasta_id, _BASLANGIC))
+        db.execute_query(
+            "DELETE FROM insulin_onerileri WHERE hasta_id = %s AND tarih >= %s;",
+            (hasta_id, _BASLANGIC))
+        db.execute_query(
+            "DELETE FROM uyarilar WHERE hasta_id = %s AND tarih >= %s;",
+            (hasta_id, _BASLANGIC))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--hasta-id", type=int, required=True)
+    ap.add_argument("--adet", type=int, default=200, help="yol başına ölçüm sayısı")
+    args = ap.parse_args()
+
+    db = Database(); db.connect()
+    try:
+        gun_sayisi = args.adet // len(_SLOT_SAATLERI) + 1
+        eski = _olc(_eski_kaydet, db, args.hasta_id, args.adet, 0)
+        yeni = _olc(_yeni_kaydet, db, args.hasta_id, args.adet, gun_sayisi)
+    finally:
+        _temizle(db, args.hasta_id)
+        db.close()
+
+    print(f"{'yol':<22}{'ort (ms)':>10}{'p50':>10}{'p95':>10}{'maks':>10}")
+    for ad, r in (("eski (çok adımlı)", eski), ("kan_sekeri_ekle", yeni)):
+        print(f"{ad:<22}{r['ortalama']:>10.2f}{r['p50']:>10.2f}{r['p95']:>10.2f}{r['maks']:>10.2f}")
+    print(f"hızlanma: {eski['ortalama'] / yeni['ortalama']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/oneriler_benchmark.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Öneri motoru: doğrusal kural taraması ↔ derlenmiş indeks ↔ toplu değerlendirme
+
+Kullanım:
+    python -m benchmarks.oneriler_benchmark                  # 1.000.000 değerlendirme
+    python -m benchmarks.oneriler_benchmark --adet 200000 --eski-adet 50000
+
+Sentetik kohort: kan şekeri 40–320 mg/dL (kural sınırları 70/110/180 ayrıca
+eklenir); 400 farklı belirti kümesinin yarısı kurallardaki kümeler (farklı
+yazım, büyük/küçük harf, fazla boşluk), yarısı rastgele kombinasyonlar. Ölçülenler:
+• eski     → önceki get_recommendations: her çağrıda normalize + _RULES taraması
+• indeks   → core.oneriler.get_recommendations (önbellekli normalize + sözlük + bisect)
+• toplu    → core.oneriler.get_recommendations_batch, değerlendirme başına küme
+• toplu+no → aynı fonksiyon, farklı kümeler listesi + küme numarası dizisi (set_index)
+Eski yöntem --eski-adet kadar örnekte ölçülür ve değerlendirme başına süre
+karşılaştırılır; tüm yöntemlerin sonuçlarının aynı olduğu denetlenir.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from core.oneriler import _RAW_RULES, _RULES, _normalize, get_recommendations, get_recommendations_batch
+
+_BELIRTILER = sorted({b for *_, s, _, _ in _RAW_RULES for b in s})
+
+
+def _eski(ks, symptoms):
+    """Önceki get_recommendations (normalize önbelleksiz, doğrusal tarama)"""
+    selected = {_normalize.__wrapped__(sym) for sym in symptoms}
+    for lo, hi, rule_set, diet, ex in _RULES:
+        if lo is not None and ks < lo:  continue
+        if hi is not None and ks > hi:  continue
+        if selected == rule_set:        return diet, ex
+    return None
+
+
+def _yazim(b: str, rnd: random.Random) -> str:
+    return rnd.choice([b, b.upper(), b.lower(), "  " + b.replace(" ", "   ") + " "])
+
+
+def _kohort(adet: int, tohum: int = 47):
+    """(seviyeler, farklı kümeler, küme numaraları) – kümeler 400 çeşitten seçilir"""
+    rnd = random.Random(tohum)
+    kural_kumeleri = [sorted(s) for *_, s, _, _ in _RAW_RULES]
+    cesitler = []
+    for _ in range(400):
+        if rnd.random() < 0.5:
+            cesitler.append([_yazim(b, rnd) for b in rnd.choice(kural_kumeleri)])
+        else:
+            cesitler.append(rnd.sample(_BELIRTILER, rnd.randint(1, 4)))
+    seviyeler = [rnd.choice([70.0, 110.0, 180.0]) if rnd.random() < 0.05
+                 else round(rnd.uniform(40, 320), 1) for _ in range(adet)]
+    numaralar = [rnd.randrange(len(cesitler)) for _ in range(adet)]
+    return seviyeler, cesitler, numaralar
+
+
+def _sure(fn):
+    t0 = time.perf_counter()
+    sonuc = fn()
+    return time.perf_counter() - t0, sonuc
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--adet", type=int, default=1_000_000, help="değerlendirme sayısı")
+    ap.add_argument("--eski-adet", type=int, default=200_000,
+                    help="doğrusal taramanın ölçüldüğü örnek sayısı")
+    args = ap.parse_args()
+
+    seviyeler, cesitler, numaralar = _kohort(args.adet)
+    kumeler = [list(cesitler[n]) for n in numaralar]          # kayıt başına ayrı liste
+    k = min(args.eski_adet, args.adet)
+
+    t_eski, r_eski = _sure(lambda: [_eski(ks, s) for ks, s in zip(seviyeler[:k], kumeler[:k])])
+    t_indeks, r_indeks = _sure(lambda: [get_recommendations(ks, s) for ks, s in zip(seviyeler, kumeler)])
+    t_toplu, r_toplu = _sure(lambda: get_recommendations_batch(seviyeler, kumeler))
+    t_no, r_no = _sure(lambda: get_recommendations_batch(seviyeler, cesitler, set_index=numaralar))
+
+    assert r_indeks[:k] == r_eski, "indeks sonuçları doğrusal taramadan farklı"
+    assert r_toplu == r_indeks and r_no == r_indeks, "toplu sonuçlar tekil sonuçlardan farklı"
+    eslesen = sum(r is not None for r in r_toplu)
+
+    print(f"{args.adet:,} değerlendirme ({eslesen:,} kurala uydu)\n")
+    print(f"{'yöntem':<10}{'örnek':>12}{'toplam sn':>12}{'µs/değ.':>10}{'hızlanma':>10}")
+    eski_us = t_eski / k * 1e6
+    for ad, adet, t in (("eski", k, t_eski), ("indeks", args.adet, t_indeks),
+                        ("toplu", args.adet, t_toplu), ("toplu+no", args.adet, t_no)):
+        us = t / adet * 1e6
+        print(f"{ad:<10}{adet:>12,}{t:>12.2f}{us:>10.2f}{eski_us / us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
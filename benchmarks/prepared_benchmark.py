@@ -0,0 +1,158 @@
+# benchmarks/prepared_benchmark.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Hazır ifade önbelleği: sık sorgularda kazanılan ayrıştırma/planlama süresi
+
+Kullanım:
+    python -m benchmarks.prepared_benchmark                  # iki arka uç
+    python -m benchmarks.prepared_benchmark --arka-uc postgresql --tekrar 2000
+
+Her işlem önbellek kapalı ve açık olarak aynı bağlantıda ölçülür:
+• PostgreSQL → PREPARED_CONFIG['prepared'] False / True (düz execute ↔ EXECUTE);
+               ayrıca EXPLAIN (SUMMARY) ile sorgu başına "Planning Time"
+• SQLite     → cached_statements 0 / SQLITE_CONFIG değeri (her çağrıda derleme ↔
+               bağlantının ifade önbelleği)
+
+Geçici bir ölçüm hastası açılır, kayıtlar 2099 yılına yazılır ve bitişte
+silinir; gerçek hasta verisine dokunulmaz. SQLite geçici klasörde çalışır.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, datetime
+
+from core.database import Database
+from core.db_backends import _positional, create_backend
+
+_TC = "00000000048"
+_SIFRE = "bench"
+_GUN = date(2099, 1, 1)
+
+# Planlama süresi ölçülen ifadeler (core/database.py'deki metinlerle aynı)
+_PLAN_SORGULARI = {
+    "get_user_by_tc": ("SELECT * FROM public.kullanicilar WHERE tc_no = %s;", lambda h: (_TC,)),
+    "günlük ölçümler": ("""
+            SELECT seviye, olcum_zamani_id
+            FROM kan_sekeri_olcumleri
+            WHERE hasta_id = %s AND olcum_zamani >= %s AND olcum_zamani < %s;
+        """, lambda h: (h, *Database._day_range(_GUN))),
+}
+
+
+def _hasta_hazirla(db: Database) -> int:
+    if not db.get_user_by_tc(_TC):
+        db.add_user(_TC, "Hazır", "İfade", _SIFRE, date(1990, 1, 1),
+                    "Diğer", "bench@example.invalid", "hasta")
+    hasta_id = db.get_user_by_tc(_TC)[0]
+    for saat in (7, 12, 18):
+        db.ingest_blood_sugar(hasta_id, datetime.combine(_GUN, datetime.min.time()).replace(hour=saat), 140)
+    return hasta_id
+
+
+def _hasta_sil(db: Database, hasta_id: int) -> None:
+    with db.transaction():
+        for tablo in ("kan_sekeri_olcumleri", "insulin_onerileri", "uyarilar",
+                      "doktor_uyari_gunleri", "uyum_ozeti"):
+            db.execute_query(f"DELETE FROM {tablo} WHERE hasta_id = %s;", (hasta_id,))
+        db.execute_query("DELETE FROM kullanicilar WHERE id = %s;", (hasta_id,))
+
+
+def _islemler(db: Database, hasta_id: int):
+    """Her tıklamada çalışan sorgular (hepsi prepared=True ile çağrılır)."""
+    def gunluk_insulin():
+        with db.transaction():
+            db._check_insulin_data_alert(hasta_id, _GUN)
+
+    return {
+        "get_user_by_tc": lambda: db.get_user_by_tc(_TC),
+        "giriş": lambda: db.login_user(_TC, _SIFRE),
+        "günlük ölçüm uyarısı": gunluk_insulin,
+        "insülin önerileri": lambda: db.get_insulin_suggestions(hasta_id),
+    }
+
+
+def _sure(fn, tekrar: int) -> float:
+    """Çağrı başına medyan süre (µs)."""
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        fn()
+        sureler.append((time.perf_counter() - t0) * 1e6)
+    return statistics.median(sureler)
+
+
+def _planlama_suresi(db: Database, sql: str, params, tekrar: int):
+    """PostgreSQL: (düz sorgu, EXECUTE) için ortalama Planning Time (ms)."""
+    sonuc = []
+    with db.connection.cursor() as cur:
+        for hedef in (sql, "EXECUTE plan_olcum (" + ", ".join(["%s"] * len(params)) + ")"):
+            if hedef is not sql:
+                cur.execute(f"PREPARE plan_olcum AS {_positional(sql).strip().rstrip(';')};")
+            toplam = 0.0
+            for _ in range(tekrar):
+                cur.execute("EXPLAIN (SUMMARY, FORMAT JSON) " + hedef.strip().rstrip(";"), params)
+                toplam += cur.fetchone()[0][0]["Planning Time"]
+            sonuc.append(toplam / tekrar)
+        cur.execute("DEALLOCATE plan_olcum;")
+    db.connection.rollback()
+    return sonuc
+
+
+def _olc(backend_kapali, backend_acik, tekrar: int, planlama: bool):
+    sonuc = {}
+    with contextlib.redirect_stdout(io.StringIO()):      # uygulama print'leri ölçüme karışmasın
+        for etiket, backend in (("kapalı", backend_kapali), ("açık", backend_acik)):
+            db = Database(backend=backend)
+            db.connect()
+            hasta_id = _hasta_hazirla(db)
+            try:
+                for ad, fn in _islemler(db, hasta_id).items():
+                    fn()                                  # ilk çağrı: bağlantı/önbellek ısınsın
+                    sonuc.setdefault(ad, {})[etiket] = _sure(fn, tekrar)
+                if planlama and etiket == "açık":
+                    for ad, (sql, params) in _PLAN_SORGULARI.items():
+                        sonuc[f"plan: {ad}"] = _planlama_suresi(db, sql, params(hasta_id), tekrar // 10 or 1)
+            finally:
+                _hasta_sil(db, hasta_id)
+                db.close()
+    return sonuc
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--arka-uc", choices=("postgresql", "sqlite", "ikisi"), default="ikisi")
+    ap.add_argument("--tekrar", type=int, default=1000, help="işlem başına tekrar sayısı")
+    args = ap.parse_args()
+
+    sonuclar = {}
+    if args.arka_uc in ("sqlite", "ikisi"):
+        yol = os.path.join(tempfile.mkdtemp(prefix="diyabet_bench_"), "bench.db")
+        sonuclar["sqlite"] = _olc(create_backend("sqlite", path=yol, cached_statements=0),
+                                  create_backend("sqlite", path=yol), args.tekrar, planlama=False)
+    if args.arka_uc in ("postgresql", "ikisi"):
+        try:
+            sonuclar["postgresql"] = _olc(create_backend("postgresql", prepared=False),
+                                          create_backend("postgresql", prepared=True),
+                                          args.tekrar, planlama=True)
+        except Exception as e:      # sunucu/psycopg2 yoksa SQLite sonuçları yine yazılsın
+            print(f"PostgreSQL ölçülemedi: {e}")
+
+    for arka_uc, r in sonuclar.items():
+        print(f"\n== {arka_uc} (çağrı başına medyan, µs) ==")
+        print(f"{'işlem':<26}{'önbellek yok':>14}{'önbellek':>12}{'kazanç':>10}")
+        for ad, o in r.items():
+            if isinstance(o, dict):
+                print(f"{ad:<26}{o['kapalı']:>14.1f}{o['açık']:>12.1f}{1 - o['açık'] / o['kapalı']:>10.0%}")
+        for ad, (duz, hazir) in ((k, v) for k, v in r.items() if not isinstance(v, dict)):
+            print(f"{ad:<26}{'Planning Time':>14} {duz:.3f} ms → {hazir:.3f} ms (EXECUTE)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/startup_benchmark.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Soğuk açılış süresi: main.py → giriş ekranı → paneller (python -X importtime)
+
+Kullanım:
+    python -m benchmarks.startup_benchmark                   # bütçe denetimi
+    python -m benchmarks.startup_benchmark --tekrar 9 --en-agir 15
+    python -m benchmarks.startup_benchmark --butce-ms 300
+
+Her hedef ayrı, taze bir yorumlayıcıda "-X importtime -c 'import <hedef>'"
+ile içe aktarılır; stderr'deki kümülatif süreler (µs) okunur ve medyan
+alınır. Hedefler:
+• main                → rol seçimi ekranı açılmadan önce yüklenenler
+• gui.doctor_window   → doktor paneli (girişten sonra)
+• gui.patient_window  → hasta paneli (girişten sonra)
+• core.graph_utils    → ilk grafik (ısınma bunu panelden sonra arka plana alır)
+
+Gerileme denetimi (çıkış kodu 1):
+• "import main" medyanı STARTUP_CONFIG['import_budget_ms'] değerini aşarsa
+• main ya da panel modülleri STARTUP_CONFIG['deferred_modules'] listesindeki
+  bir paketi (matplotlib, numpy, PIL) açılışta yüklerse
+Veritabanı ve ekran gerekmez; modül kodu çalışır ama pencere açılmaz.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from data.config import STARTUP_CONFIG
+
+_HEDEFLER = ["main", "gui.doctor_window", "gui.patient_window", "core.graph_utils"]
+_ERTELENMIS_DENETIM = {"main", "gui.doctor_window", "gui.patient_window"}
+_SATIR = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+_KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _importtime(hedef: str) -> Dict[str, Tuple[int, int]]:
+    """hedef'i taze yorumlayıcıda içe aktarır → {modül: (öz µs, kümülatif µs)}"""
+    cikti = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {hedef}"],
+        cwd=_KOK, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if cikti.returncode != 0:
+        son = cikti.stderr.strip().splitlines()[-1:] or ["?"]
+        raise SystemExit(f"{hedef} içe aktarılamadı: {son[0]}")
+    moduller = {}
+    for satir in cikti.stderr.splitlines():
+        m = _SATIR.match(satir)
+        if m:
+            moduller[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    return moduller
+
+
+def _olc(hedef: str, tekrar: int):
+    """(medyan kümülatif ms, son çalıştırmanın modül tablosu)"""
+    _importtime(hedef)                    # .pyc ve disk önbelleği ısınsın
+    sureler, moduller = [], {}
+    for _ in range(tekrar):
+        moduller = _importtime(hedef)
+        sureler.append(moduller[hedef][1] / 1000)
+    return statistics.median(sureler), moduller
+
+
+def _ertelenmis_yuklenen(moduller: Dict[str, Tuple[int, int]]) -> List[str]:
+    paketler = STARTUP_CONFIG['deferred_modules']
+    return sorted({ad.split(".")[0] for ad in moduller
+                   if ad.split(".")[0] in paketler})
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tekrar", type=int, default=5, help="hedef başına ölçüm sayısı")
+    ap.add_argument("--en-agir", type=int, default=10,
+                    help="main için listelenecek en yavaş (öz süre) modül sayısı")
+    ap.add_argument("--butce-ms", type=float, default=STARTUP_CONFIG['import_budget_ms'],
+                    help="'import main' için üst sınır (ms)")
+    args = ap.parse_args()
+
+    hatalar = []
+    main_moduller = {}
+    print(f"{'hedef':<22}{'medyan ms':>12}{'modül':>8}  ertelenmesi gereken yüklenenler")
+    for hedef in _HEDEFLER:
+        medyan, moduller = _olc(hedef, args.tekrar)
+        yuklenen = _ertelenmis_yuklenen(moduller)
+        print(f"{hedef:<22}{medyan:>12.1f}{len(moduller):>8}  {', '.join(yuklenen) or '-'}")
+        if hedef == "main":
+            main_moduller = moduller
+            if medyan > args.butce_ms:
+                hatalar.append(f"import main {medyan:.1f} ms > bütçe {args.butce_ms:.0f} ms")
+        if hedef in _ERTELENMIS_DENETIM and yuklenen:
+            hatalar.append(f"{hedef} açılışta yüklüyor: {', '.join(yuklenen)}")
+
+    print(f"\nimport main – en yavaş {args.en_agir} modül (öz süre):")
+    for ad, (oz, kum) in sorted(main_moduller.items(), key=lambda x: -x[1][0])[:args.en_agir]:
+        print(f"  {oz / 1000:>8.1f} ms  (kümülatif {kum / 1000:>7.1f})  {ad}")
+
+    if hatalar:
+        print("\nGERİLEME:")
+        for h in hatalar:
+            print(f"  • {h}")
+        sys.exit(1)
+    print(f"\nTamam: import main bütçe ({args.butce_ms:.0f} ms) içinde.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# core/async_db.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Arka plan veritabanı yürütücüsü: Tk olay döngüsü sorgu beklerken donmaz.
+
+• İşler küçük bir iş parçacığı havuzunda çalışır; her iş parçacığının kendi
+  Database nesnesi ve bağlantısı vardır (bağlantılar iş parçacıkları arasında
+  paylaşılmaz, hazır ifade önbelleği sıcak kalır)
+• submit(fn, ...) → Future; fn ilk argüman olarak o iş parçacığının db'sini alır
+• Sonuç Tk iş parçacığına widget.after() yoklamasıyla teslim edilir — Tk
+  nesnelerine yalnızca ana iş parçacığından dokunulur
+• run_async bekleme süresince pencerede "Yükleniyor…" durumu gösterir
+• stream_async uzun sonuçları parça parça akıtır (Database.fetch_iter)
+
+    run_async(win, lambda db: db.get_insulin_averages_for_graph(hasta_id),
+              on_success=ciz)
+"""
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, List, Optional
+
+from core.database import Database
+from data.config import DB_EXECUTOR_CONFIG
+
+
+class DbExecutor:
+    def __init__(self, max_workers: int = 3):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._local = threading.local()
+
+    def _db(self) -> Database:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = Database()
+        db.connect()                  # bağlantı koparak bırakıldıysa yeniden al
+        if db.connection is None:
+            raise RuntimeError("Veritabanına bağlanılamadı.")
+        return db
+
+    def _run(self, fn: Callable[..., Any], args, kwargs):
+        db = self._db()
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            # Okuma sorgularının açtığı örtük işlemi kapat (idle in transaction kalmasın);
+            # bağlantı bozulduysa iade et, sonraki iş yenisini alır
+            try:
+                db.connection.rollback()
+            except Exception:
+                db.close()
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        return self._pool.submit(self._run, fn, args, kwargs)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Süreç genelinde tek yürütücü
+# ────────────────────────────────────────────────────────────────────────────────
+_executor: Optional[DbExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> DbExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = DbExecutor(DB_EXECUTOR_CONFIG["max_workers"])
+                atexit.register(_executor.shutdown)
+    return _executor
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Tk tarafı
+# ────────────────────────────────────────────────────────────────────────────────
+def _show_error(e: BaseException) -> None:
+    from tkinter import messagebox
+    messagebox.showerror("Hata", f"Veritabanı işlemi başarısız:\n{e}")
+
+
+def deliver(widget, future: Future, on_success: Callable[[Any], None],
+            on_error: Optional[Callable[[BaseException], None]] = None) -> None:
+    """Future bitince sonucu Tk iş parçacığında on_success'e (hata → on_error) verir.
+    Widget bu arada kapanırsa sonuç atılır."""
+    def yokla() -> None:
+        if not widget.winfo_exists():
+            return
+        if not future.done():
+            widget.after(DB_EXECUTOR_CONFIG["poll_ms"], yokla)
+            return
+        hata = future.exception()
+        if hata is not None:
+            (on_error or _show_error)(hata)
+        else:
+            on_success(future.result())
+
+    widget.after(DB_EXECUTOR_CONFIG["poll_ms"], yokla)
+
+
+def show_loading(widget, text: str = "Yükleniyor…") -> Callable[[], None]:
+    """Widget'ın ortasına bekleme etiketi koyar, imleci bekleme imlecine çevirir.
+    Dönüş: durumu kaldıran fonksiyon"""
+    import tkinter as tk
+    etiket = tk.Label(widget, text=text, font=("Arial", 12, "italic"), fg="gray")
+    etiket.place(relx=0.5, rely=0.5, anchor="center")
+    top = widget.winfo_toplevel()
+    eski_imlec = top.cget("cursor")
+    top.config(cursor="watch")
+
+    def kaldir() -> None:
+        if etiket.winfo_exists():
+            etiket.destroy()
+        if top.winfo_exists():
+            top.config(cursor=eski_imlec)
+
+    return kaldir
+
+
+def run_async(widget, fn: Callable[..., Any], *args,
+              on_success: Callable[[Any], None],
+              on_error: Optional[Callable[[BaseException], None]] = None,
+              loading_text: Optional[str] = "Yükleniyor…", **kwargs) -> Future:
+    """fn(db, *args, **kwargs) arka planda çalışır; beklerken widget'ta yükleniyor
+    durumu gösterilir (loading_text=None → gösterilmez)."""
+    kaldir = show_loading(widget, loading_text) if loading_text else (lambda: None)
+
+    def basarili(sonuc):
+        kaldir()
+        on_success(sonuc)
+
+    def hatali(hata):
+        kaldir()
+        (on_error or _show_error)(hata)
+
+    future = get_executor().submit(fn, *args, **kwargs)
+    deliver(widget, future, basarili, hatali)
+    return future
+
+
+def stream_async(widget, fn: Callable[..., Iterable], on_chunk: Callable[[List], None],
+                 chunk_size: int = 500,
+                 on_done: Optional[Callable[[], None]] = None) -> Callable[[], None]:
+    """
+    fn(db) bir satır yineleyicisi döndürür (ör. db.fetch_iter(...)); satırlar
+    arka planda chunk_size'lık parçalar hâlinde okunur, Tk tarafında on_chunk'a
+    verilir. Kuyruk sınırlı olduğundan arka plan, arayüzün çok önüne geçmez.
+    Dönüş: iptal fonksiyonu (pencere kapanınca da kendiliğinden durur)
+    """
+    kuyruk: "queue.Queue" = queue.Queue(maxsize=4)
+    iptal = threading.Event()
+    bitti = object()
+
+    def koy(oge) -> bool:
+        while not iptal.is_set():
+            try:
+                kuyruk.put(oge, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def uret(db: Database) -> None:
+        son = bitti
+        rows = iter(())
+        try:
+            rows = iter(fn(db))
+            while not iptal.is_set():
+                parca = list(islice(rows, chunk_size))
+                if parca and not koy(parca):
+                    break
+                if len(parca) < chunk_size:
+                    break
+        except Exception as e:
+            son = e                                   # hata da kuyruktan Tk'ya gider
+        finally:
+            close = getattr(rows, "close", None)     # üreteçse imleci hemen kapat
+            if close:
+                close()
+            koy(son)
+
+    get_executor().submit(uret)
+    durum = {"kapandi": False}
+
+    def kapat() -> None:
+        if not durum["kapandi"]:
+            durum["kapandi"] = True
+            iptal.set()
+            if on_done:
+                on_done()
+
+    def yokla() -> None:
+        if durum["kapandi"]:
+            return
+        if not widget.winfo_exists():
+            kapat()
+            return
+        try:
+            while not durum["kapandi"]:          # on_chunk iptal etmiş olabilir
+                oge = kuyruk.get_nowait()
+                if oge is bitti or isinstance(oge, Exception):
+                    kapat()
+                    if oge is not bitti:
+                        _show_error(oge)
+                    return
+                on_chunk(oge)
+        except queue.Empty:
+            pass
+        if not durum["kapandi"]:
+            widget.after(DB_EXECUTOR_CONFIG["poll_ms"], yokla)
+
+    widget.after(DB_EXECUTOR_CONFIG["poll_ms"], yokla)
+    return kapat
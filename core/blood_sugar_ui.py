@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from core.database import Database
+from core.ui_stream import KeysetPager
 
 def show(hasta_id: int) -> None:
     win = tk.Toplevel()
@@ -23,17 +24,26 @@ def show(hasta_id: int) -> None:
 
     db.check_first_time_measurement_alert(hasta_id)
 
-    # Ölçüm verileri
-    logs = db.fetch_all("""
-        SELECT olcum_zamani, seviye
-        FROM kan_sekeri_olcumleri
-        WHERE hasta_id = %s
-        ORDER BY olcum_zamani DESC;
-    """, (hasta_id,))
-    for olcum_zamani, seviye in logs:
-        tarih = olcum_zamani.strftime("%d.%m.%Y")
-        saat = olcum_zamani.strftime("%H:%M:%S")
-        tree.insert("", "end", values=(tarih, saat, seviye))
+    # Ölçüm verileri: en yeni sayfa hemen gelir, eskiler "Daha Fazla" ile
+    # bir önceki sayfanın son satırından devam edilerek yüklenir
+    def olcum_sayfasi(after, limit):
+        sayfa_db = Database()
+        sayfa_db.connect()
+        try:
+            return sayfa_db.page_measurements(hasta_id, after, limit)
+        finally:
+            sayfa_db.close()
+
+    def add_logs(parca):
+        for olcum_zamani, seviye, _ in parca:
+            tarih = olcum_zamani.strftime("%d.%m.%Y")
+            saat = olcum_zamani.strftime("%H:%M:%S")
+            tree.insert("", "end", values=(tarih, saat, seviye))
+
+    more_btn = tk.Button(win, text="Daha Fazla")
+    more_btn.pack(pady=2)
+    KeysetPager(olcum_sayfasi, add_logs, key=lambda r: (r[0], r[2]),
+                button=more_btn, page_size=200).reset()
 
     # --- İnsülin Önerileri ---
     tk.Label(win, text="İnsülin Önerileri", font=("Arial", 14)).pack(pady=10)
@@ -82,12 +92,17 @@ def show(hasta_id: int) -> None:
 
         db = Database()
         db.connect()
-        db.execute_query("""
-            DELETE FROM kan_sekeri_olcumleri
-            WHERE hasta_id = %s AND olcum_zamani = %s
-        """, (hasta_id, ts))
+        db.delete_blood_sugar(hasta_id, ts)
+        dose_rows = db.get_insulin_suggestions(hasta_id)
         db.close()
         tree.delete(selected[0])
+
+        # Günün ortalaması/dozu silmeyle birlikte güncellendi
+        for i in dose_tv.get_children():
+            dose_tv.delete(i)
+        for tarih, ort, doz in dose_rows:
+            doz_str = "Yetersiz" if doz == -1 else f"{doz} ml"
+            dose_tv.insert("", "end", values=(tarih.strftime("%d.%m.%Y"), f"{ort:.2f}", doz_str))
         messagebox.showinfo("Başarılı", "Ölçüm silindi.")
 
     tk.Button(win, text="Seçili Ölçümü Sil", command=delete_selected_measurement).pack(pady=4)
@@ -160,9 +175,9 @@ def show(hasta_id: int) -> None:
         rows = db.fetch_all("""
             SELECT olcum_zamani, seviye
             FROM kan_sekeri_olcumleri
-            WHERE hasta_id = %s AND DATE(olcum_zamani) = %s
+            WHERE hasta_id = %s AND olcum_zamani >= %s AND olcum_zamani < %s
             ORDER BY olcum_zamani;
-        """, (hasta_id, datetime.strptime(tarih_str, "%d.%m.%Y").date()))
+        """, (hasta_id, *Database._day_range(datetime.strptime(tarih_str, "%d.%m.%Y"))))
         db.close()
 
         for olcum_zamani, seviye in rows:
@@ -1,49 +1,131 @@
-import psycopg2
-from data.config import DATABASE_CONFIG
 import hashlib
-from datetime import datetime
+from contextlib import closing, contextmanager
+from datetime import date, datetime, time, timedelta
+
+from core.db_backends import get_backend
+from core.query_stats import query_stats
+from core.reference_cache import reference_cache
+from data.config import FETCH_ITERSIZE, GRAPH_CONFIG
+
+# Doktor paneli uyarı tipleri. Metin data/migrations/0008 (ve sqlite/0002)
+# içindeki uyarilar_doktor_sayfa_idx kısmi indeks koşuluyla birebir aynı olmalı.
+_DOKTOR_UYARI_FILTRESI = """uyari_tipi IN (
+                'Acil Uyarı',
+                'Takip Uyarısı',
+                'İzleme Uyarısı',
+                'Acil Müdahale Uyarısı',
+                'Ölçüm Eksik Uyarısı',
+                'Ölçüm Yetersiz Uyarısı'
+            )"""
+
 
 class Database:
-    def __init__(self):
+    def __init__(self, backend=None):
         self.connection = None
+        self._tx_depth = 0      # iç içe transaction() bloklarının derinliği
+        self.backend = backend or get_backend()   # PostgreSQL ya da SQLite (core/db_backends.py)
 
     def connect(self):
-        """ Veritabanı bağlantısını kurar """
+        """ Arka uçtan bağlantı ödünç alır (PostgreSQL: paylaşılan havuz) """
+        if self.connection is not None:
+            return
         try:
-            self.connection = psycopg2.connect(
-                dbname=DATABASE_CONFIG['dbname'],
-                user=DATABASE_CONFIG['user'],
-                password=DATABASE_CONFIG['password'],
-                host=DATABASE_CONFIG['host'],
-                port=DATABASE_CONFIG['port']
-            )
-            print("Veritabanına bağlanıldı.")
+            self.connection = self.backend.acquire()
         except Exception as e:
             print(f"Veritabanı bağlantı hatası: {e}")
 
     def close(self):
-        """ Veritabanı bağlantısını kapatır """
+        """ Bağlantıyı arka uca iade eder (fiziksel bağlantı açık kalır) """
         if self.connection:
-            self.connection.close()
-            print("Veritabanı bağlantısı kapatıldı.")
+            self.backend.release(self.connection)
+            self.connection = None
+
+    def pool_stats(self):
+        """ Bu nesnenin arka ucunun havuz bekleme süresi ve ödünç alma istatistikleri """
+        return self.backend.stats()
 
-    def execute_query(self, query, params=None):
-        """ Sorgu çalıştırır ve hata kontrolü yapar """
+    @property
+    def is_sqlite(self):
+        return self.backend.name == "sqlite"
+
+    @staticmethod
+    def _day_range(the_date):
+        """
+        Günü yarı açık aralığa çevirir: [gün 00:00, ertesi gün 00:00)
+        DATE(olcum_zamani) = gün yerine bu aralıkla sorgulamak
+        (hasta_id, olcum_zamani) indeksinin kullanılmasını sağlar.
+        """
+        if isinstance(the_date, datetime):
+            the_date = the_date.date()
+        start = datetime.combine(the_date, time.min)
+        return start, start + timedelta(days=1)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Birim-iş (unit of work) bloğu:
+            with db.transaction():
+                db.execute_query(...)
+                db.execute_query(...)
+        • Blok içindeki tüm sorgular tek COMMIT ile yazılır
+        • Herhangi bir hata tüm bloğu geri alır ve hata yukarı iletilir
+        • İç içe bloklar dıştaki işleme katılır; COMMIT en dışta yapılır
+        """
+        if self.connection is None:
+            raise RuntimeError("transaction() için önce connect() çağrılmalı.")
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self.connection.rollback()
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            self.connection.commit()
+
+    @property
+    def in_transaction(self):
+        return self._tx_depth > 0
+
+    def _execute(self, cursor, query, params, prepared):
+        """prepared=True → arka ucun hazır ifade önbelleği (PostgreSQL: PREPARE/EXECUTE)"""
+        if prepared:
+            self.backend.execute_prepared(self.connection, cursor, query,
+                                          params or (), self.in_transaction)
+        else:
+            cursor.execute(self.backend.adapt(query), params or ())
+
+    def execute_query(self, query, params=None, prepared=False):
+        """
+        Sorgu çalıştırır.
+        • transaction() dışında: her sorgu ayrı commit edilir, hata yazdırılır
+        • transaction() içinde: commit blok sonunda yapılır, hata yükseltilir
+        • prepared=True: her tıklamada çalışan sabit metinli sorgular için;
+          bağlantı başına bir kez hazırlanır, sonra yalnızca EXECUTE edilir
+        """
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, params or ())
+            with query_stats.timed(query, params) as olcum, \
+                    closing(self.connection.cursor()) as cursor:
+                self._execute(cursor, query, params, prepared)
+                olcum["rows"] = cursor.rowcount
+            if not self.in_transaction:
                 self.connection.commit()
-                print("Sorgu başarıyla çalıştırıldı.")
         except Exception as e:
+            if self.in_transaction:
+                raise
             print(f"Sorgu çalıştırma hatası: {e}")
             self.connection.rollback()
 
-    def fetch_one(self, query, params=None):
+    def fetch_one(self, query, params=None, prepared=False):
         """ Tek bir kayıt döner """
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, params or ())
+            with query_stats.timed(query, params) as olcum, \
+                    closing(self.connection.cursor()) as cursor:
+                self._execute(cursor, query, params, prepared)
                 result = cursor.fetchone()
+                olcum["rows"] = int(result is not None)
 
                 # Eğer kayıt bulunamadıysa `None` döner
                 if not result:
@@ -59,19 +141,92 @@ class Database:
                 return tuple(result)
 
         except Exception as e:
+            if self.in_transaction:
+                raise
             print(f"Veri çekme hatası: {e}")
             return None
 
-    def fetch_all(self, query, params=None):
+    def fetch_all(self, query, params=None, prepared=False):
         """ Tüm kayıtları döner """
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, params or ())
-                return cursor.fetchall()
+            with query_stats.timed(query, params) as olcum, \
+                    closing(self.connection.cursor()) as cursor:
+                self._execute(cursor, query, params, prepared)
+                rows = cursor.fetchall()
+                olcum["rows"] = len(rows)
+                return rows
         except Exception as e:
+            if self.in_transaction:
+                raise
             print(f"Veri çekme hatası: {e}")
             return []
 
+    def fetch_iter(self, query, params=None, itersize=None):
+        """
+        Kayıtları tek tek üreten akış (büyük sonuçlar için fetch_all yerine):
+            for row in db.fetch_iter("SELECT ...", (hasta_id,)):
+                ...
+        • PostgreSQL'de adlandırılmış sunucu tarafı imleç kullanılır; satırlar
+          itersize'lık (varsayılan FETCH_ITERSIZE) partilerle gelir, tüm sonuç
+          belleğe alınmaz ve ilk satırlar sorgu bitmeden işlenebilir
+        • Akış bitene ya da üreteç kapatılana kadar bağlantı bu sorguya ayrılır;
+          bu sürede aynı nesneyle commit eden sorgu çalıştırılmamalı
+        • Hatalar yazdırılmaz, yükseltilir (kısmen tüketilmiş sonuç sessizce kesilmesin)
+        """
+        cursor = self.backend.stream_cursor(self.connection, itersize or FETCH_ITERSIZE)
+        try:
+            cursor.execute(self.backend.adapt(query), params or ())
+            yield from cursor
+        finally:
+            cursor.close()
+            if not self.in_transaction:
+                self.connection.rollback()      # salt okunur işlemi kapat
+
+    def execute_values(self, query, rows, template=None, page_size=500, fetch=False):
+        """
+        Çok satırlı INSERT: sorgudaki tek VALUES %s yer tutucusu
+        satırlarla genişletilir (page_size satırda bir round-trip).
+        fetch=True → RETURNING satırları (tüm sayfalar, sırayla) döner.
+        """
+        try:
+            sonuc = self.backend.execute_values(
+                self.connection, query, rows, template=template, page_size=page_size, fetch=fetch
+            )
+            if not self.in_transaction:
+                self.connection.commit()
+            return sonuc
+        except Exception:
+            if not self.in_transaction:
+                self.connection.rollback()
+            raise
+
+    def copy_rows(self, table, columns, rows):
+        """
+        Satırları toplu yükler: PostgreSQL'de COPY (INSERT'e göre çok daha hızlı),
+        SQLite'ta tek hazırlanmış INSERT ile executemany.
+        rows → tuple dizisi; None değerleri NULL olarak yazılır.
+        Değerler sayı/tarih gibi sekme, satır sonu ve ters bölü içermeyen türler olmalı.
+        Dönüş: yüklenen satır sayısı
+        """
+        try:
+            count = self.backend.copy_rows(self.connection, table, columns, rows)
+            if not self.in_transaction:
+                self.connection.commit()
+        except Exception:
+            if not self.in_transaction:
+                self.connection.rollback()
+            raise
+        return count
+
+    def execute_script(self, sql):
+        """
+        Çok ifadeli SQL betiği (göç dosyaları). Yalnızca transaction() içinde
+        çağrılmalı; COMMIT blok sonunda yapılır.
+        """
+        if not self.in_transaction:
+            raise RuntimeError("execute_script() transaction() bloğu içinde çağrılmalı.")
+        self.backend.run_script(self.connection, sql)
+
     def add_user(self, tc_no, ad, soyad, sifre, dogum_tarihi,
                  cinsiyet, email, rol):
 
@@ -94,7 +249,7 @@ class Database:
         """ TC numarasına göre kullanıcı getir """
         query = "SELECT * FROM public.kullanicilar WHERE tc_no = %s;"
         params = (tc_no,)
-        return self.fetch_one(query, params)
+        return self.fetch_one(query, params, prepared=True)
 
     def hash_password(self, password):
         """
@@ -117,7 +272,7 @@ class Database:
         # 1. Kullanıcıyı TC'ye göre çek
         user = self.fetch_one(
             "SELECT * FROM public.kullanicilar WHERE tc_no = %s;",
-            (tc_no,)
+            (tc_no,), prepared=True
         )
 
         if not user:  # TC bulunamadı
@@ -145,16 +300,17 @@ class Database:
         """ Uyarı ekleme """
         query = """
             INSERT INTO public.uyarilar (hasta_id, tarih, uyari_tipi, mesaj, bildirildi)
-            VALUES (%s, %s, %s, %s, FALSE);
+            VALUES (%s, %s, %s, %s, FALSE)
+            ON CONFLICT (hasta_id, tarih, uyari_tipi, mesaj) DO NOTHING;
         """
         params = (hasta_id, tarih, uyari_tipi, mesaj)
-        self.execute_query(query, params)
+        self.execute_query(query, params, prepared=True)
         print(f"Uyarı eklendi: {uyari_tipi} - {mesaj}")
 
 
     def check_blood_sugar_alert(self, hasta_id, seviye):
         """ Kan şekeri seviyesine göre uyarı oluşturur """
-        now = datetime.now()
+        now = date.today()      # uyarilar.tarih DATE
 
         # Düşük kan şekeri uyarısı
         if seviye < 70:
@@ -173,13 +329,81 @@ class Database:
             VALUES (%s, %s, %s, %s);
         """
         params = (hasta_id, olcum_zamani, olcum_zamani_id, seviye)
-        self.execute_query(query, params)
+        with self.transaction():
+            self.execute_query(query, params, prepared=True)
+
+            # Uyarı kontrolü
+            self.check_blood_sugar_alert(hasta_id, seviye)
+            self.check_insulin_data_alert(hasta_id, olcum_zamani.date())
         print(f"Kan şekeri kaydı eklendi: Hasta ID = {hasta_id}, Zaman = {olcum_zamani}, Seviye = {seviye}")
 
-        # Uyarı kontrolü
-        self.check_blood_sugar_alert(hasta_id, seviye)
-        self._update_daily_insulin(hasta_id, olcum_zamani.date())
-        self.check_insulin_data_alert(hasta_id, olcum_zamani.date())
+    def ingest_blood_sugar(self, hasta_id, olcum_zamani, seviye):
+        """
+        Ölçümü tek round-trip'te kaydeder (veritabanındaki kan_sekeri_ekle fonksiyonu):
+        slot tespiti, aynı gün/aynı slot kontrolü, ekleme, anlık uyarı,
+        günlük ortalama/doz ve eksik ölçüm uyarıları tek işlemde yapılır.
+
+        Dönüş: (sonuc, olcum_id, olcum_zamani_id)
+            sonuc → 'eklendi' ya da 'mukerrer' (slot zaten dolu, kayıt yapılmadı)
+            olcum_zamani_id → None ise ölçüm tanımlı aralıkların dışında
+
+        SQLite'ta saklı yordam olmadığından aynı adımlar bu bağlantıda sırayla
+        çalıştırılır (süreç içi olduğu için round-trip maliyeti yoktur).
+        """
+        with self.transaction():
+            if not self.is_sqlite:
+                return self.fetch_one(
+                    "SELECT sonuc, kayit_id, zaman_id FROM kan_sekeri_ekle(%s, %s, %s);",
+                    (hasta_id, olcum_zamani, seviye), prepared=True
+                )
+
+            zaman_id = reference_cache.slot_for(self, olcum_zamani.time())
+
+            kayit = self.fetch_one("""
+                INSERT INTO kan_sekeri_olcumleri (hasta_id, olcum_zamani, olcum_zamani_id, seviye)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (hasta_id, olcum_gunu, olcum_zamani_id) DO NOTHING
+                RETURNING id;
+            """, (hasta_id, olcum_zamani, zaman_id, seviye))
+            if not kayit:
+                return ("mukerrer", None, zaman_id)
+
+            self.check_blood_sugar_alert(hasta_id, seviye)
+            self.refresh_insulin_days([(hasta_id, olcum_zamani.date())])
+            return ("eklendi", kayit[0], zaman_id)
+
+    def delete_blood_sugar(self, hasta_id, olcum_zamani):
+        """
+        Ölçümü siler; günün ortalama/dozu tetikleyicilerle düşer, eksik ölçüm
+        uyarıları yenilenir. Dönüş: silinen kayıt sayısı
+        """
+        with self.transaction():
+            silinen = self.fetch_all("""
+                DELETE FROM kan_sekeri_olcumleri
+                WHERE hasta_id = %s AND olcum_zamani = %s
+                RETURNING id;
+            """, (hasta_id, olcum_zamani))
+            if silinen:
+                self.refresh_insulin_days([(hasta_id, olcum_zamani.date())])
+        return len(silinen)
+
+    def refresh_insulin_days(self, days):
+        """
+        Verilen (hasta_id, gün) çiftleri için eksik/yetersiz ölçüm uyarılarını
+        yeniler (insulin_gunu_yenile). Günlük ortalama/doz kan_sekeri_olcumleri
+        tetikleyicileriyle zaten güncel tutulur. Çağıran işlem içinde çalışır.
+        """
+        days = list(days)
+        if not days:
+            return
+        if not self.is_sqlite:
+            self.execute_query("""
+                SELECT insulin_gunu_yenile(t.hasta_id, t.gun)
+                FROM   unnest(%s::INT[], %s::DATE[]) AS t(hasta_id, gun);
+            """, ([h for h, _ in days], [g for _, g in days]))
+            return
+        for hasta_id, gun in days:
+            self._check_insulin_data_alert(hasta_id, gun)
 
     def get_insulin_suggestions(self, hasta_id):
         return self.fetch_all("""
@@ -187,40 +411,43 @@ class Database:
             FROM insulin_onerileri
             WHERE hasta_id = %s
             ORDER BY tarih DESC;
-        """, (hasta_id,))
+        """, (hasta_id,), prepared=True)
 
     def get_alerts(self, hasta_id):
-        """Hastaya ait bildirilmeyen uyarıları getir ve gösterildikten sonra işaretle."""
-        query = """
-            SELECT id, tarih, uyari_tipi, mesaj, bildirildi
-            FROM public.uyarilar
-            WHERE hasta_id = %s AND bildirildi = FALSE
-            ORDER BY tarih DESC;
         """
-        params = (hasta_id,)
-        alerts = self.fetch_all(query, params)
-
-        # Bildirildi olarak işaretle (bir daha gösterilmemesi için)
-        for alert in alerts:
-            alert_id = alert[0]
-            self.execute_query("""
+        Hastaya ait bildirilmeyen uyarıları getirir ve aynı sorguda bildirildi olarak işaretler.
+        Bekleyen uyarı sayısından bağımsız olarak tek ifade + tek commit.
+        Dönüş: [(id, 'GG.AA.YYYY', uyari_tipi, mesaj, bildirildi), ...] tarihe göre yeniden eskiye
+        """
+        query = """
+            WITH isaretlenen AS (
                 UPDATE public.uyarilar
                 SET bildirildi = TRUE
-                WHERE id = %s;
-            """, (alert_id,))
-
-        # Tarih formatını dönüştür
-        formatted_alerts = []
-        for alert in alerts:
-            alert_id, tarih, uyari_tipi, mesaj, bildirildi = alert
-            formatted_tarih = tarih.strftime("%d.%m.%Y")
-            formatted_alerts.append((alert_id, formatted_tarih, uyari_tipi, mesaj, bildirildi))
-
-        return formatted_alerts
-
-
+                WHERE hasta_id = %s AND bildirildi = FALSE
+                RETURNING id, tarih, uyari_tipi, mesaj
+            )
+            SELECT id, TO_CHAR(tarih, 'DD.MM.YYYY'), uyari_tipi, mesaj,
+                   FALSE AS bildirildi          -- işaretlenmeden önceki durum
+            FROM isaretlenen
+            ORDER BY tarih DESC, id DESC;
+        """
+        if not self.is_sqlite:
+            with self.transaction():
+                return self.fetch_all(query, (hasta_id,), prepared=True)
+
+        # SQLite: UPDATE … RETURNING bir CTE içinde kullanılamaz; sıralama Python'da
+        with self.transaction():
+            rows = self.fetch_all("""
+                UPDATE uyarilar
+                SET bildirildi = TRUE
+                WHERE hasta_id = %s AND bildirildi = FALSE
+                RETURNING id, tarih, TO_CHAR(tarih, 'DD.MM.YYYY'), uyari_tipi, mesaj;
+            """, (hasta_id,))
+        rows.sort(key=lambda r: (str(r[1]), r[0]), reverse=True)
+        return [(id_, tarih_str, tip, mesaj, False) for id_, _, tarih_str, tip, mesaj in rows]
 
     def _dose_for_avg(self, avg):
+        """ Ortalamaya göre doz (ml). insulin_onerileri tetikleyicileri aynı eşikleri kullanır. """
         dose_rules = [
             (70, 0), (110, 0), (150, 1), (200, 2), (9999, 3)
         ]
@@ -228,58 +455,36 @@ class Database:
             if avg <= limit:
                 return dose
 
-    def _update_daily_insulin(self, hasta_id: int, the_date):
-        rows = self.fetch_all("""
-            SELECT seviye FROM kan_sekeri_olcumleri
-            WHERE hasta_id = %s AND DATE(olcum_zamani) = %s AND olcum_zamani_id IS NOT NULL;
-        """, (hasta_id, the_date))
-
-        if not rows:
-            return
-
-        seviyeler = [r[0] for r in rows]
-        if len(seviyeler) < 3:
-            ort = sum(seviyeler) / len(seviyeler)
-            doz = self._dose_for_avg(ort)  # Öneriyi yine de ver
-        else:
-            ort = sum(seviyeler) / len(seviyeler)
-            doz = self._dose_for_avg(ort)
-
-        self.execute_query("""
-            INSERT INTO insulin_onerileri (hasta_id, tarih, ortalama, doz_ml)
-            VALUES (%s, %s, %s, %s)
-            ON CONFLICT (hasta_id, tarih) DO UPDATE
-            SET ortalama = EXCLUDED.ortalama,
-                doz_ml = EXCLUDED.doz_ml,
-                created_at = CURRENT_TIMESTAMP;
-        """, (hasta_id, the_date, ort, doz))
-
     def check_insulin_data_alert(self, hasta_id: int, the_date):
         """
         Belirli bir tarihteki ölçümleri kontrol eder ve eksik/yetersizse uyarı ekler.
         """
+        with self.transaction():
+            self._check_insulin_data_alert(hasta_id, the_date)
+
+    def _check_insulin_data_alert(self, hasta_id: int, the_date):
         # Aynı güne ait önceki insulin uyarılarını sil
         self.execute_query("""
             DELETE FROM uyarilar
-            WHERE hasta_id = %s AND DATE(tarih) = %s AND uyari_tipi IN ('Eksik Ölçüm', 'Yetersiz Ölçüm');
-        """, (hasta_id, the_date))
+            WHERE hasta_id = %s AND tarih = %s AND uyari_tipi IN ('Eksik Ölçüm', 'Yetersiz Ölçüm');
+        """, (hasta_id, the_date), prepared=True)
 
-        rows = self.fetch_all("""
-            SELECT seviye, olcum_zamani_id
-            FROM kan_sekeri_olcumleri
-            WHERE hasta_id = %s AND DATE(olcum_zamani) = %s;
-        """, (hasta_id, the_date))
+        # Günün slotlu ölçüm adedi tetikleyicilerle insulin_onerileri'nde tutulur
+        row = self.fetch_one("""
+            SELECT adet FROM insulin_onerileri
+            WHERE hasta_id = %s AND tarih = %s;
+        """, (hasta_id, the_date), prepared=True)
 
-        seviyeler = [r[0] for r in rows if r[1] is not None]
-        eksik_miktar = 5 - len(seviyeler)
+        adet = row[0] if row else 0
+        eksik_miktar = 5 - adet
 
-        if len(seviyeler) < 3:
+        if adet < 3:
             # Yetersiz veri
             mesaj1 = f"{the_date.strftime('%d.%m.%Y')} tarihli ölçümler yetersiz! Ortalama güvenilir değil."
             self._add_insulin_alert_once(hasta_id, the_date, "Yetersiz Ölçüm", mesaj1)
 
             # Aynı zamanda eksik ölçüm uyarısı da verilmeli
-            eksik_miktar = 5 - len(seviyeler)
+            eksik_miktar = 5 - adet
             mesaj2 = f"{the_date.strftime('%d.%m.%Y')} tarihinde {eksik_miktar} ölçüm eksik. Ortalama eksik verilere göre hesaplandı."
             self._add_insulin_alert_once(hasta_id, the_date, "Eksik Ölçüm", mesaj2)
 
@@ -295,64 +500,85 @@ class Database:
         var_mi = self.fetch_one("""
             SELECT id FROM uyarilar
             WHERE hasta_id = %s AND tarih = %s AND uyari_tipi = %s AND mesaj = %s;
-        """, (hasta_id, tarih, tip, mesaj))
+        """, (hasta_id, tarih, tip, mesaj), prepared=True)
 
         if not var_mi:
             self.add_alert(hasta_id, tarih, tip, mesaj)
 
-    def check_daily_blood_sugar_alerts_for_doctor(self, hasta_id: int, date_obj):
-        """Her ölçüm sonrası çalışır, o güne dair tüm verileri analiz edip uyarı ekler"""
-        rows = self.fetch_all("""
-            SELECT seviye, olcum_zamani
-            FROM kan_sekeri_olcumleri
-            WHERE hasta_id = %s AND DATE(olcum_zamani) = %s
-        """, (hasta_id, date_obj))
-
-        seviyeler = [r[0] for r in rows]
-
+    @staticmethod
+    def _doctor_alerts_for_day(seviyeler):
+        """
+        Bir günün ölçüm seviyelerinden doktor uyarılarını üretir.
+        Dönüş: [(uyari_tipi, mesaj), ...] — tekrar eden satırlar uyarilar_unique ile elenir
+        """
         # 1. Hiç ölçüm yoksa
         if not seviyeler:
-            self.add_alert(
-                hasta_id, date_obj,
+            return [(
                 "Ölçüm Eksik Uyarısı",
                 "Hasta gün boyunca kan şekeri ölçümü yapmamıştır. Acil takip önerilir."
-            )
-            return
+            )]
+
+        alerts = []
 
         # 2. Ölçüm sayısı < 3
         if len(seviyeler) < 3:
-            self.add_alert(
-                hasta_id, date_obj,
+            alerts.append((
                 "Ölçüm Yetersiz Uyarısı",
                 "Hastanın günlük kan şekeri ölçüm sayısı yetersiz (<3). Durum izlenmelidir."
-            )
+            ))
 
         # 3. Ölçüm seviyelerine göre detaylı doktor uyarıları
         for seviye in seviyeler:
             if seviye < 70:
-                self.add_alert(
-                    hasta_id, date_obj,
+                alerts.append((
                     "Acil Uyarı",
                     "Hastanın kan şekeri seviyesi 70 mg/dL'nin altına düştü. Hipoglisemi riski! Hızlı müdahale gerekebilir."
-                )
+                ))
             elif 111 <= seviye <= 150:
-                self.add_alert(
-                    hasta_id, date_obj,
+                alerts.append((
                     "Takip Uyarısı",
                     "Hastanın kan şekeri 111-150 mg/dL arasında. Durum izlenmeli."
-                )
+                ))
             elif 151 <= seviye <= 200:
-                self.add_alert(
-                    hasta_id, date_obj,
+                alerts.append((
                     "İzleme Uyarısı",
                     "Hastanın kan şekeri 151-200 mg/dL arasında. Diyabet kontrolü gereklidir."
-                )
+                ))
             elif seviye > 200:
-                self.add_alert(
-                    hasta_id, date_obj,
+                alerts.append((
                     "Acil Müdahale Uyarısı",
                     "Hastanın kan şekeri 200 mg/dL'nin üzerinde. Hiperglisemi durumu. Acil müdahale gerekebilir."
-                )
+                ))
+        return alerts
+
+    def _insert_alerts(self, rows):
+        """
+        Uyarıları tek toplu INSERT ile yazar; var olanlar uyarilar_unique ile atlanır.
+        rows → [(hasta_id, tarih, uyari_tipi, mesaj), ...]
+        """
+        rows = list(dict.fromkeys(rows))   # aynı ifadede tekrar eden satırları ele
+        if not rows:
+            return
+        self.execute_values("""
+            INSERT INTO public.uyarilar (hasta_id, tarih, uyari_tipi, mesaj, bildirildi)
+            VALUES %s
+            ON CONFLICT (hasta_id, tarih, uyari_tipi, mesaj) DO NOTHING;
+        """, rows, template="(%s, %s, %s, %s, FALSE)")
+
+    def check_daily_blood_sugar_alerts_for_doctor(self, hasta_id: int, date_obj):
+        """Her ölçüm sonrası çalışır, o güne dair tüm verileri analiz edip uyarı ekler"""
+        rows = self.fetch_all("""
+            SELECT seviye, olcum_zamani
+            FROM kan_sekeri_olcumleri
+            WHERE hasta_id = %s AND olcum_zamani >= %s AND olcum_zamani < %s
+        """, (hasta_id, *self._day_range(date_obj)))
+
+        seviyeler = [r[0] for r in rows]
+        with self.transaction():
+            self._insert_alerts(
+                (hasta_id, date_obj, tip, mesaj)
+                for tip, mesaj in self._doctor_alerts_for_day(seviyeler)
+            )
 
     def check_first_time_measurement_alert(self, hasta_id: int):
         """Hasta daha önce hiç ölçüm yapmadıysa genel bir uyarı oluşturur."""
@@ -371,57 +597,199 @@ class Database:
         Sadece doktor tipi uyarılar: 'Acil Uyarı', 'Takip Uyarısı', 'İzleme Uyarısı',
         'Acil Müdahale Uyarısı', 'Ölçüm Eksik Uyarısı', 'Ölçüm Yetersiz Uyarısı'
         """
-        query = """
+        query = f"""
             SELECT id, tarih, uyari_tipi, mesaj, bildirildi
             FROM public.uyarilar
             WHERE hasta_id = %s
-            AND uyari_tipi IN (
-                'Acil Uyarı',
-                'Takip Uyarısı',
-                'İzleme Uyarısı',
-                'Acil Müdahale Uyarısı',
-                'Ölçüm Eksik Uyarısı',
-                'Ölçüm Yetersiz Uyarısı'
-            )
-            ORDER BY tarih DESC;
+            AND {_DOKTOR_UYARI_FILTRESI}
+            ORDER BY tarih DESC, id DESC;
         """
         return self.fetch_all(query, (hasta_id,))
 
-    def generate_all_doctor_alerts(self, hasta_id: int):
-        # Hastanın ölçüm yaptığı bütün tarihleri çek
-        dates = self.fetch_all("""
-            SELECT DISTINCT DATE(olcum_zamani)
+    # ────────────────────────────────────────────────────────────────────────
+    # Anahtar kümesi (keyset) sayfalama
+    # Sayfa, bir önceki sayfanın son satırının sıralama anahtarından
+    # (after) devam eder; OFFSET kullanılmadığı ve sıralama 0008 göçündeki
+    # kapsayan indekslerle karşılandığı için her sayfanın maliyeti
+    # hastanın geçmişinin uzunluğundan bağımsızdır.
+    # ────────────────────────────────────────────────────────────────────────
+    def page_measurements(self, hasta_id: int, after=None, limit: int = 200):
+        """
+        Ölçümler, yeniden eskiye.
+        after → (olcum_zamani, id) — önceki sayfanın son satırı; None ise ilk sayfa
+        Dönüş: [(olcum_zamani, seviye, id), ...]
+        """
+        kosul, params = "", [hasta_id]
+        if after is not None:
+            kosul = "AND (olcum_zamani, id) < (%s, %s)"
+            params += list(after)
+        return self.fetch_all(f"""
+            SELECT olcum_zamani, seviye, id
             FROM kan_sekeri_olcumleri
+            WHERE hasta_id = %s {kosul}
+            ORDER BY olcum_zamani DESC, id DESC
+            LIMIT %s;
+        """, (*params, limit))
+
+    def _page_tracking(self, table, type_table, type_fk, hasta_id, after, limit, pending_only):
+        kosul, params = "", [hasta_id]
+        if pending_only:
+            kosul += " AND t.durum = FALSE"
+        if after is not None:
+            kosul += " AND (t.tarih, t.saat, t.id) < (%s, %s, %s)"
+            params += list(after)
+        return self.fetch_all(f"""
+            SELECT t.id, t.tarih, t.saat, tur.ad, t.durum
+            FROM {table} t
+            JOIN {type_table} tur ON tur.id = t.{type_fk}
+            WHERE t.hasta_id = %s{kosul}
+            ORDER BY t.tarih DESC, t.saat DESC, t.id DESC
+            LIMIT %s;
+        """, (*params, limit))
+
+    def page_diet_history(self, hasta_id: int, after=None, limit: int = 100,
+                          pending_only: bool = False):
+        """
+        Diyet önerileri, yeniden eskiye (pending_only → yalnızca uygulanmamışlar).
+        after → (tarih, saat, id)
+        Dönüş: [(id, tarih, saat, diyet_adi, durum), ...]
+        """
+        return self._page_tracking("diyet_takibi", "diyet_turleri", "diyet_turu_id",
+                                   hasta_id, after, limit, pending_only)
+
+    def page_exercise_history(self, hasta_id: int, after=None, limit: int = 100,
+                              pending_only: bool = False):
+        """
+        Egzersiz önerileri, yeniden eskiye (pending_only → yalnızca uygulanmamışlar).
+        after → (tarih, saat, id)
+        Dönüş: [(id, tarih, saat, egzersiz_adi, durum), ...]
+        """
+        return self._page_tracking("egzersiz_takibi", "egzersiz_turleri", "egzersiz_turu_id",
+                                   hasta_id, after, limit, pending_only)
+
+    def page_doctor_alerts(self, hasta_id: int, after=None, limit: int = 100):
+        """
+        get_doctor_alerts'in sayfalı hâli.
+        after → (tarih, id)
+        Dönüş: [(id, tarih, uyari_tipi, mesaj, bildirildi), ...]
+        """
+        kosul, params = "", [hasta_id]
+        if after is not None:
+            kosul = "AND (tarih, id) < (%s, %s)"
+            params += list(after)
+        return self.fetch_all(f"""
+            SELECT id, tarih, uyari_tipi, mesaj, bildirildi
+            FROM uyarilar
+            WHERE hasta_id = %s
+            AND {_DOKTOR_UYARI_FILTRESI}
+            {kosul}
+            ORDER BY tarih DESC, id DESC
+            LIMIT %s;
+        """, (*params, limit))
+
+    def generate_all_doctor_alerts(self, hasta_id: int):
+        """
+        Doktor uyarılarını artımlı üretir.
+        kan_sekeri_olcumleri'ne yapılan her ekleme/güncelleme/silme, ölçümün
+        (hasta, gün) çiftini tetikleyiciyle doktor_uyari_gunleri'ne işler
+        (data/migrations/0013). Bu işaretler DELETE … RETURNING ile tüketilir;
+        yalnızca o günler ölçümleriyle birlikte yeniden değerlendirilir:
+        • Yeni uyarılar tek toplu INSERT ile yazılır
+        • Günün artık geçerli olmayan doktor uyarıları silinir (ölçüm düzeltildi/silindi)
+        Dönüş: değerlendirilen gün sayısı
+        """
+        with self.transaction():
+            # İşaretler önce tüketilir: aynı günü işaretleyen açık bir yazma
+            # varsa DELETE onun commit'ini bekler ve ölçüm aşağıda görünür
+            gunler = {r[0]: [] for r in self.fetch_all("""
+                DELETE FROM doktor_uyari_gunleri
+                WHERE hasta_id = %s
+                RETURNING gun;
+            """, (hasta_id,))}
+            if not gunler:
+                return 0
+
+            anahtarlar = [(hasta_id, gun) for gun in sorted(gunler)]
+            for gun, seviye in self.execute_values("""
+                SELECT olcum_gunu, seviye
+                FROM kan_sekeri_olcumleri
+                WHERE (hasta_id, olcum_gunu) IN (VALUES %s)
+                ORDER BY olcum_gunu, olcum_zamani;
+            """, anahtarlar, fetch=True):
+                gunler[gun].append(seviye)
+
+            # Ölçümü kalmayan gün yeniden değerlendirilmez; eski uyarıları kaldırılır
+            yeni = {
+                (gun, tip, mesaj)
+                for gun, seviyeler in gunler.items() if seviyeler
+                for tip, mesaj in self._doctor_alerts_for_day(seviyeler)
+            }
+            eskimis = [
+                (uyari_id,)
+                for uyari_id, gun, tip, mesaj in self.execute_values(f"""
+                    SELECT id, tarih, uyari_tipi, mesaj
+                    FROM uyarilar
+                    WHERE (hasta_id, tarih) IN (VALUES %s)
+                      AND {_DOKTOR_UYARI_FILTRESI};
+                """, anahtarlar, fetch=True)
+                if (gun, tip, mesaj) not in yeni
+            ]
+            if eskimis:
+                self.execute_values("DELETE FROM uyarilar WHERE id IN (VALUES %s);", eskimis)
+
+            self._insert_alerts(sorted((hasta_id, gun, tip, mesaj) for gun, tip, mesaj in yeni))
+            return len(gunler)
+
+    @staticmethod
+    def _oran(uygulanan, toplam, ndigits):
+        return round((uygulanan / toplam) * 100, ndigits) if toplam > 0 else 0
+
+    def get_adherence_summary(self, hasta_id: int):
+        """
+        uyum_ozeti tablosundan tek satır (tetikleyicilerle güncel tutulur).
+        Dönüş: (diyet_toplam, diyet_uygulanan, egzersiz_toplam, egzersiz_uygulanan)
+        """
+        row = self.fetch_one("""
+            SELECT diyet_toplam, diyet_uygulanan, egzersiz_toplam, egzersiz_uygulanan
+            FROM uyum_ozeti
             WHERE hasta_id = %s;
         """, (hasta_id,))
+        return row or (0, 0, 0, 0)
 
-        for (d,) in dates:
-            self.check_daily_blood_sugar_alerts_for_doctor(hasta_id, d)
-
-    def get_recommendation_progress(self, hasta_id: int):
+    def get_recommendation_progress(self, hasta_id: int, ndigits: int = 1):
         """Hastanın uyguladığı diyet ve egzersizlerin oranını döner: (diyet_oran, egzersiz_oran)"""
-        # Diyet
-        total_diyet = self.fetch_one(
-            "SELECT COUNT(*) FROM diyet_takibi WHERE hasta_id = %s;", (hasta_id,)
-        )[0]
-        applied_diyet = self.fetch_one(
-            "SELECT COUNT(*) FROM diyet_takibi WHERE hasta_id = %s AND durum = TRUE;", (hasta_id,)
-        )[0]
-
-        # Egzersiz
-        total_egz = self.fetch_one(
-            "SELECT COUNT(*) FROM egzersiz_takibi WHERE hasta_id = %s;", (hasta_id,)
-        )[0]
-        applied_egz = self.fetch_one(
-            "SELECT COUNT(*) FROM egzersiz_takibi WHERE hasta_id = %s AND durum = TRUE;", (hasta_id,)
-        )[0]
+        total_diyet, applied_diyet, total_egz, applied_egz = self.get_adherence_summary(hasta_id)
 
         # Yüzde hesapla
-        diyet_oran = round((applied_diyet / total_diyet) * 100, 1) if total_diyet > 0 else 0
-        egz_oran = round((applied_egz / total_egz) * 100, 1) if total_egz > 0 else 0
+        diyet_oran = self._oran(applied_diyet, total_diyet, ndigits)
+        egz_oran = self._oran(applied_egz, total_egz, ndigits)
 
         return diyet_oran, egz_oran
 
+    def get_cohort_adherence(self, doktor_id: int, ndigits: int = 1):
+        """
+        Doktorun tüm hastalarının uyum oranları tek sorguda.
+        Dönüş: [(hasta_id, ad_soyad, diyet_oran, egzersiz_oran), ...] ada göre sıralı
+        """
+        rows = self.fetch_all("""
+            SELECT h.id,
+                   h.ad || ' ' || h.soyad,
+                   COALESCE(u.diyet_toplam, 0),
+                   COALESCE(u.diyet_uygulanan, 0),
+                   COALESCE(u.egzersiz_toplam, 0),
+                   COALESCE(u.egzersiz_uygulanan, 0)
+            FROM doktor_hasta dh
+            JOIN kullanicilar h ON h.id = dh.hasta_id
+            LEFT JOIN uyum_ozeti u ON u.hasta_id = dh.hasta_id
+            WHERE dh.doktor_id = %s
+            ORDER BY h.ad;
+        """, (doktor_id,))
+        return [
+            (hasta_id, ad_soyad,
+             self._oran(d_uyg, d_top, ndigits), self._oran(e_uyg, e_top, ndigits))
+            for hasta_id, ad_soyad, d_top, d_uyg, e_top, e_uyg in rows
+        ]
+
     def get_insulin_averages_for_graph(self, hasta_id):
         """
         Hazır günlük ortalama kan şekeri seviyelerini insulin_onerileri tablosundan getirir.
@@ -433,6 +801,153 @@ class Database:
             ORDER BY tarih;
         """, (hasta_id,))
 
+    @staticmethod
+    def _donem_baslangic(gun, donem):
+        """Günün ait olduğu dönemin ilk günü: hafta → pazartesi, ay → ayın 1'i"""
+        if donem == "hafta":
+            return gun - timedelta(days=gun.weekday())
+        if donem == "ay":
+            return gun.replace(day=1)
+        return gun
+
+    @staticmethod
+    def _series_grain(ilk, son, max_points):
+        """[ilk, son] aralığını max_points noktaya sığdıran en ince dönem"""
+        gun_sayisi = (son - ilk).days + 1
+        if gun_sayisi <= max_points:
+            return "gun"
+        if gun_sayisi / 7 <= max_points:
+            return "hafta"
+        return "ay"
+
+    def _glucose_range(self, hasta_id):
+        """Hastanın ortalaması olan ilk ve son gün (yoksa None)"""
+        ilk = self.fetch_one("""
+            SELECT tarih FROM insulin_onerileri WHERE hasta_id = %s ORDER BY tarih LIMIT 1;
+        """, (hasta_id,))
+        son = self.fetch_one("""
+            SELECT tarih FROM insulin_onerileri WHERE hasta_id = %s ORDER BY tarih DESC LIMIT 1;
+        """, (hasta_id,))
+        return (ilk[0], son[0]) if ilk and son else None
+
+    def get_glucose_series(self, hasta_id: int, start=None, end=None, max_points=None):
+        """
+        Grafik için kan şekeri serisi. Gösterilen aralık (varsayılan: tüm geçmiş)
+        max_points günü aşıyorsa haftalık, hafta sayısı da aşıyorsa aylık özet
+        (kan_sekeri_donem_ozeti) okunur; satır sayısı geçmişin uzunluğuyla büyümez.
+        Dönüş: (donem, [(baslangic, ortalama, en_dusuk, en_yuksek, adet, aralikta_yuzde), ...])
+            donem → 'gun' | 'hafta' | 'ay'; aralikta_yuzde → 70–180 mg/dL arası ölçüm oranı
+        """
+        aralik = self._glucose_range(hasta_id)
+        if aralik is None:
+            return "gun", []
+        start, end = max(start or aralik[0], aralik[0]), min(end or aralik[1], aralik[1])
+        if start > end:
+            return "gun", []
+        donem = self._series_grain(start, end, max_points or GRAPH_CONFIG["max_points"])
+
+        if donem == "gun":
+            rows = self.fetch_all("""
+                SELECT olcum_gunu, SUM(seviye), COUNT(*), MIN(seviye), MAX(seviye),
+                       SUM(CASE WHEN seviye BETWEEN 70 AND 180 THEN 1 ELSE 0 END)
+                FROM kan_sekeri_olcumleri
+                WHERE hasta_id = %s AND olcum_gunu >= %s AND olcum_gunu <= %s
+                  AND olcum_zamani_id IS NOT NULL
+                GROUP BY olcum_gunu
+                ORDER BY olcum_gunu;
+            """, (hasta_id, start, end))
+        else:
+            rows = self.fetch_all("""
+                SELECT baslangic, toplam, adet, en_dusuk, en_yuksek, aralikta
+                FROM kan_sekeri_donem_ozeti
+                WHERE hasta_id = %s AND donem = %s AND baslangic >= %s AND baslangic <= %s
+                ORDER BY baslangic;
+            """, (hasta_id, donem, self._donem_baslangic(start, donem), end))
+
+        return donem, [
+            (baslangic, round(toplam / adet, 2), en_dusuk, en_yuksek, adet,
+             round(100 * aralikta / adet, 1))
+            for baslangic, toplam, adet, en_dusuk, en_yuksek, aralikta in rows
+        ]
+
+    def _donem_ifadesi(self, donem, sutun):
+        """SQL'de günün dönem başlangıcı (PostgreSQL: 0011'deki donem_baslangic)"""
+        if not self.is_sqlite:
+            return f"donem_baslangic('{donem}', {sutun})"
+        if donem == "hafta":
+            return f"date({sutun}, 'weekday 0', '-6 days')"
+        return f"date({sutun}, 'start of month')"
+
+    def get_diet_exercise_series(self, hasta_id: int, max_points=None):
+        """
+        get_diet_exercise_blood_sugar_graph_data'nın uzun geçmişe uyarlanmış hâli.
+        Günler max_points'e sığmıyorsa hafta/ay başına tek nokta döner: en sık
+        uygulanan diyet türü, çoğunlukla uygulanıp uygulanmadığı ve dönemin
+        ortalaması (kan_sekeri_donem_ozeti). Diyet/egzersiz günleri veritabanında
+        (dönem, diyet türü) başına toplanır; okunan satır sayısı geçmişin
+        uzunluğuyla değil, dönem sayısıyla büyür.
+        Dönüş: (donem, [(baslangic, diyet_adi, diyet_uygulandi, egzersiz_uygulandi, ortalama), ...])
+        """
+        ilk = self.fetch_one("""
+            SELECT tarih FROM diyet_takibi WHERE hasta_id = %s ORDER BY tarih LIMIT 1;
+        """, (hasta_id,))
+        son = self.fetch_one("""
+            SELECT tarih FROM diyet_takibi WHERE hasta_id = %s ORDER BY tarih DESC LIMIT 1;
+        """, (hasta_id,))
+        if not ilk or not son:
+            return "gun", []
+        aralik = (ilk[0], son[0])
+        donem = self._series_grain(aralik[0], aralik[1], max_points or GRAPH_CONFIG["max_points"])
+        if donem == "gun":
+            return donem, self.get_diet_exercise_blood_sugar_graph_data(hasta_id)
+
+        kova = self._donem_ifadesi(donem, "dt.tarih")
+        rows = self.fetch_all(f"""
+            SELECT {kova} AS baslangic,
+                   dtr.ad,
+                   COUNT(*),
+                   SUM(CASE WHEN dt.durum THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN et.durum THEN 1 ELSE 0 END),
+                   MIN(dt.tarih)
+            FROM diyet_takibi dt
+            JOIN diyet_turleri dtr ON dt.diyet_turu_id = dtr.id
+            LEFT JOIN egzersiz_takibi et
+                ON dt.hasta_id = et.hasta_id AND dt.tarih = et.tarih
+            WHERE dt.hasta_id = %s
+            GROUP BY 1, 2
+            ORDER BY 1;
+        """, (hasta_id,))
+        ortalamalar = {
+            baslangic: round(toplam / adet, 2)
+            for baslangic, toplam, adet in self.fetch_all("""
+                SELECT baslangic, toplam, adet
+                FROM kan_sekeri_donem_ozeti
+                WHERE hasta_id = %s AND donem = %s AND baslangic >= %s AND baslangic <= %s;
+            """, (hasta_id, donem, self._donem_baslangic(aralik[0], donem), aralik[1]))
+        }
+
+        # (dönem, diyet türü) satırları → dönem başına tek nokta
+        kovalar = {}
+        for baslangic, diyet, gun, diyet_uyg, egzersiz_uyg, ilk_gun in rows:
+            if isinstance(baslangic, str):          # SQLite date() metin döndürür
+                baslangic = date.fromisoformat(baslangic)
+            kovalar.setdefault(baslangic, []).append((diyet, gun, diyet_uyg, egzersiz_uyg, ilk_gun))
+
+        sonuc = []
+        for baslangic, turler in kovalar.items():
+            toplam_gun = sum(t[1] for t in turler)
+            yari = toplam_gun / 2
+            # En sık diyet; eşitlikte dönemde önce görülen (ISO tarih metni sıralanabilir)
+            diyet = min(turler, key=lambda t: (-t[1], str(t[4])))[0]
+            sonuc.append((
+                baslangic,
+                diyet,
+                sum(t[2] for t in turler) >= yari,
+                sum(t[3] for t in turler) >= yari,
+                ortalamalar.get(baslangic),
+            ))
+        return donem, sonuc
+
     def get_diet_exercise_blood_sugar_graph_data(self, hasta_id: int):
         return self.fetch_all("""
             SELECT dt.tarih,
@@ -0,0 +1,482 @@
+# core/db_backends.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Veritabanı arka uçları.
+
+Database sınıfı bağlantıyı ve lehçeye özgü işlemleri buradaki arka uca
+devreder; sorgular PostgreSQL sözdiziminde (%s yer tutucuları) yazılmaya
+devam eder.
+
+• PostgresBackend → core/db_pool.py havuzu, psycopg2 (execute_values, COPY),
+                    sık ifadeler için bağlantı başına PREPARE/EXECUTE önbelleği
+• SQLiteBackend   → gömülü tek dosya; WAL kipi, ayarlı pragmalar,
+                    iş parçacığı başına yeniden kullanılan bağlantılar ve
+                    bağlantı başına hazırlanmış ifade önbelleği
+
+Seçim data/config.py → DATABASE_BACKEND ile yapılır. psycopg2 yalnızca
+PostgreSQL arka ucu kullanıldığında içe aktarılır.
+"""
+from __future__ import annotations
+
+import atexit
+import io
+import itertools
+import os
+import re
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from core.query_stats import fingerprint
+from data.config import DATABASE_BACKEND, PREPARED_CONFIG, SQLITE_CONFIG
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# PostgreSQL
+# ────────────────────────────────────────────────────────────────────────────────
+_YER_TUTUCU = re.compile(r"%%|%s")
+
+# Hazır ifadenin sunucuda kaybolduğunu gösteren SQLSTATE kodları:
+# 26000 ad bulunamadı (DISCARD ALL, bağlantı aracısı), 42P05 ad zaten var,
+# 0A000 "cached plan must not change result type" (göç sonrası SELECT *)
+_HAZIR_IFADE_HATALARI = {"26000", "42P05", "0A000"}
+
+
+def _positional(query: str) -> str:
+    """%s yer tutucularını PREPARE'in beklediği $1, $2, … biçimine çevirir."""
+    sayac = itertools.count(1)
+    return _YER_TUTUCU.sub(lambda m: "%" if m.group() == "%%" else f"${next(sayac)}", query)
+
+
+class PostgresBackend:
+    name = "postgresql"
+    _imlec_no = itertools.count(1)
+    _ifade_no = itertools.count(1)     # hazır ifade adları süreç boyunca tekrar verilmez
+
+    def __init__(self, prepared: bool = True, max_prepared: int = 64):
+        from core import db_pool      # psycopg2'yi yalnızca burada yükle
+        self._db_pool = db_pool
+        self.prepared = prepared
+        self.max_prepared = max_prepared
+        # bağlantı → {parmak izi: (ifade adı, sorgu metni)} (LRU sırasıyla). Havuz
+        # bağlantıyı atıp yenisini açtığında eski önbellek kendiliğinden düşer.
+        self._hazir: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        # Sunucuda önbellekte olmayan hazır ifadeler kalmış olabilecek
+        # bağlantılar; havuza iade edilirken DEALLOCATE ALL ile temizlenir
+        self._kirli: "weakref.WeakSet" = weakref.WeakSet()
+        self._hazir_lock = threading.Lock()
+        self._hazir_stats = dict(prepares=0, hits=0, evictions=0, fallbacks=0, bypass=0)
+
+    def acquire(self):
+        return self._db_pool.get_pool().getconn()
+
+    def release(self, conn) -> None:
+        with self._hazir_lock:
+            kirli = conn in self._kirli
+        if kirli:
+            self._deallocate_all(conn)
+        self._db_pool.get_pool().putconn(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._hazir_lock:
+            hazir = {f"prepared_{k}": v for k, v in self._hazir_stats.items()}
+        return dict(self._db_pool.pool_stats(), **hazir)
+
+    # ------------------------------------------------------------------
+    # Hazır ifadeler (PREPARE / EXECUTE)
+    # ------------------------------------------------------------------
+    def execute_prepared(self, conn, cursor, query: str, params, in_transaction: bool) -> None:
+        """
+        Sorguyu bu bağlantıda bir kez PREPARE eder, sonraki çağrılarda EXECUTE
+        ile çalıştırır: ayrıştırma ve planlama her tıklamada tekrarlanmaz.
+        • Önbellek bağlantı başınadır, ifadenin parmak iziyle (core.query_stats)
+          anahtarlanır; max_prepared aşılınca en eski ifade DEALLOCATE edilir
+        • Aynı parmak izine yalnızca sabitleri farklı başka bir metin gelirse
+          hazır ifade kullanılmaz, sorgu düz çalıştırılır
+        • İfade adları süreç boyunca bir kez verilir; sunucuda kalmış eski bir
+          adla çakışılmaz
+        • İfade sunucuda kaybolmuşsa (bkz. _HAZIR_IFADE_HATALARI) bağlantının
+          önbelleği sıfırlanır; işlem dışındaysak geri alınıp DEALLOCATE ALL
+          sonrası bir kez yeniden hazırlanır. İşlem içindeysek hata yükseltilir
+          (blok geri alınır), bağlantı kirli işaretlenir ve havuza iade
+          edilirken sunucudaki ifadeleri silinir; sonraki çağrı yeni adla hazırlar
+        """
+        if not self.prepared:
+            cursor.execute(query, params)
+            return
+        import psycopg2
+        try:
+            self._execute_prepared(conn, cursor, query, params)
+        except psycopg2.Error as e:
+            if e.pgcode not in _HAZIR_IFADE_HATALARI:
+                raise
+            with self._hazir_lock:
+                self._hazir.pop(conn, None)
+                self._hazir_stats["fallbacks"] += 1
+                if in_transaction:
+                    self._kirli.add(conn)
+            if in_transaction:
+                raise
+            conn.rollback()
+            cursor.execute("DEALLOCATE ALL;")
+            self._execute_prepared(conn, cursor, query, params)
+
+    def _execute_prepared(self, conn, cursor, query: str, params) -> None:
+        anahtar = fingerprint(query)
+        with self._hazir_lock:
+            onbellek = self._hazir.get(conn)
+            if onbellek is None:
+                onbellek = self._hazir[conn] = OrderedDict()
+        kayit = onbellek.get(anahtar)
+        if kayit is not None and kayit[1] != query:
+            with self._hazir_lock:
+                self._hazir_stats["bypass"] += 1
+            cursor.execute(query, params)
+            return
+        if kayit is not None:
+            ad = kayit[0]
+            onbellek.move_to_end(anahtar)
+            with self._hazir_lock:
+                self._hazir_stats["hits"] += 1
+        else:
+            if len(onbellek) >= self.max_prepared:
+                _, (eski, _) = onbellek.popitem(last=False)
+                cursor.execute(f"DEALLOCATE {eski};")
+                with self._hazir_lock:
+                    self._hazir_stats["evictions"] += 1
+            ad = f"hz_{next(self._ifade_no)}"
+            cursor.execute(f"PREPARE {ad} AS {_positional(query).strip().rstrip(';')};")
+            onbellek[anahtar] = (ad, query)
+            with self._hazir_lock:
+                self._hazir_stats["prepares"] += 1
+        if params:
+            cursor.execute(f"EXECUTE {ad} ({', '.join(['%s'] * len(params))});", params)
+        else:
+            cursor.execute(f"EXECUTE {ad};")
+
+    def _deallocate_all(self, conn) -> None:
+        """Kirli bağlantının sunucudaki tüm hazır ifadelerini siler, önbelleğini sıfırlar."""
+        import psycopg2
+        from psycopg2 import extensions
+        with self._hazir_lock:
+            self._hazir.pop(conn, None)
+            self._kirli.discard(conn)
+        if conn.closed:
+            return
+        try:
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            with conn.cursor() as cursor:
+                cursor.execute("DEALLOCATE ALL;")
+            conn.commit()
+        except psycopg2.Error as e:
+            print(f"Hazır ifadeler temizlenemedi: {e}")   # havuz bozuk bağlantıyı iadede atar
+
+    @staticmethod
+    def adapt(query: str) -> str:
+        return query
+
+    @classmethod
+    def stream_cursor(cls, conn, itersize: int):
+        """Adlandırılmış (sunucu tarafı) imleç: satırlar itersize'lık partilerle gelir.
+        İşlem içinde yaşar; akış bitmeden aynı bağlantıda COMMIT yapılmamalı."""
+        cursor = conn.cursor(name=f"akis_{next(cls._imlec_no)}")
+        cursor.itersize = itersize
+        return cursor
+
+    @staticmethod
+    def run_script(conn, sql: str) -> None:
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+
+    @staticmethod
+    def execute_values(conn, query, rows, template=None, page_size=500, fetch=False):
+        import psycopg2.extras
+        with conn.cursor() as cursor:
+            return psycopg2.extras.execute_values(
+                cursor, query, rows, template=template, page_size=page_size, fetch=fetch
+            )
+
+    @staticmethod
+    def copy_rows(conn, table, columns, rows) -> int:
+        buf = io.StringIO()
+        count = 0
+        for row in rows:
+            buf.write("\t".join("\\N" if v is None else str(v) for v in row))
+            buf.write("\n")
+            count += 1
+        buf.seek(0)
+        with conn.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+        return count
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# SQLite – tür dönüşümleri ve PostgreSQL sözdizimi çevirisi
+# ────────────────────────────────────────────────────────────────────────────────
+# Python → SQLite: tarih/saat ISO metni olarak saklanır (sözlük sırası = zaman sırası)
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(" "))
+sqlite3.register_adapter(date, lambda v: v.isoformat())
+sqlite3.register_adapter(time, lambda v: v.isoformat())
+
+# SQLite → Python: şemadaki tür adlarına göre (PARSE_DECLTYPES)
+sqlite3.register_converter("TIMESTAMPTZ", lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()[:10]))
+sqlite3.register_converter("TIME", lambda b: time.fromisoformat(b.decode()))
+sqlite3.register_converter("BOOLEAN", lambda b: b not in (b"0", b""))
+sqlite3.register_converter("NUMERIC", lambda b: float(b))
+
+_CEVIRILER = (
+    (re.compile(r"\bpublic\."), ""),
+    # STRING_AGG(DISTINCT x, 'ayraç'): GROUP_CONCAT(DISTINCT x) yalnızca ',' ile birleştirir
+    (re.compile(r"STRING_AGG\(\s*DISTINCT\s+([^,()]+?)\s*,\s*'([^']*)'\s*\)", re.I),
+     r"REPLACE(GROUP_CONCAT(DISTINCT \1), ',', '\2')"),
+    (re.compile(r"\bSTRING_AGG\(", re.I), "GROUP_CONCAT("),
+    (re.compile(r"\bGREATEST\(", re.I), "MAX("),
+    (re.compile(r"\bLEAST\(", re.I), "MIN("),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.I), ""),    # tek yazıcı; satır kilidi yok
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"%%"), "%"),
+)
+
+_TO_CHAR_BICIMLERI = (
+    ("YYYY", "%Y"), ("HH24", "%H"), ("MI", "%M"), ("SS", "%S"), ("DD", "%d"), ("MM", "%m"),
+)
+
+
+@lru_cache(maxsize=1024)
+def translate_query(query: str) -> str:
+    """PostgreSQL sözdizimindeki sorguyu SQLite'a çevirir. Aynı metin hep aynı
+    sonucu verdiği için bağlantının ifade önbelleği de isabet eder."""
+    for pattern, repl in _CEVIRILER:
+        query = pattern.sub(repl, query)
+    return query
+
+
+@lru_cache(maxsize=16)
+def _strftime_format(fmt: str) -> str:
+    for pg, py in _TO_CHAR_BICIMLERI:
+        fmt = fmt.replace(pg, py)
+    return fmt
+
+
+def _to_char(value, fmt):
+    """PostgreSQL TO_CHAR karşılığı (DD, MM, YYYY, HH24, MI, SS)."""
+    if value is None or fmt is None:
+        return None
+    value = str(value)
+    v = time.fromisoformat(value) if value[2:3] == ":" else datetime.fromisoformat(value)
+    return v.strftime(_strftime_format(fmt))
+
+
+def _split_script(sql: str) -> Iterator[str]:
+    """Betiği ifadelere böler; tetikleyici gövdelerindeki (BEGIN … END;) ';' korunur."""
+    stmt = ""
+    for line in sql.splitlines(keepends=True):
+        stmt += line
+        if sqlite3.complete_statement(stmt):
+            yield stmt
+            stmt = ""
+    if any(l.strip() and not l.strip().startswith("--") for l in stmt.splitlines()):
+        yield stmt      # sonunda ';' olmayan son ifade
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# SQLite
+# ────────────────────────────────────────────────────────────────────────────────
+class SQLiteBackend:
+    name = "sqlite"
+    _IDLE_PER_THREAD = 4     # iş parçacığı başına boşta tutulan en fazla bağlantı
+
+    def __init__(self, path: str, cached_statements: int = 256,
+                 busy_timeout_ms: int = 5000, auto_migrate: bool = True,
+                 pragmas: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.cached_statements = cached_statements
+        self.busy_timeout_ms = busy_timeout_ms
+        self.auto_migrate = auto_migrate
+        self.pragmas = dict(pragmas or {})
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._migrate_lock = threading.Lock()
+        self._all: list = []
+        self._migrated = False
+        self._stats = dict(checkouts=0, reused=0, created=0)
+
+    # ------------------------------------------------------------------
+    # Bağlantılar
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        klasor = os.path.dirname(self.path)
+        if klasor:
+            os.makedirs(klasor, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,     # iş parçacığına biz ayırıyoruz; kapanış atexit'te
+        )
+        for key, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {key} = {value};")
+        conn.create_function("TO_CHAR", 2, _to_char, deterministic=True)
+
+        with self._lock:
+            if not self._all:
+                atexit.register(self.closeall)
+            self._all.append(conn)
+            self._stats["created"] += 1
+        return conn
+
+    def _idle(self) -> list:
+        return self._local.__dict__.setdefault("idle", [])
+
+    def acquire(self) -> sqlite3.Connection:
+        idle = self._idle()
+        reused = bool(idle)
+        conn = idle.pop() if reused else self._connect()
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["reused"] += reused
+
+        if self.auto_migrate and not self._migrated:
+            with self._migrate_lock:
+                if not self._migrated:
+                    try:
+                        self._apply_migrations(conn)
+                    except Exception:
+                        self.release(conn)
+                        raise
+                    self._migrated = True
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Bağlantı aynı iş parçacığında tekrar kullanılmak üzere saklanır
+        (ifade önbelleği sıcak kalır); açık işlem varsa geri alınır."""
+        if conn.in_transaction:
+            conn.rollback()
+        idle = self._idle()
+        if len(idle) < self._IDLE_PER_THREAD:
+            idle.append(conn)
+            return
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+        conn.close()
+
+    def _apply_migrations(self, conn: sqlite3.Connection) -> None:
+        from core.database import Database
+        from core.migrations import migrate
+        db = Database(backend=self)
+        db.connection = conn          # aynı bağlantı; iade acquire'ı çağırana kalır
+        migrate(db)
+
+    def closeall(self) -> None:
+        with self._lock:
+            for conn in self._all:
+                try:
+                    conn.execute("PRAGMA optimize;")
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._all.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, open=len(self._all), path=self.path)
+
+    # ------------------------------------------------------------------
+    # Lehçe
+    # ------------------------------------------------------------------
+    @staticmethod
+    def adapt(query: str) -> str:
+        return translate_query(query)
+
+    @staticmethod
+    def execute_prepared(conn, cursor, query: str, params, in_transaction: bool) -> None:
+        """sqlite3 her bağlantıda son cached_statements ifadeyi metne göre
+        hazır tutar; aynı metin (translate_query önbelleği) yeniden derlenmez."""
+        cursor.execute(translate_query(query), params)
+
+    @staticmethod
+    def stream_cursor(conn: sqlite3.Connection, itersize: int):
+        """SQLite imleci zaten satır satır ilerler; sonuç belleğe alınmaz."""
+        cursor = conn.cursor()
+        cursor.arraysize = itersize
+        return cursor
+
+    @staticmethod
+    def run_script(conn: sqlite3.Connection, sql: str) -> None:
+        """Çok ifadeli betik. executescript bekleyen işlemi commit ettiği için
+        ifadeler tek tek çalıştırılır; COMMIT/ROLLBACK çağırana kalır."""
+        if not conn.in_transaction:
+            conn.execute("BEGIN;")
+        for stmt in _split_script(sql):
+            conn.execute(stmt)
+
+    @staticmethod
+    def execute_values(conn, query, rows, template=None, page_size=500, fetch=False):
+        rows = list(rows)
+        if not rows:
+            return [] if fetch else None
+        if template is None:
+            template = "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+        if not fetch:
+            conn.executemany(translate_query(query.replace("%s", template, 1)), rows)
+            return None
+        # executemany RETURNING satırlarını vermez: sayfa başına gerçek çok satırlı VALUES
+        # (page_size × sütun sayısı, SQLite'ın 32766 parametre sınırının altında kalmalı)
+        sonuc = []
+        for i in range(0, len(rows), page_size):
+            sayfa = rows[i:i + page_size]
+            sql = translate_query(query.replace("%s", ", ".join([template] * len(sayfa)), 1))
+            sonuc.extend(conn.execute(sql, [v for row in sayfa for v in row]).fetchall())
+        return sonuc
+
+    @staticmethod
+    def copy_rows(conn, table: str, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+        count = 0
+
+        def sayac():
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+
+        placeholders = ", ".join("?" * len(columns))
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", sayac()
+        )
+        return count
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Süreç genelinde tek arka uç
+# ────────────────────────────────────────────────────────────────────────────────
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name: Optional[str] = None, **overrides):
+    """Yeni arka uç nesnesi (ölçüm betikleri iki arka ucu yan yana kurmak için kullanır)."""
+    name = (name or DATABASE_BACKEND).lower()
+    if name in ("postgresql", "postgres"):
+        return PostgresBackend(**dict(PREPARED_CONFIG, **overrides))
+    if name == "sqlite":
+        return SQLiteBackend(**dict(SQLITE_CONFIG, **overrides))
+    raise ValueError(f"Bilinmeyen veritabanı arka ucu: {name!r}")
+
+
+def get_backend():
+    """DATABASE_BACKEND ayarına göre paylaşılan arka uç."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
@@ -0,0 +1,228 @@
+# core/db_pool.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Süreç genelinde paylaşılan PostgreSQL bağlantı havuzu.
+
+Her pencere `Database(); db.connect()` ile bağlantı istediğinde artık yeni bir
+PostgreSQL backend'i açılmaz; havuzdaki boşta bağlantı ödünç verilir ve
+`close()` çağrısında havuza geri döner.
+
+• min/max boyut           → POOL_CONFIG['min_size'] / ['max_size']
+• Sağlık kontrolü         → uzun süre boşta kalan bağlantıya `SELECT 1`
+• Geri çekilmeli bağlanma → bağlantı kurulamazsa artan beklemeyle tekrar dener
+• İstatistik              → ödünç alma sayısı, bekleme süreleri (stats())
+"""
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg2
+from psycopg2 import extensions
+
+from data.config import DATABASE_CONFIG, POOL_CONFIG
+
+
+class PoolTimeoutError(RuntimeError):
+    """Havuzda belirtilen süre içinde boş bağlantı bulunamadı."""
+
+
+class ConnectionPool:
+    def __init__(self, dsn: Dict[str, Any], min_size: int = 1, max_size: int = 10,
+                 checkout_timeout: float = 10.0, health_check_after: float = 30.0,
+                 connect_retries: int = 5, backoff_base: float = 0.2,
+                 backoff_max: float = 5.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Geçersiz havuz boyutu: 0 <= min_size <= max_size olmalı.")
+
+        self._dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_after = health_check_after
+        self.connect_retries = connect_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._cond = threading.Condition()
+        self._idle: List[Tuple[Any, float]] = []   # (bağlantı, havuza dönüş zamanı)
+        self._in_use: set = set()
+        self._opening = 0                          # şu an kurulmakta olan bağlantılar
+        self._closed = False
+
+        self._stats = dict(
+            checkouts=0, checkins=0, waits=0,
+            wait_total=0.0, wait_max=0.0,
+            created=0, discarded=0, health_check_failures=0,
+            connect_retries=0, timeouts=0,
+        )
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    # ------------------------------------------------------------------
+    # Bağlantı kurma
+    # ------------------------------------------------------------------
+    def _connect(self):
+        """Yeni bağlantı kurar; başarısız olursa üstel geri çekilmeyle tekrar dener."""
+        delay = self.backoff_base
+        for attempt in range(self.connect_retries + 1):
+            try:
+                conn = psycopg2.connect(**self._dsn)
+                with self._cond:
+                    self._stats["created"] += 1
+                return conn
+            except psycopg2.OperationalError:
+                if attempt == self.connect_retries:
+                    raise
+                with self._cond:
+                    self._stats["connect_retries"] += 1
+                time.sleep(delay)
+                delay = min(delay * 2, self.backoff_max)
+
+    def _is_healthy(self, conn, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn) -> None:
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        self._stats["discarded"] += 1
+
+    # ------------------------------------------------------------------
+    # Ödünç alma / iade
+    # ------------------------------------------------------------------
+    def getconn(self, timeout: Optional[float] = None):
+        """Havuzdan bağlantı ödünç alır; gerekirse yenisini açar ya da bekler."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Bağlantı havuzu kapatıldı.")
+
+                candidate = None
+                if self._idle:
+                    candidate = self._idle.pop()
+                elif len(self._in_use) + self._opening < self.max_size:
+                    self._opening += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"{timeout:.1f} sn içinde boş veritabanı bağlantısı bulunamadı."
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                    continue
+
+            if candidate is not None:
+                conn, idle_since = candidate
+                if not self._is_healthy(conn, idle_since):
+                    with self._cond:
+                        self._stats["health_check_failures"] += 1
+                        self._discard(conn)
+                    continue
+            else:
+                try:
+                    conn = self._connect()
+                finally:
+                    with self._cond:
+                        self._opening -= 1
+                        self._cond.notify()
+
+            with self._cond:
+                self._in_use.add(conn)
+                wait = time.monotonic() - started
+                self._stats["checkouts"] += 1
+                self._stats["wait_total"] += wait
+                self._stats["wait_max"] = max(self._stats["wait_max"], wait)
+                if waited:
+                    self._stats["waits"] += 1
+            return conn
+
+    def putconn(self, conn) -> None:
+        """Bağlantıyı havuza iade eder; açık işlem varsa geri alır."""
+        with self._cond:
+            self._in_use.discard(conn)
+            self._stats["checkins"] += 1
+
+            if self._closed or conn.closed:
+                self._discard(conn)
+            else:
+                try:
+                    if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                        conn.rollback()
+                    self._idle.append((conn, time.monotonic()))
+                except psycopg2.Error:
+                    self._discard(conn)
+            self._cond.notify()
+
+    def closeall(self) -> None:
+        with self._cond:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._discard(conn)
+            self._idle.clear()
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # İstatistik
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        """Havuzun anlık durumu ve ödünç alma/bekleme istatistikleri."""
+        with self._cond:
+            s = dict(self._stats)
+            s["size"] = len(self._idle) + len(self._in_use)
+            s["idle"] = len(self._idle)
+            s["in_use"] = len(self._in_use)
+            s["wait_avg"] = s["wait_total"] / s["checkouts"] if s["checkouts"] else 0.0
+            return s
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Süreç genelinde tek havuz
+# ────────────────────────────────────────────────────────────────────────────────
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """İlk çağrıda havuzu oluşturur, sonrakilerde aynı havuzu döndürür."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DATABASE_CONFIG, **POOL_CONFIG)
+                atexit.register(close_pool)
+    return _pool
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Havuz henüz oluşturulmadıysa boş sözlük döner."""
+    return _pool.stats() if _pool is not None else {}
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
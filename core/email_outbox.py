@@ -0,0 +1,438 @@
+# core/email_outbox.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Kalıcı e-posta kuyruğu ve arka plan göndericisi (data/migrations/0012).
+
+Giriş bilgisi e-postası artık Tk iş parçacığında SMTP'ye bağlanıp STARTTLS +
+kimlik doğrulaması yapmaz; eposta_kuyrugu tablosuna tek INSERT ile yazılır ve
+hemen döner. Arka plandaki gönderici:
+
+• Kuyruktan batch_size'lık partiler alır (PostgreSQL: FOR UPDATE SKIP LOCKED;
+  birden çok doktor istemcisi aynı iletiyi iki kez almaz)
+• Tek bir kimliği doğrulanmış SMTP oturumunu iletiler arasında yeniden kullanır;
+  oturum idle_timeout kadar boşta kalınca kapatılır, kopmuşsa bir kez yeniden açılır
+• Geçici hatada (ağ, 4xx, kimlik doğrulama) iletiyi üstel bekleme + rastgele
+  sapmayla yeniden sıraya koyar; kalıcı hatada (5xx, alıcı reddi) ya da
+  max_attempts aşılınca 'basarisiz' yapar
+• Her iletiden hemen önce o iletinin kirasını (lease) yeniler, sonucunu da
+  gönderimin hemen ardından yazar: parti ne kadar uzun sürerse sürsün, başka
+  bir istemci gönderilmekte ya da gönderilmiş olan iletiyi yeniden alıp ikinci
+  kez göndermez. Kirası başka göndericiye geçmiş ileti atlanır
+• Gönderilen ya da kalıcı olarak başarısız olan iletinin gövdesini siler
+  (şifre tabloda kalmaz)
+• stats(): durum başına kuyruk derinliği, gönderim süresi ve kuyrukta bekleme
+  süresi p50/p95, açılan SMTP oturumu sayısı
+
+    email_outbox.enqueue(alici, konu, govde)     # Tk tarafı; milisaniyeler sürer
+    email_outbox.start()                         # doktor paneli açılırken
+
+Yerel deneme için EMAIL_CONFIG'de host='localhost', port=1025, user=None,
+starttls=False yapıp bir deneme sunucusu açmak yeterli
+(ör. python -m aiosmtpd -n -l localhost:1025; ya da benchmarks/email_benchmark.py).
+
+    python -m core.email_outbox --durum          # kuyruk derinliği
+    python -m core.email_outbox --bosalt         # sırası gelenleri şimdi gönder
+"""
+from __future__ import annotations
+
+import argparse
+import atexit
+import random
+import smtplib
+import ssl
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.database import Database
+from core.query_stats import _yuzdelik
+from data.config import EMAIL_CONFIG
+
+
+class SmtpSession:
+    """Tek, yeniden kullanılan SMTP bağlantısı (yalnızca gönderici iş parçacığından)."""
+
+    def __init__(self, host: str, port: int, user: Optional[str], password: Optional[str],
+                 starttls: bool = True, timeout: float = 20.0, idle_timeout: float = 60.0):
+        self.host, self.port = host, port
+        self.user, self.password = user, password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._son_kullanim = 0.0
+        self.acilis = 0                         # açılan oturum sayısı (izleme)
+
+    def _ac(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            if self.user:
+                smtp.login(self.user, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        self.acilis += 1
+        return smtp
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+    def close_if_idle(self) -> None:
+        if self._smtp is not None and time.monotonic() - self._son_kullanim > self.idle_timeout:
+            self.close()
+
+    def send(self, msg) -> None:
+        self.close_if_idle()
+        yeni = self._smtp is None
+        if yeni:
+            self._smtp = self._ac()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._smtp = None
+            if yeni:
+                raise
+            self._smtp = self._ac()             # sunucu boştaki oturumu kapatmış: bir kez yeniden aç
+            self._smtp.send_message(msg)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+            if getattr(e, "smtp_code", None) == 421:
+                self.close()                    # sunucu oturumu kapatıyor
+            raise                               # yalnızca bu ileti reddedildi; oturum sağlam
+        except BaseException:
+            self.close()                        # oturum belirsiz durumda; sonraki ileti yenisini açar
+            raise
+        self._son_kullanim = time.monotonic()
+
+
+def _kalici_mi(e: BaseException) -> bool:
+    """Aynı iletiyi tekrar göndermenin işe yaramayacağı hatalar."""
+    if isinstance(e, smtplib.SMTPAuthenticationError):
+        return False                            # yapılandırma düzelince tüm kuyruk gidebilir
+    if isinstance(e, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(e, smtplib.SMTPResponseException):
+        return 500 <= e.smtp_code < 600
+    return False
+
+
+class EmailOutbox:
+    def __init__(self, sender: str, batch_size: int = 20, poll_interval: float = 5.0,
+                 lease: float = 300.0, max_attempts: int = 8, backoff_base: float = 30.0,
+                 backoff_max: float = 3600.0, sample_size: int = 512, backend=None, **smtp):
+        self.sender = sender
+        self.backend = backend                  # None → uygulamanın arka ucu (ölçümde geçici SQLite)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = SmtpSession(**smtp)
+
+        self._kilit = threading.Lock()
+        self._uyandir = threading.Event()
+        self._dur = threading.Event()
+        self._bos = threading.Event()           # son turda sırası gelen ileti kalmadı
+        self._thread: Optional[threading.Thread] = None
+        self._gonderim_ms: deque = deque(maxlen=sample_size)
+        self._bekleme_s: deque = deque(maxlen=sample_size)
+        self._sayac = {"gonderilen": 0, "basarisiz": 0, "yeniden_deneme": 0}
+
+    # ------------------------------------------------------------------
+    # Kuyruğa ekleme (Tk tarafı)
+    # ------------------------------------------------------------------
+    def enqueue(self, alici: str, konu: str, govde: str, db: Optional[Database] = None) -> int:
+        """İletiyi kuyruğa yazar, göndericiyi uyandırır. Dönüş: kuyruk kaydı id'si"""
+        kendi = db is None
+        if kendi:
+            db = Database(backend=self.backend)
+            db.connect()
+        try:
+            simdi = datetime.now()
+            with db.transaction():
+                row = db.fetch_one("""
+                    INSERT INTO eposta_kuyrugu (alici, konu, govde, sonraki_deneme, olusturma)
+                    VALUES (%s, %s, %s, %s, %s)
+                    RETURNING id;
+                """, (alici, konu, govde, simdi, simdi))
+        finally:
+            if kendi:
+                db.close()
+        self.notify()
+        return row[0]
+
+    def enqueue_many(self, iletiler: List[Tuple[str, str, str]], db: Database) -> List[int]:
+        """
+        (alıcı, konu, gövde) iletilerini tek çok satırlı INSERT ile kuyruğa yazar.
+        Çağıranın işlemine katılır: işlem geri alınırsa iletiler de gitmez.
+        Gönderici commit'ten sonra notify() ile uyandırılmalı.
+        """
+        simdi = datetime.now()
+        rows = db.execute_values("""
+            INSERT INTO eposta_kuyrugu (alici, konu, govde, sonraki_deneme, olusturma)
+            VALUES %s
+            RETURNING id;
+        """, [(alici, konu, govde, simdi, simdi) for alici, konu, govde in iletiler], fetch=True)
+        return [r[0] for r in rows]
+
+    def notify(self) -> None:
+        """Göndericiyi (gerekirse başlatıp) uyandırır."""
+        self._bos.clear()
+        self._uyandir.set()
+        self.start()
+
+    # ------------------------------------------------------------------
+    # Gönderici
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        with self._kilit:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._dur.clear()
+            self._thread = threading.Thread(target=self._dongu, name="email-outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._dur.set()
+        self._uyandir.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Sırası gelen ileti kalmayana kadar bekler (CLI ve ölçüm için)."""
+        return self._bos.wait(timeout)
+
+    def _dongu(self) -> None:
+        db = Database(backend=self.backend)
+        try:
+            while not self._dur.is_set():
+                self._uyandir.clear()
+                try:
+                    db.connect()
+                    if db.connection is None:
+                        raise RuntimeError("Veritabanına bağlanılamadı.")
+                    islenen = self.process_batch(db)
+                except Exception as e:
+                    print(f"E-posta kuyruğu hatası: {e}")
+                    db.close()                   # bağlantı bozulduysa sonraki tur yenisini alır
+                    islenen = 0
+                if islenen:
+                    continue
+                self._bos.set()
+                self.session.close_if_idle()
+                self._uyandir.wait(self.poll_interval)
+        finally:
+            self.session.close()
+            db.close()
+
+    def _al(self, db: Database) -> List[Tuple]:
+        simdi = datetime.now()
+        kilit = "" if db.is_sqlite else "FOR UPDATE SKIP LOCKED"
+        with db.transaction():
+            return db.fetch_all(f"""
+                UPDATE eposta_kuyrugu
+                SET durum = 'gonderiliyor', deneme = deneme + 1, sonraki_deneme = %s
+                WHERE id IN (
+                    SELECT id FROM eposta_kuyrugu
+                    WHERE durum IN ('bekliyor', 'gonderiliyor') AND sonraki_deneme <= %s
+                    ORDER BY sonraki_deneme, id
+                    LIMIT %s
+                    {kilit}
+                )
+                RETURNING id, alici, konu, govde, deneme, olusturma;
+            """, (simdi + timedelta(seconds=self.lease), simdi, self.batch_size))
+
+    def _kira_yenile(self, db: Database, id_: int, deneme: int) -> bool:
+        """
+        Göndermeden önce iletinin kirasını lease kadar uzatır. Her alış deneme'yi
+        artırdığından (id, deneme) kiranın hâlâ bu göndericide olduğunu gösterir;
+        kira süresi dolup ileti başka göndericiye geçtiyse False döner.
+        """
+        with db.transaction():
+            return db.fetch_one("""
+                UPDATE eposta_kuyrugu
+                SET sonraki_deneme = %s
+                WHERE id = %s AND deneme = %s AND durum = 'gonderiliyor'
+                RETURNING id;
+            """, (datetime.now() + timedelta(seconds=self.lease), id_, deneme), prepared=True) is not None
+
+    def _ileti(self, alici: str, konu: str, govde: str):
+        msg = MIMEMultipart()
+        msg["From"] = self.sender
+        msg["To"] = alici
+        msg["Subject"] = konu
+        msg.attach(MIMEText(govde, "plain"))
+        return msg
+
+    def _bekleme(self, deneme: int) -> timedelta:
+        sn = min(self.backoff_base * 2 ** max(deneme - 1, 0), self.backoff_max)
+        return timedelta(seconds=sn * random.uniform(1.0, 1.1))
+
+    def _sonuc_yaz(self, db: Database, durum: str, id_: int, deneme: int,
+                   sonraki: Optional[datetime] = None, hata: Optional[str] = None) -> None:
+        """
+        İletinin sonucunu yazar; yalnızca kirası hâlâ bu göndericide olan satıra
+        (deneme = alıştaki değer). Kendi kısa işleminde commit edilir (dış işlem
+        varsa ona katılır); veritabanı hatası yükseltilir.
+        durum → 'gonderildi' | 'basarisiz' | 'bekliyor' | 'ertele' (hiç denenmedi)
+        """
+        with db.transaction():
+            if durum == "gonderildi":
+                db.execute_query("""
+                    UPDATE eposta_kuyrugu
+                    SET durum = 'gonderildi', govde = '', gonderim = %s, son_hata = NULL
+                    WHERE id = %s AND deneme = %s;
+                """, (datetime.now(), id_, deneme), prepared=True)
+            elif durum == "basarisiz":
+                db.execute_query("""
+                    UPDATE eposta_kuyrugu
+                    SET durum = 'basarisiz', govde = '', son_hata = %s
+                    WHERE id = %s AND deneme = %s;
+                """, (hata, id_, deneme), prepared=True)
+            else:
+                db.execute_query("""
+                    UPDATE eposta_kuyrugu
+                    SET durum = 'bekliyor', sonraki_deneme = %s, son_hata = %s,
+                        deneme = deneme - %s
+                    WHERE id = %s AND deneme = %s;
+                """, (sonraki, hata, int(durum == "ertele"), id_, deneme), prepared=True)
+
+    def process_batch(self, db: Database) -> int:
+        """
+        Sırası gelen en fazla batch_size iletiyi gönderir. Dönüş: alınan ileti sayısı
+        Her iletinin sonucu gönderimin hemen ardından kendi kısa işleminde yazılır:
+        kira yalnızca o tek iletinin gönderimini kapsamak zorundadır ve parti
+        ortasında çökme, teslim edilmiş iletileri yeniden göndermez.
+        """
+        parti = self._al(db)
+        if not parti:
+            return 0
+
+        sayac = {"gonderilen": 0, "basarisiz": 0, "yeniden_deneme": 0}
+        ertelenen: List[Tuple[int, int, datetime]] = []         # (id, deneme, sonraki_deneme)
+        oturum_hatasi: Optional[BaseException] = None
+        for id_, alici, konu, govde, deneme, olusturma in parti:
+            if oturum_hatasi is not None:
+                # Sunucuya ulaşılamıyor: denenmeyen iletiler deneme hakkı yemeden bekler
+                ertelenen.append((id_, deneme, datetime.now() + self._bekleme(deneme)))
+                continue
+            if not self._kira_yenile(db, id_, deneme):
+                continue                                   # kira süresi doldu, ileti başka göndericide
+            t0 = time.perf_counter()
+            try:
+                self.session.send(self._ileti(alici, konu, govde))
+            except Exception as e:
+                hata = f"{type(e).__name__}: {e}"
+                if _kalici_mi(e) or deneme >= self.max_attempts:
+                    self._sonuc_yaz(db, "basarisiz", id_, deneme, hata=hata)
+                    sayac["basarisiz"] += 1
+                else:
+                    self._sonuc_yaz(db, "bekliyor", id_, deneme,
+                                    datetime.now() + self._bekleme(deneme), hata)
+                    sayac["yeniden_deneme"] += 1
+                    if not isinstance(e, smtplib.SMTPResponseException) or \
+                            isinstance(e, smtplib.SMTPAuthenticationError):
+                        oturum_hatasi = e                  # bağlantı/kimlik sorunu: partiyi bırak
+                continue
+            self._sonuc_yaz(db, "gonderildi", id_, deneme)
+            sayac["gonderilen"] += 1
+            self._gonderim_ms.append((time.perf_counter() - t0) * 1000)
+            self._bekleme_s.append((datetime.now() - olusturma.replace(tzinfo=None)).total_seconds())
+
+        if ertelenen:
+            with db.transaction():
+                for id_, deneme, sonraki in ertelenen:
+                    self._sonuc_yaz(db, "ertele", id_, deneme, sonraki, str(oturum_hatasi))
+            sayac["yeniden_deneme"] += len(ertelenen)
+
+        with self._kilit:
+            for k, n in sayac.items():
+                self._sayac[k] += n
+        if oturum_hatasi is not None:
+            print(f"E-posta gönderilemedi, yeniden denenecek: {oturum_hatasi}")
+        return len(parti)
+
+    # ------------------------------------------------------------------
+    # İzleme
+    # ------------------------------------------------------------------
+    def queue_depth(self, db: Optional[Database] = None) -> Dict[str, int]:
+        kendi = db is None
+        if kendi:
+            db = Database(backend=self.backend)
+            db.connect()
+        try:
+            rows = db.fetch_all("SELECT durum, COUNT(*) FROM eposta_kuyrugu GROUP BY durum;")
+        finally:
+            if kendi:
+                db.close()
+        return {durum: int(n) for durum, n in rows}
+
+    def stats(self, db: Optional[Database] = None) -> Dict[str, Any]:
+        def ozet(orn):
+            s = sorted(orn)
+            if not s:
+                return None
+            return {"p50": _yuzdelik(s, 50), "p95": _yuzdelik(s, 95), "maks": s[-1]}
+
+        with self._kilit:
+            sayac = dict(self._sayac)
+            gonderim, bekleme = list(self._gonderim_ms), list(self._bekleme_s)
+        return {
+            "kuyruk": self.queue_depth(db),
+            **sayac,
+            "smtp_oturumu": self.session.acilis,
+            "gonderim_ms": ozet(gonderim),
+            "bekleme_s": ozet(bekleme),
+        }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Süreç genelinde tek kuyruk
+# ────────────────────────────────────────────────────────────────────────────────
+email_outbox = EmailOutbox(**EMAIL_CONFIG)
+atexit.register(email_outbox.stop, 2.0)
+
+
+def _yazdir(istatistik: Dict[str, Any]) -> None:
+    kuyruk = istatistik["kuyruk"]
+    print("Kuyruk: " + (", ".join(f"{d}={n}" for d, n in sorted(kuyruk.items())) or "boş"))
+    print(f"Gönderilen {istatistik['gonderilen']}, başarısız {istatistik['basarisiz']}, "
+          f"yeniden denenecek {istatistik['yeniden_deneme']}, "
+          f"SMTP oturumu {istatistik['smtp_oturumu']}")
+    for ad, birim in (("gonderim_ms", "ms"), ("bekleme_s", "sn")):
+        o = istatistik[ad]
+        if o:
+            print(f"{ad}: p50 {o['p50']:.1f} {birim}, p95 {o['p95']:.1f} {birim}, maks {o['maks']:.1f} {birim}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="E-posta kuyruğu durumu / elle boşaltma")
+    ap.add_argument("--durum", action="store_true", help="kuyruk derinliğini yazdır")
+    ap.add_argument("--bosalt", action="store_true", help="sırası gelen iletileri şimdi gönder")
+    ap.add_argument("--zaman-asimi", type=float, default=120.0, help="--bosalt için en fazla bekleme (sn)")
+    args = ap.parse_args()
+
+    if args.bosalt:
+        email_outbox.start()
+        if not email_outbox.wait_idle(args.zaman_asimi):
+            print("Zaman aşımı: kuyruk boşaltılamadı.")
+        email_outbox.stop()
+    _yazdir(email_outbox.stats())
+
+
+if __name__ == "__main__":
+    main()
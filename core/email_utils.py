@@ -1,15 +1,8 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from core.email_outbox import email_outbox
 
-def send_login_email(email: str, password: str, tc_no: str) -> None:
-    # GÖNDEREN BİLGİLERİ — Gmail üzerinden test ediyorsan aşağıyı düzenle
-    GONDEREN_EMAIL = "elifceler55@gmail.com"
-    GONDEREN_SIFRE = "dgix xpia tfth qzza"  # Gmail için özel uygulama şifresi alman gerekir
-    SMTP_SERVER = "smtp.gmail.com"
-    SMTP_PORT = 587
 
-    # Mail içeriği
+def login_email(email: str, password: str, tc_no: str):
+    """Giriş bilgisi e-postasının (konu, metin) çifti"""
     konu = "Diyabet Takip Sistemi Giriş Bilgileri"
     mesaj = f"""Merhaba,
 
@@ -21,19 +14,14 @@ Diyabet Takip Sistemine giriş yapmak için aşağıdaki bilgileri kullanabilirs
 
 Sağlıklı günler dileriz.
 """
+    return konu, mesaj
 
-    msg = MIMEMultipart()
-    msg["From"] = GONDEREN_EMAIL
-    msg["To"] = email
-    msg["Subject"] = konu
-    msg.attach(MIMEText(mesaj, "plain"))
 
-    # Mail gönderimi
+def send_login_email(email: str, password: str, tc_no: str) -> int:
+    # SMTP ayarları data/config.py → EMAIL_CONFIG. İleti kalıcı kuyruğa yazılır,
+    # arka plan göndericisi iletir (core/email_outbox.py); arayüz beklemez.
+    konu, mesaj = login_email(email, password, tc_no)
     try:
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(GONDEREN_EMAIL, GONDEREN_SIFRE)
-        server.send_message(msg)
-        server.quit()
+        return email_outbox.enqueue(email, konu, mesaj)
     except Exception as e:
-        raise RuntimeError(f"E-posta gönderimi başarısız oldu: {e}")
+        raise RuntimeError(f"E-posta kuyruğa alınamadı: {e}")
@@ -0,0 +1,127 @@
+# core/figure_manager.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Tk panellerine gömülen matplotlib figürlerinin yaşam döngüsü.
+
+plt.subplots() ile açılan her figür pyplot kayıt defterinde kalır ve hiç
+kapatılmadığı için hastadan hastaya geçtikçe süreç belleği büyür. Burada:
+
+• Figürler pyplot yerine doğrudan matplotlib.figure.Figure ile oluşturulur;
+  süreç genelinde bir kayıt defterine girmez
+• Her (konteyner, anahtar) için tek panel (figür + tuval) vardır; aynı panel
+  yenilendiğinde tuval yeniden kullanılır, çizim nesneleri (panel.artists)
+  yerinde güncellenir
+• Tuvalin Tk widget'ı yok edildiğinde (pencere kapanınca ya da panel
+  temizlenince) figür hemen boşaltılır ve kayıttan düşer
+
+    panel = figure_manager.panel(container, "ilerleme", figsize=(5, 3.5),
+                                 fill=tk.BOTH, expand=True)
+    if "cubuklar" not in panel.artists:
+        panel.artists["cubuklar"] = panel.ax.bar(...)
+    else:
+        ...  # set_height / set_data
+    panel.redraw()
+
+matplotlib modülleri ilk panel açılırken yüklenir; bu modülü içe aktarmak
+giriş ekranının açılışını yavaşlatmaz (core/warmup.py).
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+class FigurePanel:
+    def __init__(self, container, figure: Figure, pack: Dict[str, Any]):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.figure = figure
+        self.ax = figure.axes[0] if figure.axes else figure.add_subplot()
+        self.canvas = FigureCanvasTkAgg(figure, master=container)
+        self.widget = self.canvas.get_tk_widget()
+        self.widget.pack(**pack)
+        self.artists: Dict[str, Any] = {}       # yerinde güncellenecek çizim nesneleri
+
+    def redraw(self) -> None:
+        self.canvas.draw_idle()
+
+    def alive(self) -> bool:
+        return self.widget is not None and bool(self.widget.winfo_exists())
+
+    def release(self) -> None:
+        """Figürü boşaltır ve tuvalle bağını koparır (widget zaten yok edilmiş olabilir)."""
+        if self.figure is not None:
+            self.figure.clear()
+        self.artists.clear()
+        self.figure = self.ax = self.canvas = self.widget = None
+
+
+class FigureManager:
+    def __init__(self):
+        self._paneller: Dict[Tuple[str, str], FigurePanel] = {}
+
+    @staticmethod
+    def _anahtar(container, key: str) -> Tuple[str, str]:
+        return (str(container), key)
+
+    def _kaydet(self, container, key: str, panel: FigurePanel) -> FigurePanel:
+        anahtar = self._anahtar(container, key)
+        self._paneller[anahtar] = panel
+
+        def yok_edildi(_event) -> None:
+            if self._paneller.get(anahtar) is panel:
+                del self._paneller[anahtar]
+            panel.release()
+
+        panel.widget.bind("<Destroy>", yok_edildi, add="+")
+        return panel
+
+    # ------------------------------------------------------------------
+    # Panel oluşturma / yeniden kullanma
+    # ------------------------------------------------------------------
+    def get(self, container, key: str) -> Optional[FigurePanel]:
+        panel = self._paneller.get(self._anahtar(container, key))
+        return panel if panel is not None and panel.alive() else None
+
+    def panel(self, container, key: str, figsize=(6, 4), **pack) -> FigurePanel:
+        """Konteynerdeki anahtarlı paneli döndürür; yoksa boş bir eksenle oluşturur.
+        Yeni panelde panel.artists boştur."""
+        panel = self.get(container, key)
+        if panel is None:
+            from matplotlib.figure import Figure
+            panel = self._kaydet(container, key, FigurePanel(container, Figure(figsize=figsize), pack))
+        return panel
+
+    def attach(self, container, key: str, figure: Figure, **pack) -> FigurePanel:
+        """Hazır kurulmuş bir Figure'ı konteynere bağlar (aynı anahtarlı eski panel kaldırılır)."""
+        self.release(container, key)
+        panel = self._kaydet(container, key, FigurePanel(container, figure, pack))
+        panel.canvas.draw()
+        return panel
+
+    # ------------------------------------------------------------------
+    # Bırakma
+    # ------------------------------------------------------------------
+    def release(self, container, key: str) -> None:
+        panel = self._paneller.get(self._anahtar(container, key))
+        if panel is not None and panel.alive():
+            panel.widget.destroy()              # <Destroy> kaydı siler ve figürü boşaltır
+
+    def clear(self, container, keep: Optional[str] = None) -> None:
+        """Konteynerin tüm çocuklarını yok eder; keep anahtarlı panel (varsa) korunur."""
+        korunan = self.get(container, keep) if keep else None
+        for child in container.winfo_children():
+            if korunan is None or child is not korunan.widget:
+                child.destroy()
+
+    def live_count(self) -> int:
+        """Açık figür sayısı (bellek izleme için)."""
+        return sum(1 for p in self._paneller.values() if p.alive())
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Süreç genelinde tek yönetici (yalnızca Tk iş parçacığından kullanılır)
+# ────────────────────────────────────────────────────────────────────────────────
+figure_manager = FigureManager()
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from core.database import Database
+from core.ui_stream import KeysetPager
 
 
 def open_gecmis_oneriler_window(hasta_id: int) -> None:
@@ -37,33 +38,32 @@ def open_gecmis_oneriler_window(hasta_id: int) -> None:
 
     db = Database(); db.connect()
 
+    def add_rows(tv: ttk.Treeview):
+        def ekle(rows):
+            for _, tarih, saat, ad, _ in rows:
+                tarih_str = f"{tarih.strftime('%d.%m.%Y')} {saat.strftime('%H:%M')}"
+                tv.insert("", "end", values=(tarih_str, ad))
+        return ekle
+
+    # Geçmiş sayfa sayfa gelir; "Daha Fazla" bir önceki sayfanın son
+    # satırından (tarih, saat, id) devam eder
+    diet_btn = ttk.Button(frm_diet, text="Daha Fazla")
+    diet_btn.pack(pady=2)
+    exercise_btn = ttk.Button(frm_exercise, text="Daha Fazla")
+    exercise_btn.pack(pady=2)
+    sayfa_anahtari = lambda r: (r[1], r[2], r[0])
+    diet_pager = KeysetPager(
+        lambda after, limit: db.page_diet_history(hasta_id, after, limit),
+        add_rows(tv_diet), key=sayfa_anahtari, button=diet_btn)
+    exercise_pager = KeysetPager(
+        lambda after, limit: db.page_exercise_history(hasta_id, after, limit),
+        add_rows(tv_exercise), key=sayfa_anahtari, button=exercise_btn)
+
     def load_data():
         tv_diet.delete(*tv_diet.get_children())
         tv_exercise.delete(*tv_exercise.get_children())
-
-        diet_rows = db.fetch_all("""
-            SELECT tarih, saat, dtr.ad
-            FROM   diyet_takibi dt
-            JOIN   diyet_turleri dtr ON dt.diyet_turu_id = dtr.id
-            WHERE  dt.hasta_id = %s
-            ORDER BY tarih DESC, saat DESC;
-        """, (hasta_id,))
-
-        for tarih, saat, diyet in diet_rows:
-            tarih_str = f"{tarih.strftime('%d.%m.%Y')} {saat.strftime('%H:%M')}"
-            tv_diet.insert("", "end", values=(tarih_str, diyet))
-
-        exercise_rows = db.fetch_all("""
-            SELECT tarih, saat, etr.ad
-            FROM   egzersiz_takibi et
-            JOIN   egzersiz_turleri etr ON et.egzersiz_turu_id = etr.id
-            WHERE  et.hasta_id = %s
-            ORDER BY tarih DESC, saat DESC;
-        """, (hasta_id,))
-
-        for tarih, saat, egzersiz in exercise_rows:
-            tarih_str = f"{tarih.strftime('%d.%m.%Y')} {saat.strftime('%H:%M')}"
-            tv_exercise.insert("", "end", values=(tarih_str, egzersiz))
+        diet_pager.reset()
+        exercise_pager.reset()
 
     load_data()
 
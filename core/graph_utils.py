@@ -1,55 +1,113 @@
 import tkinter as tk
-from core.database import Database
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-import matplotlib.lines as mlines
+from core.async_db import run_async
+from core.figure_manager import figure_manager
+# matplotlib/numpy yalnızca grafik kurulurken yüklenir (açılış süresi, core/warmup.py)
 
-def show_combined_graph(hasta_id: int):
-    db = Database(); db.connect()
-    rows = db.get_diet_exercise_blood_sugar_graph_data(hasta_id)
-    db.close()
+# Database.get_glucose_series / get_diet_exercise_series dönemleri
+DONEM_ADLARI = {"gun": "Günlük", "hafta": "Haftalık", "ay": "Aylık"}
+_ETIKET_BICIMI = {"gun": "%d.%m.%Y", "hafta": "%d.%m.%Y", "ay": "%m.%Y"}
 
-    if not rows:
-        from tkinter import messagebox
-        messagebox.showinfo("Bilgi", "Gösterilecek grafik verisi bulunamadı.")
-        return
 
-    tarihler = []
-    seviyeler = []
-    renkler = []
-    markerlar = []
-
-    renk_haritasi = {}
-    renkler_listesi = ["blue", "green", "orange", "purple", "red", "brown"]
-    marker_map = {True: "o", False: "X"}
-
-    for row in rows:
-        tarih, diyet, diyet_durumu, egzersiz_durumu, ort = row
-        if ort is None:
-            continue
-        t_str = tarih.strftime("%d.%m")
-        if diyet not in renk_haritasi:
-            renk_haritasi[diyet] = renkler_listesi[len(renk_haritasi) % len(renkler_listesi)]
-
-        tarihler.append(t_str)
-        seviyeler.append(ort)
-        renkler.append(renk_haritasi[diyet])
-        markerlar.append(marker_map[egzersiz_durumu])
+def donem_etiketi(baslangic, donem: str) -> str:
+    """Eksen etiketi: gün/hafta başı → 05.03.2025, ay → 03.2025"""
+    return baslangic.strftime(_ETIKET_BICIMI[donem])
 
 
+def show_combined_graph(hasta_id: int):
+    # Pencere hemen açılır; veri arka planda çekilirken "Yükleniyor…" görünür
+    win = tk.Toplevel()
+    win.title("İlişkisel Grafik")
+    win.geometry("1200x600")     # figsize=(12, 6)
+    run_async(win, lambda db: db.get_diet_exercise_series(hasta_id),
+              on_success=lambda sonuc: _draw_combined_graph(win, *sonuc))
+
+
+def lttb_indices(x, y, n_out: int):
+    """
+    Largest-Triangle-Three-Buckets: eğrinin görünür şeklini koruyarak
+    n_out nokta seçer. İlk ve son nokta her zaman kalır; aradaki her kovadan,
+    önceki seçilen nokta ve sonraki kovanın ortalamasıyla en büyük üçgeni
+    oluşturan nokta alınır. Dönüş: seçilen indeksler (artan sırada)
+    """
+    import numpy as np
+
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    sinirlar = np.linspace(1, n - 1, n_out - 1).astype(int)     # iç kovaların sınırları
+    secilen = np.empty(n_out, dtype=int)
+    secilen[0], secilen[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        bas, bit = sinirlar[i], sinirlar[i + 1]
+        sonraki = slice(bit, sinirlar[i + 2] if i + 2 < len(sinirlar) else n)
+        ort_x, ort_y = x[sonraki].mean(), y[sonraki].mean()
+        alan = np.abs((x[a] - ort_x) * (y[bas:bit] - y[a])
+                      - (x[a] - x[bas:bit]) * (ort_y - y[a]))
+        a = bas + int(alan.argmax())
+        secilen[i + 1] = a
+    return secilen
+
+
+def build_combined_figure(donem, rows, figsize=(12, 6)):
+    """
+    Diyet/egzersiz – kan şekeri grafiğini Tk'dan bağımsız kurar.
+    • Gerçek tarih ekseni (datetime64); etiketler ölçeğe göre seyrekleşir
+    • (diyet, egzersiz) grubu başına tek scatter çağrısı — nokta sayısı kadar
+      çizim nesnesi oluşmaz
+    • Nokta sayısı eksenin piksel genişliğini aşarsa LTTB ile seyreltilir
+    Ortalaması olmayan satırlar atlanır; çizilecek nokta yoksa None döner.
+    """
+    gecerli = [r for r in rows if r[4] is not None]
+    if not gecerli:
+        return None
+
+    import matplotlib.dates as mdates
+    import matplotlib.lines as mlines
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    tarihler = np.array([r[0] for r in gecerli], dtype="datetime64[D]")
+    seviyeler = np.array([float(r[4]) for r in gecerli])
+    diyetler = np.array([r[1] for r in gecerli], dtype=object)
+    egzersiz = np.array([bool(r[3]) for r in gecerli])
+
+    fig = Figure(figsize=figsize)  # Daha geniş görünüm; pyplot kayıt defterine girmez
+    ax = fig.add_subplot()
+
+    genislik = int(ax.get_position().width * fig.get_figwidth() * fig.dpi)
+    if len(tarihler) > genislik:
+        secilen = lttb_indices(tarihler.astype(np.int64), seviyeler, genislik)
+        tarihler, seviyeler = tarihler[secilen], seviyeler[secilen]
+        diyetler, egzersiz = diyetler[secilen], egzersiz[secilen]
 
-    fig, ax = plt.subplots(figsize=(12, 6))  # Daha geniş görünüm
-    for i in range(len(tarihler)):
-        ax.scatter(tarihler[i], seviyeler[i], color=renkler[i], marker=markerlar[i], s=100)
+    renkler_listesi = ["blue", "green", "orange", "purple", "red", "brown"]
+    renk_haritasi = {
+        diyet: renkler_listesi[i % len(renkler_listesi)]
+        for i, diyet in enumerate(dict.fromkeys(diyetler))
+    }
+    marker_map = {True: "o", False: "X"}
 
-    # Noktaları çizgiyle birleştir — aynı sırada olmalı
+    # Noktaları çizgiyle birleştir — tarih sırasıyla
     ax.plot(tarihler, seviyeler, color="gray", linestyle='-', linewidth=1, alpha=0.5)
+    for diyet, renk in renk_haritasi.items():
+        diyet_maskesi = diyetler == diyet
+        for yapildi, marker in marker_map.items():
+            m = diyet_maskesi & (egzersiz == yapildi)
+            if m.any():
+                ax.scatter(tarihler[m], seviyeler[m], color=renk, marker=marker, s=100)
 
-    ax.set_title("Diyet/Egzersiz – Kan Şekeri İlişkisi")
+    ax.set_title(f"Diyet/Egzersiz – Kan Şekeri İlişkisi ({DONEM_ADLARI[donem]})")
     ax.set_xlabel("Tarih")
     ax.set_ylabel("Ortalama Kan Şekeri (mg/dL)")
     ax.grid(True)
-    ax.tick_params(axis='x', rotation=45)
+    konumlayici = mdates.AutoDateLocator()
+    ax.xaxis.set_major_locator(konumlayici)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(konumlayici))
 
     # Özel legend: diyetler (renk), egzersiz (şekil) ayrı ayrı gösterilecek
     legend_elements = []
@@ -72,10 +130,16 @@ def show_combined_graph(hasta_id: int):
     )
 
     ax.legend(handles=legend_elements, loc="best")
+    return fig
 
-    # Grafik pencereyi göster
-    win = tk.Toplevel()
-    win.title("İlişkisel Grafik")
-    canvas = FigureCanvasTkAgg(fig, master=win)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+def _draw_combined_graph(win, donem, rows):
+    fig = build_combined_figure(donem, rows)
+    if fig is None:
+        from tkinter import messagebox
+        messagebox.showinfo("Bilgi", "Gösterilecek grafik verisi bulunamadı.")
+        win.destroy()
+        return
+
+    # Grafik pencereyi göster; pencere kapanınca figür bırakılır
+    figure_manager.attach(win, "iliski", fig, fill=tk.BOTH, expand=True)
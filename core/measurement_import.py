@@ -0,0 +1,263 @@
+# core/measurement_import.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Glukometre / CSV geçmişinin toplu aktarımı.
+
+Akış
+----
+1. CSV (ya da .csv.gz) satır satır akıtılır; dosya belleğe alınmaz
+2. Satırlar doğrulanır ve partiler hâlinde olcum_zamanlari slotuna sınıflandırılır
+3. Her parti COPY ile (SQLite'ta executemany) geçici tabloya yüklenir
+4. Tek INSERT … SELECT ile kan_sekeri_olcumleri'ne aktarılır
+   (aynı gün aynı slot ikinci kez yazılmaz — gün/slot tekil indeksi)
+5. Günlük ortalama/doz tetikleyicilerle güncellenir; etkilenen her
+   (hasta_id, gün) için eksik ölçüm uyarıları (insulin_gunu_yenile) bir kez yenilenir
+
+Tüm aktarım tek işlemdir: hata olursa hiçbir satır yazılmaz.
+Anlık düşük/yüksek uyarıları geçmiş veriler için üretilmez; yalnızca
+günlük ortalama ve eksik ölçüm uyarıları yeniden hesaplanır.
+
+CSV sütunları (başlık satırı zorunlu):
+    hasta_id | tc_no , olcum_zamani , seviye
+Tek hastalık cihaz dökümlerinde hasta sütunu yerine --hasta-id verilebilir.
+
+Kullanım:
+    python -m core.measurement_import olcumler.csv.gz --hasta-id 3
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import gzip
+import io
+import time
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.database import Database
+from core.reference_cache import reference_cache
+
+TARIH_BICIMLERI = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+)
+SEVIYE_ARALIGI = (0, 500)   # patient_window.kaydet ile aynı sınırlar
+
+_AKTARIM_TABLOSU = "_olcum_aktarim"
+_KOLONLAR = ("hasta_id", "olcum_zamani", "olcum_zamani_id", "seviye")
+
+_STAGING_DDL = {
+    "postgresql": f"""
+        CREATE TEMP TABLE {_AKTARIM_TABLOSU} (
+            sira            SERIAL,
+            hasta_id        INT NOT NULL,
+            olcum_zamani    TIMESTAMPTZ NOT NULL,
+            olcum_zamani_id INT,
+            seviye          INT NOT NULL
+        ) ON COMMIT DROP;
+    """,
+    # SQLite'ta ON COMMIT DROP yok; tablo _merge_staging sonunda silinir
+    "sqlite": f"""
+        CREATE TEMP TABLE {_AKTARIM_TABLOSU} (
+            sira            INTEGER PRIMARY KEY,
+            hasta_id        INT NOT NULL,
+            olcum_zamani    TIMESTAMPTZ NOT NULL,
+            olcum_zamani_id INT,
+            seviye          INT NOT NULL
+        );
+    """,
+}
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Yardımcılar
+# ────────────────────────────────────────────────────────────────────────────────
+def _open_text(path: str) -> io.TextIOBase:
+    """Düz ya da gzip'li CSV'yi metin akışı olarak açar (gzip sihirli baytına bakar)."""
+    with open(path, "rb") as f:
+        sihirli = f.read(2)
+    if sihirli == b"\x1f\x8b":
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def _parse_ts(raw: str) -> datetime:
+    raw = raw.strip()
+    for fmt in TARIH_BICIMLERI:
+        try:
+            return datetime.strptime(raw, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"tarih/saat okunamadı: {raw!r}")
+
+
+def _merge_staging(db: Database) -> List[Tuple[int, Any, int]]:
+    """
+    Geçici tablodaki satırları kan_sekeri_olcumleri'ne aktarır.
+    Slot kuralı (aynı gün + aynı slot tek ölçüm) kan_sekeri_olcumleri_gun_slot_uidx
+    ile korunur: hem tablodaki hem dosyadaki ilk kayıt kalır, diğerleri atlanır.
+    Dönüş: [(hasta_id, gün, eklenen_adet), ...]
+    """
+    if db.backend.name != "sqlite":
+        return db.fetch_all(f"""
+            WITH eklenen AS (
+                INSERT INTO kan_sekeri_olcumleri (hasta_id, olcum_zamani, olcum_zamani_id, seviye)
+                SELECT hasta_id, olcum_zamani, olcum_zamani_id, seviye
+                FROM   {_AKTARIM_TABLOSU}
+                ORDER  BY sira
+                ON CONFLICT (hasta_id, olcum_gunu, olcum_zamani_id) DO NOTHING
+                RETURNING hasta_id, olcum_gunu
+            )
+            SELECT hasta_id, olcum_gunu, COUNT(*) FROM eklenen GROUP BY hasta_id, olcum_gunu;
+        """)
+
+    # SQLite: INSERT … RETURNING CTE içinde kullanılamaz; gruplama Python'da
+    # (WHERE TRUE, SELECT ile ON CONFLICT arasındaki ayrıştırma belirsizliğini giderir)
+    eklenen = db.fetch_all(f"""
+        INSERT INTO kan_sekeri_olcumleri (hasta_id, olcum_zamani, olcum_zamani_id, seviye)
+        SELECT hasta_id, olcum_zamani, olcum_zamani_id, seviye
+        FROM   {_AKTARIM_TABLOSU}
+        WHERE  TRUE
+        ORDER  BY sira
+        ON CONFLICT (hasta_id, olcum_gunu, olcum_zamani_id) DO NOTHING
+        RETURNING hasta_id, olcum_gunu;
+    """)
+    db.execute_query(f"DROP TABLE {_AKTARIM_TABLOSU};")
+    sayac = Counter((h, gun if isinstance(gun, date) else date.fromisoformat(gun))
+                    for h, gun in eklenen)
+    return [(h, gun, adet) for (h, gun), adet in sayac.items()]
+
+
+def _batches(reader: csv.DictReader, size: int) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    batch = []
+    for row in reader:
+        batch.append((reader.line_num, row))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Ana fonksiyon
+# ────────────────────────────────────────────────────────────────────────────────
+def import_measurements(path: str, hasta_id: Optional[int] = None,
+                        batch_size: int = 5000, db: Optional[Database] = None) -> Dict[str, Any]:
+    """
+    CSV dosyasını aktarır ve bir özet sözlüğü döndürür:
+        okunan, gecersiz, yuklenen, mukerrer, gun_sayisi, sure, satir_per_sn, hatalar
+    hatalar → [(satır_no, açıklama), ...]
+    """
+    own_db = db is None
+    if own_db:
+        db = Database(); db.connect()
+
+    baslangic = time.perf_counter()
+    okunan = yuklenen_staging = 0
+    hatalar: List[Tuple[int, str]] = []
+
+    try:
+        with db.transaction():
+            hastalar = db.fetch_all("SELECT id, tc_no FROM kullanicilar WHERE rol = 'hasta';")
+            gecerli_idler = {h_id for h_id, _ in hastalar}
+            tc_to_id = {tc: h_id for h_id, tc in hastalar}
+            siniflandirici = reference_cache.classifier(db)
+
+            db.execute_query(_STAGING_DDL[db.backend.name])
+
+            with _open_text(path) as f:
+                reader = csv.DictReader(f)
+                alanlar = set(reader.fieldnames or ())
+                if not {"olcum_zamani", "seviye"} <= alanlar:
+                    raise ValueError("CSV başlığında 'olcum_zamani' ve 'seviye' sütunları olmalı.")
+                if hasta_id is None and not alanlar & {"hasta_id", "tc_no"}:
+                    raise ValueError("CSV'de 'hasta_id' ya da 'tc_no' sütunu yok; --hasta-id verin.")
+
+                for batch in _batches(reader, batch_size):
+                    okunan += len(batch)
+                    gecerli: List[Tuple[int, datetime, int]] = []
+
+                    for line_no, row in batch:
+                        try:
+                            if hasta_id is not None:
+                                h_id = hasta_id
+                            elif row.get("hasta_id"):
+                                h_id = int(row["hasta_id"])
+                            else:
+                                h_id = tc_to_id.get((row.get("tc_no") or "").strip())
+                            if h_id not in gecerli_idler:
+                                raise ValueError("hasta bulunamadı")
+
+                            seviye = int(str(row["seviye"]).strip())
+                            if not SEVIYE_ARALIGI[0] <= seviye <= SEVIYE_ARALIGI[1]:
+                                raise ValueError(f"seviye {SEVIYE_ARALIGI[0]}-{SEVIYE_ARALIGI[1]} dışında")
+
+                            gecerli.append((h_id, _parse_ts(row["olcum_zamani"] or ""), seviye))
+                        except (ValueError, TypeError) as e:
+                            hatalar.append((line_no, str(e)))
+
+                    zaman_idleri = siniflandirici.classify_many([ts for _, ts, _ in gecerli])
+                    yuklenen_staging += db.copy_rows(
+                        _AKTARIM_TABLOSU, _KOLONLAR,
+                        ((h, ts, z, sev) for (h, ts, sev), z in zip(gecerli, zaman_idleri)),
+                    )
+
+            gunler = _merge_staging(db)
+            yuklenen = sum(c for _, _, c in gunler)
+
+            # Günlük ortalama + eksik ölçüm uyarıları: etkilenen her gün için bir kez
+            db.refresh_insulin_days((h, g) for h, g, _ in gunler)
+    finally:
+        if own_db:
+            db.close()
+
+    sure = time.perf_counter() - baslangic
+    return dict(
+        okunan=okunan,
+        gecersiz=len(hatalar),
+        yuklenen=yuklenen,
+        mukerrer=yuklenen_staging - yuklenen,
+        gun_sayisi=len(gunler),
+        sure=sure,
+        satir_per_sn=okunan / sure if sure > 0 else 0.0,
+        hatalar=hatalar,
+    )
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Komut satırı
+# ────────────────────────────────────────────────────────────────────────────────
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m core.measurement_import",
+        description="CSV/CSV.GZ kan şekeri geçmişini toplu aktarır.",
+    )
+    ap.add_argument("dosya", help="CSV ya da gzip'li CSV dosyası")
+    ap.add_argument("--hasta-id", type=int, help="dosyada hasta sütunu yoksa tüm satırların hastası")
+    ap.add_argument("--parti", type=int, default=5000, help="COPY parti boyutu (satır)")
+    ap.add_argument("--hata-goster", type=int, default=20, help="yazdırılacak en fazla hatalı satır")
+    args = ap.parse_args(argv)
+
+    r = import_measurements(args.dosya, hasta_id=args.hasta_id, batch_size=args.parti)
+
+    print(f"Okunan satır      : {r['okunan']}")
+    print(f"Yüklenen ölçüm    : {r['yuklenen']}")
+    print(f"Mükerrer (atlandı): {r['mukerrer']}")
+    print(f"Geçersiz satır    : {r['gecersiz']}")
+    print(f"Yenilenen gün     : {r['gun_sayisi']}")
+    print(f"Süre              : {r['sure']:.2f} sn ({r['satir_per_sn']:.0f} satır/sn)")
+    for line_no, hata in r["hatalar"][:args.hata_goster]:
+        print(f"  satır {line_no}: {hata}")
+    if r["gecersiz"] > args.hata_goster:
+        print(f"  … {r['gecersiz'] - args.hata_goster} hata daha")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
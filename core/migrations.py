@@ -0,0 +1,157 @@
+# core/migrations.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Sürümlü şema göçleri (migration).
+
+data/migrations/NNNN_ad.sql dosyaları numara sırasıyla uygulanır; her biri
+kendi işleminde çalışır ve schema_migrations tablosuna sağlama toplamıyla
+kaydedilir. Uygulanmış bir dosya sonradan değiştirilirse çalıştırıcı durur.
+Aynı anda iki çalıştırıcının çakışmaması için PostgreSQL advisory lock alınır.
+
+SQLite arka ucu kendi göçlerini data/migrations/sqlite/ klasöründen okur
+(aynı şemanın SQLite lehçesi) ve ilk bağlantıda bunları kendiliğinden uygular.
+
+Kullanım:
+    python -m core.migrations            # bekleyen göçleri uygula
+    python -m core.migrations --durum    # uygulanan / bekleyen listesi
+    python -m core.migrations --hedef 3  # en fazla 0003'e kadar uygula
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from core.database import Database
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "migrations")
+SQLITE_MIGRATIONS_DIR = os.path.join(MIGRATIONS_DIR, "sqlite")
+_DOSYA_ADI = re.compile(r"^(\d{4})_([\w]+)\.sql$")
+_KILIT_ANAHTARI = 4747_2025   # pg_advisory_lock için sabit anahtar
+
+
+class MigrationError(RuntimeError):
+    """Göç dosyaları ile veritabanındaki kayıtlar uyuşmuyor."""
+
+
+def discover(directory: str = MIGRATIONS_DIR) -> List[Tuple[int, str, str]]:
+    """Klasördeki göçler: [(sürüm, ad, yol), ...] sürüme göre sıralı."""
+    found = []
+    for name in os.listdir(directory):
+        m = _DOSYA_ADI.match(name)
+        if m:
+            found.append((int(m.group(1)), m.group(2), os.path.join(directory, name)))
+    found.sort()
+    surumler = [v for v, _, _ in found]
+    if len(surumler) != len(set(surumler)):
+        raise MigrationError("Aynı sürüm numarasına sahip birden fazla göç dosyası var.")
+    return found
+
+
+def migrations_dir(db: Database) -> str:
+    """Arka uca göre göç klasörü."""
+    return SQLITE_MIGRATIONS_DIR if db.is_sqlite else MIGRATIONS_DIR
+
+
+def _checksum(sql: str) -> str:
+    return hashlib.sha256(sql.encode("utf-8")).hexdigest()
+
+
+def _ensure_table(db: Database) -> None:
+    with db.transaction():
+        db.execute_query("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                surum      INT PRIMARY KEY,
+                ad         TEXT NOT NULL,
+                checksum   CHAR(64) NOT NULL,
+                uygulandi  TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+
+
+def applied(db: Database) -> Dict[int, Tuple[str, str]]:
+    """Uygulanmış göçler: {sürüm: (ad, checksum)}"""
+    rows = db.fetch_all("SELECT surum, ad, checksum FROM schema_migrations ORDER BY surum;")
+    return {v: (ad, cs) for v, ad, cs in rows}
+
+
+def migrate(db: Optional[Database] = None, target: Optional[int] = None,
+            directory: Optional[str] = None) -> List[Tuple[int, str]]:
+    """Bekleyen göçleri uygular; uygulananları [(sürüm, ad), ...] olarak döndürür."""
+    own_db = db is None
+    if own_db:
+        db = Database(); db.connect()
+
+    directory = directory or migrations_dir(db)
+    # SQLite'ta yazıcı zaten tektir; eşzamanlı çalıştırıcı schema_migrations PK'sine takılır
+    kilit = not db.is_sqlite
+
+    done: List[Tuple[int, str]] = []
+    try:
+        _ensure_table(db)
+        if kilit:
+            db.fetch_one("SELECT pg_advisory_lock(%s);", (_KILIT_ANAHTARI,))
+        try:
+            mevcut = applied(db)
+            for surum, ad, yol in discover(directory):
+                if target is not None and surum > target:
+                    break
+                with open(yol, encoding="utf-8") as f:
+                    sql = f.read()
+                cs = _checksum(sql)
+
+                if surum in mevcut:
+                    if mevcut[surum][1] != cs:
+                        raise MigrationError(
+                            f"{surum:04d}_{ad}.sql uygulandıktan sonra değiştirilmiş; "
+                            "değişiklikler yeni bir göç dosyası olarak eklenmeli."
+                        )
+                    continue
+
+                with db.transaction():
+                    db.execute_script(sql)
+                    db.execute_query(
+                        "INSERT INTO schema_migrations (surum, ad, checksum) VALUES (%s, %s, %s);",
+                        (surum, ad, cs),
+                    )
+                print(f"Göç uygulandı: {surum:04d}_{ad}")
+                done.append((surum, ad))
+        finally:
+            if kilit:
+                db.fetch_one("SELECT pg_advisory_unlock(%s);", (_KILIT_ANAHTARI,))
+                db.connection.commit()
+    finally:
+        if own_db:
+            db.close()
+    return done
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m core.migrations",
+                                 description="Veritabanı şema göçlerini uygular.")
+    ap.add_argument("--durum", action="store_true", help="uygulanan ve bekleyen göçleri listele")
+    ap.add_argument("--hedef", type=int, help="bu sürüme kadar uygula")
+    args = ap.parse_args(argv)
+
+    if args.durum:
+        db = Database(); db.connect()
+        try:
+            _ensure_table(db)
+            mevcut = applied(db)
+        finally:
+            db.close()
+        for surum, ad, _ in discover(migrations_dir(db)):
+            durum = "uygulandı" if surum in mevcut else "bekliyor"
+            print(f"{surum:04d}_{ad:<32} {durum}")
+        return 0
+
+    done = migrate(target=args.hedef)
+    if not done:
+        print("Şema güncel; uygulanacak göç yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,13 +2,25 @@
 # ────────────────────────────────────────────────────────────────────────────────
 """
 Diyabet Takip Sistemi – Diyet & Egzersiz Öneri Motoru
+
+Kurallar modül yüklenirken bir indekse derlenir: normalize belirti kümesi
+(frozenset) → o kümeye ait kan şekeri aralıkları. Sorgu tek sözlük araması +
+sıralı sınırlar üzerinde ikili aramadır; kural sayısından bağımsızdır.
+Aynı değeri kapsayan birden çok kural varsa listedeki ilk kural kazanır
+(doğrusal taramayla aynı sonuç).
+
+    get_recommendations(190, ["Kilo Kaybı", "Yaraların Yavaş İyileşmesi"])
+    get_recommendations_batch(seviyeler, belirti_kumeleri)   # kohort/geçmiş değerlendirme
 """
 from __future__ import annotations
 
 import re, unicodedata
-from typing import Optional, Tuple, List, Set
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Tuple, List, Set
 
 # ───────────────────────── Yardımcı ─────────────────────────
+@lru_cache(maxsize=4096)
 def _normalize(txt: str) -> str:
     """
     • Unicode ayrıştır → NFKD
@@ -39,15 +51,140 @@ _RULES = [
     for lo, hi, s, diet, ex in _RAW_RULES
 ]
 
+# ───────────────────────── Derlenmiş İndeks ─────────────────────────
+Oneri = Tuple[str, str]
+ONERILER: List[Oneri] = list(dict.fromkeys((diet, ex) for *_, diet, ex in _RULES))
+_ONERI_NO = {o: i for i, o in enumerate(ONERILER)}
+
+
+class _Araliklar:
+    """
+    Bir belirti kümesinin kuralları. Tüm sınırlar sıralanır; her sınır değeri
+    ve iki sınır arasındaki açık aralık ayrı bir "parça" olur:
+        (-∞, s0) [s0] (s0, s1) [s1] … (sn, +∞)   → parça no 0 … 2n
+    Her parçanın kazananı (kapsayan ilk kural) derlemede bulunur; kapalı
+    [lo, hi] aralıkları sınırlarda da tam doğru çözülür.
+    """
+    __slots__ = ("sinirlar", "kazanan")
+
+    def __init__(self, kurallar: Sequence[Tuple[Optional[float], Optional[float], int]]):
+        self.sinirlar: List[float] = sorted({v for lo, hi, _ in kurallar for v in (lo, hi) if v is not None})
+        temsilci = [self.sinirlar[0] - 1] if self.sinirlar else [0.0]
+        for i, s in enumerate(self.sinirlar):
+            sonraki = self.sinirlar[i + 1] if i + 1 < len(self.sinirlar) else s + 2
+            temsilci += [s, (s + sonraki) / 2]
+        self.kazanan: List[int] = [
+            next((no for lo, hi, no in kurallar
+                  if (lo is None or x >= lo) and (hi is None or x <= hi)), -1)
+            for x in temsilci
+        ]
+
+    def parca(self, ks: float) -> int:
+        i = bisect_left(self.sinirlar, ks)
+        return 2 * i + 1 if i < len(self.sinirlar) and self.sinirlar[i] == ks else 2 * i
+
+    def bul(self, ks: float) -> int:
+        return self.kazanan[self.parca(ks)]
+
+
+def _derle() -> Dict[FrozenSet[str], _Araliklar]:
+    gruplar: Dict[FrozenSet[str], list] = {}
+    for lo, hi, rule_set, diet, ex in _RULES:          # kural sırası korunur → ilk kural kazanır
+        gruplar.setdefault(frozenset(rule_set), []).append((lo, hi, _ONERI_NO[(diet, ex)]))
+    return {k: _Araliklar(v) for k, v in gruplar.items()}
+
+
+_INDEKS = _derle()
+
+
+@lru_cache(maxsize=4096)
+def _anahtar(symptoms: FrozenSet[str]) -> FrozenSet[str]:
+    """Ham belirti kümesi → normalize anahtar (arayüzden gelen kümeler az çeşitlidir)"""
+    return frozenset(_normalize(sym) for sym in symptoms)
+
+
 # ───────────────────────── Ana Fonksiyon ─────────────────────────
 def get_recommendations(ks: float, symptoms: List[str]) -> Optional[Tuple[str, str]]:
-    selected = {_normalize(sym) for sym in symptoms}
+    araliklar = _INDEKS.get(_anahtar(frozenset(symptoms)))
+    if araliklar is None or ks != ks:                   # kural yok ya da NaN
+        return None
+    no = araliklar.bul(ks)
+    return ONERILER[no] if no >= 0 else None
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def get_recommendations_batch(ks_values: Sequence[float],
+                              symptom_sets: Sequence[Iterable[str]],
+                              set_index: Optional[Sequence[int]] = None) -> List[Optional[Oneri]]:
+    """
+    get_recommendations'ın toplu hâli; i. değerlendirmenin öneri (ya da None)
+    listesini döndürür.
+    • set_index yok   → symptom_sets[i], ks_values[i]'nin belirti kümesidir
+    • set_index verilirse → symptom_sets farklı kümelerin listesidir,
+      set_index[i] i. değerlendirmenin kümesini seçer (kohort verisinde küme
+      sayısı azdır; ham kümelerin tek tek hash'lenmesi de atlanır)
+    Kümeler normalize anahtara bir kez çevrilir; her anahtarın seviyeleri NumPy
+    ile tek searchsorted çağrısında parçalara ayrılır (NumPy yoksa bisect).
+    """
+    if set_index is None:
+        ham_no: Dict[FrozenSet[str], int] = {}
+        kumeler: List[FrozenSet[str]] = []
+        set_index = []
+        for s in symptom_sets:
+            ham = s if isinstance(s, frozenset) else frozenset(s)
+            no = ham_no.get(ham)
+            if no is None:
+                no = ham_no[ham] = len(kumeler)
+                kumeler.append(ham)
+            set_index.append(no)
+    else:
+        kumeler = [s if isinstance(s, frozenset) else frozenset(s) for s in symptom_sets]
+    if len(ks_values) != len(set_index):
+        raise ValueError("ks_values ile belirti kümeleri aynı uzunlukta olmalı.")
+
+    # Ham küme → derlenmiş anahtar sırası (kuralı olmayan küme → -1)
+    anahtarlar = list(_INDEKS)
+    anahtar_no = {k: i for i, k in enumerate(anahtarlar)}
+    kume_anahtari = [anahtar_no.get(_anahtar(k), -1) for k in kumeler]
+
+    np = _numpy()
+    if np is None:
+        sonuc: List[Optional[Oneri]] = []
+        for ks, k in zip(ks_values, set_index):
+            a = kume_anahtari[k]
+            no = _INDEKS[anahtarlar[a]].bul(ks) if a >= 0 and ks == ks else -1
+            sonuc.append(ONERILER[no] if no >= 0 else None)
+        return sonuc
+
+    ks_dizi = np.asarray(ks_values, dtype=float)
+    a_dizi = np.asarray(kume_anahtari, dtype=np.intp)[np.asarray(set_index, dtype=np.intp)]
+    kodlar = np.full(len(ks_dizi), -1, dtype=np.intp)
+    for a in np.unique(a_dizi):
+        if a < 0:
+            continue
+        araliklar = _INDEKS[anahtarlar[a]]
+        m = np.flatnonzero(a_dizi == a)
+        degerler = ks_dizi[m]
+        sinirlar = np.asarray(araliklar.sinirlar, dtype=float)
+        i = np.searchsorted(sinirlar, degerler, side="left")
+        esit = (i < len(sinirlar)) & (sinirlar[np.minimum(i, len(sinirlar) - 1)] == degerler)
+        kod = np.asarray(araliklar.kazanan, dtype=np.intp)[2 * i + esit]
+        kod[np.isnan(degerler)] = -1
+        kodlar[m] = kod
+
+    tablo = np.empty(len(ONERILER) + 1, dtype=object)
+    for i, oneri in enumerate(ONERILER):
+        tablo[i] = oneri
+    tablo[-1] = None                                    # kod -1 → None
+    return tablo[kodlar].tolist()
 
-    for lo, hi, rule_set, diet, ex in _RULES:
-        if lo is not None and ks < lo:  continue
-        if hi is not None and ks > hi:  continue
-        if selected == rule_set:        return diet, ex
-    return None
 
 # ───────────────────────── Hızlı Test ─────────────────────────
 if __name__ == "__main__":
@@ -0,0 +1,275 @@
+# core/patient_import.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Bir muayenehanenin hasta listesinin CSV'den toplu kaydı.
+
+Arayüzdeki "Hasta Ekle" formu (core.user_management.add_patient) her hasta için
+ayrı bağlantı, TC ön kontrolü ve iki commit kullanır; binlerce hasta için uygun
+değildir. Burada:
+
+1. Dosyanın tamamı core.validators ile doğrulanır; dosya içindeki tekrar eden
+   TC/e-posta ve veritabanında başka kişiye ait e-posta satır numarasıyla raporlanır
+2. Veritabanında zaten hasta olarak kayıtlı TC'ler yeniden eklenmez, yalnızca
+   doktora bağlanır (giriş e-postası gönderilmez)
+3. Yeni hastalar tek işlemde, sayfa başına bir çok satırlı
+   INSERT … ON CONFLICT DO NOTHING RETURNING id ile yazılır; doktor_hasta
+   bağlantıları ve giriş bilgisi e-postaları (eposta_kuyrugu) aynı işlemde
+   toplu eklenir. İşlem geri alınırsa hiçbir e-posta kuyruğa girmez
+4. E-postaları arka plan göndericisi iletir (core/email_outbox.py)
+
+Geçersiz satırlar atlanır, geçerliler yazılır (core.measurement_import ile aynı).
+
+CSV sütunları (başlık satırı zorunlu):
+    tc_no , ad , soyad , email , dogum_tarihi , cinsiyet [, sifre]
+dogum_tarihi GG.AA.YYYY (ya da YYYY-AA-GG); cinsiyet Erkek | Kadın | Diğer.
+sifre boşsa rastgele bir şifre üretilir ve e-postayla gönderilir.
+
+Kullanım:
+    python -m core.patient_import hastalar.csv --doktor-tc 12345678901
+    python -m core.patient_import hastalar.csv --doktor-tc 12345678901 --dogrula
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import secrets
+import string
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.database import Database
+from core.email_outbox import email_outbox
+from core.email_utils import login_email
+from core.measurement_import import _open_text
+from core.validators import validate_date, validate_email, validate_tc
+
+ZORUNLU_SUTUNLAR = ("tc_no", "ad", "soyad", "email", "dogum_tarihi", "cinsiyet")
+CINSIYETLER = {
+    "erkek": "Erkek", "e": "Erkek",
+    "kadın": "Kadın", "kadin": "Kadın", "k": "Kadın",
+    "diğer": "Diğer", "diger": "Diğer",
+}
+# kullanicilar sütun uzunlukları (data/migrations/0001): sınırı aşan satır tüm partiyi düşürmesin
+_UZUNLUK = {"ad": 50, "soyad": 50, "email": 100}
+_SIFRE_ALFABESI = string.ascii_letters + string.digits
+
+
+def _uret_sifre(uzunluk: int = 10) -> str:
+    return "".join(secrets.choice(_SIFRE_ALFABESI) for _ in range(uzunluk))
+
+
+def _parse_dogum(raw: str) -> date:
+    iso = validate_date(raw) or raw
+    try:
+        d = date.fromisoformat(iso)
+    except ValueError:
+        raise ValueError(f"doğum tarihi GG.AA.YYYY biçiminde olmalı: {raw!r}")
+    if d > date.today():
+        raise ValueError("doğum tarihi gelecekte")
+    return d
+
+
+def _dogrula(row: Dict[str, str]) -> Dict[str, Any]:
+    """Tek satırı doğrular; temizlenmiş alanları döndürür (hata → ValueError)."""
+    alan = {k: (row.get(k) or "").strip() for k in (*ZORUNLU_SUTUNLAR, "sifre")}
+    bos = [k for k in ZORUNLU_SUTUNLAR if not alan[k]]
+    if bos:
+        raise ValueError(f"boş alan: {', '.join(bos)}")
+    if not validate_tc(alan["tc_no"]):
+        raise ValueError("TC Kimlik No 11 haneli rakamlardan oluşmalı")
+    if not validate_email(alan["email"]):
+        raise ValueError(f"e-posta geçerli değil: {alan['email']!r}")
+    for k, sinir in _UZUNLUK.items():
+        if len(alan[k]) > sinir:
+            raise ValueError(f"{k} en fazla {sinir} karakter olabilir")
+    cinsiyet = CINSIYETLER.get(alan["cinsiyet"].casefold())
+    if cinsiyet is None:
+        raise ValueError(f"cinsiyet Erkek/Kadın/Diğer olmalı: {alan['cinsiyet']!r}")
+    return dict(alan, cinsiyet=cinsiyet, dogum_tarihi=_parse_dogum(alan["dogum_tarihi"]))
+
+
+def _doktor_id(db: Database, doktor_id: Optional[int], doktor_tc: Optional[str]) -> int:
+    if doktor_id is not None:
+        row = db.fetch_one("SELECT id FROM kullanicilar WHERE id = %s AND rol = 'doktor';", (doktor_id,))
+    else:
+        row = db.fetch_one("SELECT id FROM kullanicilar WHERE tc_no = %s AND rol = 'doktor';", (doktor_tc,))
+    if not row:
+        raise ValueError("Doktor bulunamadı (--doktor-id / --doktor-tc).")
+    return row[0]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Ana fonksiyon
+# ────────────────────────────────────────────────────────────────────────────────
+def import_patients(path: str, doktor_id: Optional[int] = None, doktor_tc: Optional[str] = None,
+                    send_email: bool = True, dry_run: bool = False, page_size: int = 500,
+                    db: Optional[Database] = None) -> Dict[str, Any]:
+    """
+    CSV'deki hastaları kaydeder ve bir özet sözlüğü döndürür:
+        okunan, gecersiz, eklenen, baglanan, eposta, sure, hatalar
+    hatalar → [(satır_no, tc_no, açıklama), ...]
+    dry_run=True → yalnızca doğrulanır, hiçbir şey yazılmaz
+    """
+    own_db = db is None
+    if own_db:
+        db = Database(); db.connect()
+
+    baslangic = time.perf_counter()
+    hatalar: List[Tuple[int, str, str]] = []
+    yeni: List[Tuple[int, Dict[str, Any]]] = []       # (satır_no, alanlar)
+    baglanacak: List[int] = []                         # zaten kayıtlı hastalar
+    okunan = eklenen = eposta = 0
+
+    try:
+        with db.transaction():
+            d_id = _doktor_id(db, doktor_id, doktor_tc)
+
+            # Tek sorguda mevcut kullanıcılar: TC → (id, rol), e-posta → TC
+            mevcut = db.fetch_all("SELECT id, tc_no, email, rol FROM kullanicilar;")
+            tc_kayit = {tc: (u_id, rol) for u_id, tc, _, rol in mevcut}
+            email_tc = {em.casefold(): tc for _, tc, em, _ in mevcut}
+
+            gorulen_tc: Dict[str, int] = {}
+            gorulen_email: Dict[str, int] = {}
+            with _open_text(path) as f:
+                reader = csv.DictReader(f)
+                eksik = [k for k in ZORUNLU_SUTUNLAR if k not in (reader.fieldnames or ())]
+                if eksik:
+                    raise ValueError(f"CSV başlığında eksik sütun: {', '.join(eksik)}")
+
+                for row in reader:
+                    okunan += 1
+                    satir = reader.line_num
+                    tc = (row.get("tc_no") or "").strip()
+                    try:
+                        alan = _dogrula(row)
+                        if tc in gorulen_tc:
+                            raise ValueError(f"TC dosyada tekrar ediyor (satır {gorulen_tc[tc]})")
+                        gorulen_tc[tc] = satir
+                        email = alan["email"].casefold()
+                        if email in gorulen_email:
+                            raise ValueError(f"e-posta dosyada tekrar ediyor (satır {gorulen_email[email]})")
+                        gorulen_email[email] = satir
+
+                        kayit = tc_kayit.get(tc)
+                        if kayit is not None:
+                            if kayit[1] != "hasta":
+                                raise ValueError("bu TC bir doktora ait")
+                            baglanacak.append(kayit[0])
+                            continue
+                        if email_tc.get(email, tc) != tc:
+                            raise ValueError("e-posta başka bir kullanıcıya kayıtlı")
+                        yeni.append((satir, alan))
+                    except ValueError as e:
+                        hatalar.append((satir, tc, str(e)))
+
+            if dry_run:
+                return _ozet(okunan, hatalar, len(yeni), len(baglanacak), 0, baslangic, dogrulama=True)
+
+            # Şifreler: boşsa üret; hash Database.hash_password ile aynı (SHA-256)
+            for _, alan in yeni:
+                alan["sifre"] = alan["sifre"] or _uret_sifre()
+
+            eklenen_idler = db.execute_values("""
+                INSERT INTO kullanicilar
+                    (tc_no, ad, soyad, sifre, dogum_tarihi, cinsiyet, email, rol)
+                VALUES %s
+                ON CONFLICT DO NOTHING
+                RETURNING id, tc_no;
+            """, [
+                (a["tc_no"], a["ad"], a["soyad"], db.hash_password(a["sifre"]),
+                 a["dogum_tarihi"], a["cinsiyet"], a["email"], "hasta")
+                for _, a in yeni
+            ], page_size=page_size, fetch=True)
+            tc_id = {tc: u_id for u_id, tc in eklenen_idler}
+            eklenen = len(tc_id)
+
+            # Doğrulama ile INSERT arasında başka istemcinin eklediği kayıtlar
+            for satir, alan in yeni:
+                if alan["tc_no"] not in tc_id:
+                    hatalar.append((satir, alan["tc_no"], "eşzamanlı kayıt: TC ya da e-posta artık kayıtlı"))
+
+            db.execute_values("""
+                INSERT INTO doktor_hasta (doktor_id, hasta_id)
+                VALUES %s
+                ON CONFLICT DO NOTHING;
+            """, [(d_id, h_id) for h_id in (*tc_id.values(), *baglanacak)], page_size=page_size)
+
+            if send_email and tc_id:
+                iletiler = [(a["email"], *login_email(a["email"], a["sifre"], a["tc_no"]))
+                            for _, a in yeni if a["tc_no"] in tc_id]
+                eposta = len(email_outbox.enqueue_many(iletiler, db))
+    finally:
+        if own_db:
+            db.close()
+
+    if eposta:
+        email_outbox.notify()
+    hatalar.sort()
+    return _ozet(okunan, hatalar, eklenen, len(baglanacak), eposta, baslangic)
+
+
+def _ozet(okunan, hatalar, eklenen, baglanan, eposta, baslangic, dogrulama=False) -> Dict[str, Any]:
+    return dict(
+        okunan=okunan,
+        gecersiz=len(hatalar),
+        eklenen=eklenen,
+        baglanan=baglanan,
+        eposta=eposta,
+        sure=time.perf_counter() - baslangic,
+        dogrulama=dogrulama,
+        hatalar=hatalar,
+    )
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Komut satırı
+# ────────────────────────────────────────────────────────────────────────────────
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m core.patient_import",
+        description="CSV/CSV.GZ hasta listesini bir doktora toplu kaydeder.",
+    )
+    ap.add_argument("dosya", help="CSV ya da gzip'li CSV dosyası")
+    doktor = ap.add_mutually_exclusive_group(required=True)
+    doktor.add_argument("--doktor-id", type=int)
+    doktor.add_argument("--doktor-tc")
+    ap.add_argument("--dogrula", action="store_true", help="yalnızca doğrula, yazma")
+    ap.add_argument("--eposta-yok", action="store_true", help="giriş bilgisi e-postası kuyruğa alınmasın")
+    ap.add_argument("--gonder", action="store_true",
+                    help="çıkmadan önce kuyruğa alınan e-postaların gönderilmesini bekle")
+    ap.add_argument("--parti", type=int, default=500, help="çok satırlı INSERT sayfa boyutu")
+    ap.add_argument("--hata-goster", type=int, default=50, help="yazdırılacak en fazla hatalı satır")
+    args = ap.parse_args(argv)
+
+    r = import_patients(args.dosya, doktor_id=args.doktor_id, doktor_tc=args.doktor_tc,
+                        send_email=not args.eposta_yok, dry_run=args.dogrula, page_size=args.parti)
+
+    print(f"Okunan satır        : {r['okunan']}")
+    if r["dogrulama"]:
+        print(f"Eklenecek hasta     : {r['eklenen']}   (doğrulama; hiçbir şey yazılmadı)")
+    else:
+        print(f"Eklenen hasta       : {r['eklenen']}")
+    print(f"Doktora bağlanan    : {r['baglanan']}   (zaten kayıtlı)")
+    print(f"Geçersiz satır      : {r['gecersiz']}")
+    print(f"Kuyruğa alınan e-posta: {r['eposta']}")
+    print(f"Süre                : {r['sure']:.2f} sn")
+    for line_no, tc, hata in r["hatalar"][:args.hata_goster]:
+        print(f"  satır {line_no} ({tc or '-'}): {hata}")
+    if r["gecersiz"] > args.hata_goster:
+        print(f"  … {r['gecersiz'] - args.hata_goster} hata daha")
+
+    if r["eposta"]:
+        if args.gonder:
+            if not email_outbox.wait_idle(600):
+                print("Zaman aşımı: e-postaların bir kısmı kuyrukta kaldı.")
+            email_outbox.stop()
+        else:
+            print("E-postalar doktor paneli açıkken ya da "
+                  "'python -m core.email_outbox --bosalt' ile gönderilir.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
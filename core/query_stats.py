@@ -0,0 +1,186 @@
+# core/query_stats.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Süreç içi sorgu istatistikleri ve yavaş sorgu günlüğü.
+
+Database.execute_query / fetch_one / fetch_all her çağrıyı burada kaydeder:
+• Parmak izi   → SQL'deki sabitler ve yer tutucular "?" olur, boşluklar
+                 sadeleşir; aynı ifadenin tüm çağrıları tek satırda toplanır
+• Süre         → çağrı sayısı, hata sayısı, satır sayısı, ortalama, p50/p95/maks
+                 (yüzdelikler ifade başına son QUERY_STATS_CONFIG['sample_size']
+                 çağrıdan hesaplanır)
+• Yavaş sorgu  → eşiği (slow_query_ms) aşan çağrı SQL ve parametre *biçimiyle*
+                 yazdırılır; parametre değerleri (TC, şifre, ölçüm) yazılmaz
+• Döküm        → dump() elle çağrılabilir; dump_on_exit açıksa çıkışta
+                 otomatik yapılır (dump_path verilmişse JSON dosyasına)
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from data.config import QUERY_STATS_CONFIG
+
+_YORUM = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_METIN = re.compile(r"'(?:[^']|'')*'")
+_SAYI = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_YER_TUTUCU = re.compile(r"%s|%\(\w+\)s|\?")
+_IN_LISTESI = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.I)
+_BOSLUK = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    """SQL'i sabitlerden arındırılmış tek satırlık biçime getirir."""
+    fp = _YORUM.sub(" ", query)
+    fp = _METIN.sub("?", fp)
+    fp = _YER_TUTUCU.sub("?", fp)
+    fp = _SAYI.sub("?", fp)
+    fp = _IN_LISTESI.sub("IN (?, ...)", fp)
+    return _BOSLUK.sub(" ", fp).strip().rstrip(";").strip()
+
+
+def params_shape(params) -> str:
+    """Parametrelerin yalnızca türleri: (int, datetime, str) / {tc: str}"""
+    def tur(v):
+        if isinstance(v, (list, tuple)):
+            return f"{type(v).__name__}[{len(v)}]"
+        return type(v).__name__
+
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {tur(v)}" for k, v in params.items()) + "}"
+    return "(" + ", ".join(tur(v) for v in params) + ")"
+
+
+def _yuzdelik(sirali: List[float], p: float) -> float:
+    """En yakın sıra yöntemi: sıralı örneklerde ceil(p/100 · n). eleman"""
+    return sirali[max(math.ceil(p / 100 * len(sirali)) - 1, 0)]
+
+
+class _Kayit:
+    __slots__ = ("calls", "errors", "rows", "total_ms", "max_ms", "samples")
+
+    def __init__(self, sample_size: int):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=sample_size)
+
+
+class QueryStats:
+    def __init__(self, enabled: bool = True, slow_query_ms: Optional[float] = 250.0,
+                 sample_size: int = 1024, dump_on_exit: bool = False,
+                 dump_path: Optional[str] = None):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.sample_size = sample_size
+        self.dump_path = dump_path
+        self._lock = threading.Lock()
+        self._kayitlar: Dict[str, _Kayit] = {}
+        if enabled and dump_on_exit:
+            atexit.register(self.dump)
+
+    # ------------------------------------------------------------------
+    # Kayıt
+    # ------------------------------------------------------------------
+    def record(self, query: str, params, elapsed_ms: float, rows: int = 0,
+               error: bool = False) -> None:
+        fp = fingerprint(query)
+        with self._lock:
+            k = self._kayitlar.get(fp)
+            if k is None:
+                k = self._kayitlar[fp] = _Kayit(self.sample_size)
+            k.calls += 1
+            k.errors += error
+            k.rows += max(rows, 0)
+            k.total_ms += elapsed_ms
+            k.max_ms = max(k.max_ms, elapsed_ms)
+            k.samples.append(elapsed_ms)
+
+        if self.slow_query_ms is not None and elapsed_ms >= self.slow_query_ms:
+            print(f"Yavaş sorgu ({elapsed_ms:.1f} ms, {max(rows, 0)} satır): {fp} "
+                  f"| parametreler: {params_shape(params)}")
+
+    @contextmanager
+    def timed(self, query: str, params=None):
+        """
+        with query_stats.timed(sql, params) as olcum:
+            ...
+            olcum["rows"] = n
+        Blok hata ile çıkarsa çağrı hatalı olarak sayılır, hata yukarı iletilir.
+        """
+        if not self.enabled:
+            yield {}
+            return
+        olcum = {"rows": 0}
+        t0 = time.perf_counter()
+        try:
+            yield olcum
+        except BaseException:
+            self.record(query, params, (time.perf_counter() - t0) * 1000,
+                        olcum["rows"], error=True)
+            raise
+        self.record(query, params, (time.perf_counter() - t0) * 1000, olcum["rows"])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._kayitlar.clear()
+
+    # ------------------------------------------------------------------
+    # Rapor
+    # ------------------------------------------------------------------
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """İfade başına özet; toplam süreye göre azalan sırada."""
+        with self._lock:
+            kayitlar = [(fp, k.calls, k.errors, k.rows, k.total_ms, k.max_ms, sorted(k.samples))
+                        for fp, k in self._kayitlar.items()]
+        sonuc = []
+        for fp, calls, errors, rows, total_ms, max_ms, s in kayitlar:
+            sonuc.append(dict(
+                query=fp, calls=calls, errors=errors, rows=rows,
+                total_ms=total_ms, avg_ms=total_ms / calls,
+                p50_ms=_yuzdelik(s, 50),
+                p95_ms=_yuzdelik(s, 95),
+                max_ms=max_ms,
+            ))
+        sonuc.sort(key=lambda r: r["total_ms"], reverse=True)
+        return sonuc
+
+    def report(self, limit: Optional[int] = None) -> str:
+        satirlar = self.snapshot()[:limit]
+        if not satirlar:
+            return "Kayıtlı sorgu yok."
+        out = [f"{'çağrı':>7}{'hata':>6}{'toplam ms':>12}{'p50':>9}{'p95':>9}{'maks':>9}{'satır':>9}  sorgu"]
+        for r in satirlar:
+            out.append(f"{r['calls']:>7}{r['errors']:>6}{r['total_ms']:>12.1f}{r['p50_ms']:>9.2f}"
+                       f"{r['p95_ms']:>9.2f}{r['max_ms']:>9.2f}{r['rows']:>9}  {r['query'][:120]}")
+        return "\n".join(out)
+
+    def dump(self, path: Optional[str] = None) -> None:
+        """Özeti yazdırır; path (ya da dump_path) verilmişse JSON olarak kaydeder."""
+        path = path or self.dump_path
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            print(f"Sorgu istatistikleri yazıldı: {path}")
+        elif self._kayitlar:
+            print("\n== Sorgu istatistikleri ==")
+            print(self.report())
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Süreç genelinde tek kayıt defteri
+# ────────────────────────────────────────────────────────────────────────────────
+query_stats = QueryStats(**QUERY_STATS_CONFIG)
@@ -20,6 +20,7 @@ from typing import Dict, List, Tuple
 
 from core.database import Database
 from core.oneriler import get_recommendations
+from core.reference_cache import reference_cache
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -60,11 +61,9 @@ def open_recommendation_window(hasta_id: int) -> None:  # noqa: C901
 
     symptom_vars: Dict[int, Tuple[str, tk.BooleanVar]] = {}
 
-    # Belirtileri DB’den çek
+    # Belirtiler süreç içi önbellekten (core/reference_cache.py)
     try:
-        db = Database(); db.connect()
-        rows: List = db.fetch_all("SELECT id, ad FROM belirtiler ORDER BY ad;")
-        db.close()
+        rows: List = reference_cache.rows("belirtiler")
     except Exception as exc:
         messagebox.showerror("Hata", f"Belirtiler alınamadı:\n{exc}"); win.destroy(); return
 
@@ -107,65 +106,62 @@ def open_recommendation_window(hasta_id: int) -> None:  # noqa: C901
                                  "Bu kombinasyon için kural tanımlı değil."); return
         diet, exercise = rec
 
-        # ── DB işlemleri ───────────────────────────────────────────────
+        # ── DB işlemleri (tek işlem, tek commit) ───────────────────────
         db = Database(); db.connect()
+        try:
+            with db.transaction():
+                ad, soyad, tc = db.fetch_one(
+                    "SELECT ad, soyad, tc_no FROM kullanicilar WHERE id=%s;", (hasta_id,))
+                tam_ad = f"{ad} {soyad}"
+
+                # 0) Kan şekeri → oneri_kan_sekeri
+                db.execute_query(
+                    """
+                    INSERT INTO oneri_kan_sekeri
+                    (hasta_id, hasta_ad, tarih, saat, seviye)
+                    VALUES (%s, %s, %s, %s, %s);
+                    """,
+                    (hasta_id, tam_ad, tarih_sql, saat_sql, ks_val)
+                )
+
+                # 1) Belirtiler → hasta_belirtileri
+                for bid in sel_ids:
+                    db.execute_query(
+                        """
+                        INSERT INTO hasta_belirtileri (hasta_id, belirti_id, tarih)
+                        VALUES (%s, %s, %s)
+                        ON CONFLICT DO NOTHING;
+                        """,
+                        (hasta_id, bid, tarih_sql)
+                    )
+
+                # 2) Diyet / egzersiz türleri (önbellekte yoksa eklenir)
+                aciklama = f"Otomatik öneri {datetime.now():%d.%m.%Y}"
+                diet_id = reference_cache.get_or_create_type("diyet_turleri", diet, aciklama, db)
+                ex_id   = reference_cache.get_or_create_type("egzersiz_turleri", exercise, aciklama, db)
+
+                # 3) Takip tabloları
+                db.execute_query(
+                    """
+                    INSERT INTO diyet_takibi
+                    (hasta_id,tarih,saat,durum,diyet_turu_id,hasta_ad,hasta_tc)
+                    VALUES (%s,%s,%s,FALSE,%s,%s,%s);
+                    """,
+                    (hasta_id, tarih_sql, saat_sql, diet_id, tam_ad, tc)
+                )
+                db.execute_query(
+                    """
+                    INSERT INTO egzersiz_takibi
+                    (hasta_id,tarih,saat,durum,egzersiz_turu_id,hasta_ad,hasta_tc)
+                    VALUES (%s,%s,%s,FALSE,%s,%s,%s);
+                    """,
+                    (hasta_id, tarih_sql, saat_sql, ex_id, tam_ad, tc)
+                )
+        except Exception as exc:
+            messagebox.showerror("Hata", f"Öneri kaydedilemedi:\n{exc}"); return
+        finally:
+            db.close()
 
-        ad, soyad, tc = db.fetch_one(
-            "SELECT ad, soyad, tc_no FROM kullanicilar WHERE id=%s;", (hasta_id,))
-        tam_ad = f"{ad} {soyad}"
-
-        # 0) Kan şekeri → oneri_kan_sekeri
-        db.execute_query(
-            """
-            INSERT INTO oneri_kan_sekeri
-            (hasta_id, hasta_ad, tarih, saat, seviye)
-            VALUES (%s, %s, %s, %s, %s);
-            """,
-            (hasta_id, tam_ad, tarih_sql, saat_sql, ks_val)
-        )
-
-        # 1) Belirtiler → hasta_belirtileri
-        for bid in sel_ids:
-            db.execute_query(
-                """
-                INSERT INTO hasta_belirtileri (hasta_id, belirti_id, tarih)
-                VALUES (%s, %s, %s)
-                ON CONFLICT DO NOTHING;
-                """,
-                (hasta_id, bid, tarih_sql)
-            )
-
-        # 2) Diyet / egzersiz türlerini ekle
-        db.execute_query(
-            "INSERT INTO diyet_turleri(ad,aciklama) VALUES(%s,%s) ON CONFLICT DO NOTHING;",
-            (diet, f"Otomatik öneri {datetime.now():%d.%m.%Y}")
-        )
-        db.execute_query(
-            "INSERT INTO egzersiz_turleri(ad,aciklama) VALUES(%s,%s) ON CONFLICT DO NOTHING;",
-            (exercise, f"Otomatik öneri {datetime.now():%d.%m.%Y}")
-        )
-        diet_id = db.fetch_one("SELECT id FROM diyet_turleri WHERE ad=%s;", (diet,))[0]
-        ex_id   = db.fetch_one("SELECT id FROM egzersiz_turleri WHERE ad=%s;", (exercise,))[0]
-
-        # 3) Takip tabloları
-        db.execute_query(
-            """
-            INSERT INTO diyet_takibi
-            (hasta_id,tarih,saat,durum,diyet_turu_id,hasta_ad,hasta_tc)
-            VALUES (%s,%s,%s,FALSE,%s,%s,%s);
-            """,
-            (hasta_id, tarih_sql, saat_sql, diet_id, tam_ad, tc)
-        )
-        db.execute_query(
-            """
-            INSERT INTO egzersiz_takibi
-            (hasta_id,tarih,saat,durum,egzersiz_turu_id,hasta_ad,hasta_tc)
-            VALUES (%s,%s,%s,FALSE,%s,%s,%s);
-            """,
-            (hasta_id, tarih_sql, saat_sql, ex_id, tam_ad, tc)
-        )
-
-        db.close()
         messagebox.showinfo("Öneriler", f"✅ Diyet: {diet}\n✅ Egzersiz: {exercise}")
         win.destroy()
 
@@ -0,0 +1,171 @@
+# core/reference_cache.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Referans tabloları için süreç içi, okuma-geçişli (read-through) önbellek.
+
+belirtiler, olcum_zamanlari, diyet_turleri ve egzersiz_turleri nadiren değişir
+ama her pencere açılışında / kayıtta yeniden sorgulanıyordu. Tablolar ilk
+kullanımda bir kez yüklenir; id'ye ve normalize edilmiş ada göre indekslenir.
+
+• Bayatlık: referans_surumu tablosundaki sayaçlar (göç 0009 / sqlite 0003)
+  satır değişikliklerinde tetikleyicilerle artar. Sürüm en fazla
+  REFERENCE_CACHE_CONFIG['check_interval'] saniyede bir okunur; değişen
+  tablo sonraki erişimde yeniden yüklenir
+• Ada göre aramada bulunamayan kayıt için veritabanına düşülür (ör. başka
+  istemcinin az önce eklediği tür) — önbellek asla yanlış id döndürmez
+• invalidate() ile elle boşaltılabilir
+
+    belirtiler = reference_cache.rows("belirtiler", db)       # [(id, ad), ...]
+    slot_id    = reference_cache.slot_for(db, olcum_zamani.time())
+    slotlar    = reference_cache.classifier(db).classify_many(zamanlar)   # toplu
+"""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import time as dtime
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.slot_classifier import SlotClassifier
+from data.config import REFERENCE_CACHE_CONFIG
+
+# Tablo → yükleme sorgusu (ilk iki kolon id ve ad/anahtar)
+_SORGULAR = {
+    "belirtiler":       "SELECT id, ad FROM belirtiler ORDER BY ad;",
+    "olcum_zamanlari":  "SELECT id, saat_baslangic, saat_bitis FROM olcum_zamanlari ORDER BY id;",
+    "diyet_turleri":    "SELECT id, ad FROM diyet_turleri ORDER BY ad;",
+    "egzersiz_turleri": "SELECT id, ad FROM egzersiz_turleri ORDER BY ad;",
+}
+
+_TR_KUCUK = str.maketrans({"İ": "i", "I": "ı"})
+
+
+def normalize_name(ad: str) -> str:
+    """Türkçe büyük/küçük harf ve boşluk farklarını yok sayan arama anahtarı."""
+    return " ".join(ad.translate(_TR_KUCUK).lower().split())
+
+
+class ReferenceTable:
+    def __init__(self, rows: List[Tuple]):
+        self.rows = rows
+        self.by_id: Dict[int, Tuple] = {r[0]: r for r in rows}
+        self.by_name: Dict[str, Tuple] = {}
+        for r in rows:
+            if isinstance(r[1], str):
+                self.by_name.setdefault(normalize_name(r[1]), r)
+
+    def id_for(self, ad: str) -> Optional[int]:
+        row = self.by_name.get(normalize_name(ad))
+        return row[0] if row else None
+
+
+class ReferenceCache:
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._tablolar: Dict[str, ReferenceTable] = {}
+        self._yuklenen_surum: Dict[str, Any] = {}
+        self._surumler: Dict[str, Any] = {}
+        self._son_kontrol = float("-inf")
+        self._siniflandirici: Optional[Tuple[ReferenceTable, SlotClassifier]] = None
+
+    # ------------------------------------------------------------------
+    # Sürüm kontrolü / yükleme
+    # ------------------------------------------------------------------
+    def _check_versions(self, db) -> None:
+        simdi = time.monotonic()
+        if simdi - self._son_kontrol < self.check_interval:
+            return
+        rows = db.fetch_all("SELECT tablo, surum FROM referans_surumu;", prepared=True)
+        with self._lock:
+            self._surumler = dict(rows)
+            self._son_kontrol = simdi
+
+    def table(self, name: str, db=None) -> ReferenceTable:
+        """Tablonun güncel önbellek kopyası; gerekirse (yeniden) yüklenir."""
+        if name not in _SORGULAR:
+            raise KeyError(f"Önbelleğe alınmayan tablo: {name}")
+        if db is None:
+            from core.database import Database
+            db = Database(); db.connect()
+            try:
+                return self.table(name, db)
+            finally:
+                db.close()
+
+        self._check_versions(db)
+        with self._lock:
+            tablo = self._tablolar.get(name)
+            surum = self._surumler.get(name)
+            if tablo is not None and self._yuklenen_surum.get(name) == surum:
+                return tablo
+
+        tablo = ReferenceTable(db.fetch_all(_SORGULAR[name]))
+        with self._lock:
+            self._tablolar[name] = tablo
+            self._yuklenen_surum[name] = surum
+        return tablo
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Bir tabloyu (name=None → hepsini) boşaltır; sonraki erişim yeniden yükler."""
+        with self._lock:
+            if name is None:
+                self._tablolar.clear()
+            else:
+                self._tablolar.pop(name, None)
+            self._son_kontrol = float("-inf")
+
+    # ------------------------------------------------------------------
+    # Kısayollar
+    # ------------------------------------------------------------------
+    def rows(self, name: str, db=None) -> List[Tuple]:
+        return self.table(name, db).rows
+
+    def id_for(self, name: str, ad: str, db) -> Optional[int]:
+        """Ada göre id; önbellekte yoksa veritabanına bakılır (yeni eklenmiş olabilir)."""
+        id_ = self.table(name, db).id_for(ad)
+        if id_ is not None:
+            return id_
+        row = db.fetch_one(f"SELECT id FROM {name} WHERE ad = %s;", (ad,))
+        return row[0] if row else None
+
+    def get_or_create_type(self, name: str, ad: str, aciklama: str, db) -> int:
+        """
+        diyet_turleri / egzersiz_turleri için ada göre id; yoksa ekler.
+        Önbellek burada güncellenmez: çağıranın işlemi geri alınırsa önbellekte
+        var olmayan bir id kalmasın. Eklenen satır sürümü artırdığı için sonraki
+        kontrolde tablo zaten yeniden yüklenir.
+        """
+        id_ = self.table(name, db).id_for(ad)
+        if id_ is not None:
+            return id_
+        db.execute_query(
+            f"INSERT INTO {name} (ad, aciklama) VALUES (%s, %s) ON CONFLICT DO NOTHING;",
+            (ad, aciklama)
+        )
+        return db.fetch_one(f"SELECT id FROM {name} WHERE ad = %s;", (ad,))[0]
+
+    def slots(self, db=None) -> List[Tuple[int, dtime, dtime]]:
+        return self.rows("olcum_zamanlari", db)
+
+    def classifier(self, db=None) -> SlotClassifier:
+        """olcum_zamanlari'nın derlenmiş sınıflandırıcısı; tablo yeniden yüklenince yenilenir."""
+        tablo = self.table("olcum_zamanlari", db)
+        with self._lock:
+            kayit = self._siniflandirici
+        if kayit is not None and kayit[0] is tablo:
+            return kayit[1]
+        siniflandirici = SlotClassifier(tablo.rows)
+        with self._lock:
+            self._siniflandirici = (tablo, siniflandirici)
+        return siniflandirici
+
+    def slot_for(self, db, t: dtime) -> Optional[int]:
+        """Saatin düştüğü ilk ölçüm aralığı (sınırlar dahil); yoksa None."""
+        return self.classifier(db).classify(t)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Süreç genelinde tek önbellek
+# ────────────────────────────────────────────────────────────────────────────────
+reference_cache = ReferenceCache(**REFERENCE_CACHE_CONFIG)
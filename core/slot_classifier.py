@@ -0,0 +1,225 @@
+# core/slot_classifier.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Ölçüm zamanını olcum_zamanlari slotuna sınıflandıran derlenmiş tablo.
+
+Kural veritabanındaki ile aynıdır: saat_baslangic <= saat <= saat_bitis olan
+en küçük id'li slot (sınırlar dahil, saniye altı hassasiyetle); hiçbiri
+tutmuyorsa None.
+
+• Tekil sınıflandırma O(1): günün 1440 dakikası için önceden hesaplanmış
+  dizi. Bir slot sınırının dakikanın içine düştüğü birkaç "karışık" dakikada
+  (ör. 08:00:00'da biten slot → 08:00 dakikası) aralıklar tam olarak denetlenir
+• Toplu kip: NumPy datetime64 dizisi tek seferde sınıflandırılır
+  (classify_array); NumPy kurulu değilse aynı sonuç saf Python ile üretilir
+• yeniden_siniflandir: slot aralıkları değiştiğinde geçmiş ölçümlerin
+  olcum_zamani_id'lerini yeniden hesaplar
+
+    python -m core.slot_classifier --yeniden-siniflandir [--hasta-id 12]
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+NO_SLOT = -1            # classify_array çıktısında "slot yok"
+_KARISIK = -2           # dakika tablosunda "aralıkları tek tek denetle"
+_DAKIKA_US = 60_000_000
+_GUN_DAKIKA = 1440
+
+
+def _us(t: time) -> int:
+    """Gün başından itibaren mikro saniye."""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class SlotClassifier:
+    def __init__(self, slots: Iterable[Tuple[int, time, time]]):
+        # [başlangıç, bitiş] kapalı aralığı → [başlangıç, bitiş + 1 µs) yarı açık aralık
+        self.slots: List[Tuple[int, int, int]] = sorted(
+            (z_id, _us(bas), _us(bit) + 1) for z_id, bas, bit in slots
+        )
+        sinirlar = {s for _, bas, bit in self.slots for s in (bas, bit)}
+
+        self._dakika: List[int] = []
+        for d in range(_GUN_DAKIKA):
+            bas, son = d * _DAKIKA_US, (d + 1) * _DAKIKA_US
+            if any(bas < s < son for s in sinirlar):
+                self._dakika.append(_KARISIK)
+            else:
+                self._dakika.append(self._exact(bas))
+        self._dakika_np = None
+
+    def _exact(self, us: int) -> int:
+        for z_id, bas, bit in self.slots:
+            if bas <= us < bit:
+                return z_id
+        return NO_SLOT
+
+    # ------------------------------------------------------------------
+    # Tekil
+    # ------------------------------------------------------------------
+    def classify(self, ts) -> Optional[int]:
+        """datetime ya da time → slot id (yoksa None)."""
+        t = ts.time() if isinstance(ts, datetime) else ts
+        z_id = self._dakika[t.hour * 60 + t.minute]
+        if z_id == _KARISIK:
+            z_id = self._exact(_us(t))
+        return None if z_id == NO_SLOT else z_id
+
+    # ------------------------------------------------------------------
+    # Toplu
+    # ------------------------------------------------------------------
+    def classify_array(self, timestamps):
+        """
+        NumPy datetime64 dizisi (yerel saat, saat dilimsiz) → int64 slot id dizisi.
+        Slotu olmayan elemanlar NO_SLOT (-1) olur.
+        """
+        np = _numpy()
+        if np is None:
+            raise RuntimeError("classify_array için NumPy gerekli.")
+        if self._dakika_np is None:
+            self._dakika_np = np.array(self._dakika, dtype=np.int64)
+
+        ts = np.asarray(timestamps).astype("datetime64[us]")
+        us = (ts - ts.astype("datetime64[D]")).astype(np.int64)
+        sonuc = self._dakika_np[us // _DAKIKA_US]
+
+        karisik = sonuc == _KARISIK
+        if karisik.any():
+            alt = us[karisik]
+            alt_sonuc = np.full(alt.shape, NO_SLOT, dtype=np.int64)
+            for z_id, bas, bit in reversed(self.slots):      # en küçük id en son yazılır
+                alt_sonuc[(alt >= bas) & (alt < bit)] = z_id
+            sonuc[karisik] = alt_sonuc
+        return sonuc
+
+    def classify_many(self, timestamps: Sequence) -> List[Optional[int]]:
+        """
+        datetime listesi → slot id listesi (yoksa None).
+        NumPy kuruluysa ve zaman damgaları saat dilimsizse dizi kipine geçer.
+        """
+        np = _numpy()
+        if (np is not None and len(timestamps) >= 256
+                and isinstance(timestamps[0], datetime) and timestamps[0].tzinfo is None):
+            sonuc = self.classify_array(np.array(timestamps, dtype="datetime64[us]"))
+            return [None if z == NO_SLOT else z for z in sonuc.tolist()]
+        return [self.classify(ts) for ts in timestamps]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Geçmişin yeniden sınıflandırılması
+# ────────────────────────────────────────────────────────────────────────────────
+def _yerel(ts: datetime) -> datetime:
+    """TIMESTAMPTZ değerleri oturum diliminde gelir; slotlar yerel saate göredir."""
+    return ts.replace(tzinfo=None)
+
+
+def _slotlari_yaz(db, rows: List[Tuple[Optional[int], int]]) -> None:
+    """[(olcum_zamani_id, ölçüm id), ...] → toplu UPDATE"""
+    if not rows:
+        return
+    if db.is_sqlite:
+        db.execute_values("UPDATE kan_sekeri_olcumleri SET olcum_zamani_id = %s WHERE id = %s;",
+                          rows, template="%s")          # executemany; sorgu olduğu gibi kalır
+    else:
+        db.execute_values("""
+            UPDATE kan_sekeri_olcumleri AS k SET olcum_zamani_id = v.z
+            FROM (VALUES %s) AS v(z, id)
+            WHERE k.id = v.id;
+        """, rows, template="(%s::INT, %s)", page_size=1000)
+
+
+def yeniden_siniflandir(db, hasta_id: Optional[int] = None,
+                        parti: int = 50_000) -> Dict[str, int]:
+    """
+    Ölçümlerin olcum_zamani_id'lerini güncel slot aralıklarına göre yeniden
+    hesaplar ve yalnızca değişenleri yazar. Aynı gün aynı slota düşen birden
+    fazla ölçüm olursa (gun_slot_uidx) en erken ölçüm slotu alır, diğerleri
+    slot dışı (NULL) sayılır. Etkilenen günlerin ortalama/doz ve eksik ölçüm
+    uyarıları yenilenir. Çağıranın işleminde değil, kendi işleminde çalışır.
+    Dönüş: {'okunan', 'degisen', 'gun_sayisi'}
+    """
+    from core.reference_cache import reference_cache
+
+    kosul, params = ("WHERE hasta_id = %s", (hasta_id,)) if hasta_id is not None else ("", ())
+    okunan = 0
+    degisen: List[Tuple[Optional[int], int]] = []          # (yeni slot, ölçüm id)
+    gunler: Set[Tuple[int, date]] = set()
+
+    reference_cache.invalidate("olcum_zamanlari")      # az önce değişen aralıklar okunsun
+    with db.transaction():
+        if not db.is_sqlite:       # işlem boyunca slot aralıkları değişmesin
+            db.execute_query("LOCK TABLE olcum_zamanlari IN SHARE MODE;")
+        siniflandirici = reference_cache.classifier(db)
+
+        anahtar, dolu = None, set()       # (hasta, gün) ve o gün dolan slotlar
+        satirlar = db.fetch_iter(f"""
+            SELECT id, hasta_id, olcum_zamani, olcum_zamani_id
+            FROM kan_sekeri_olcumleri
+            {kosul}
+            ORDER BY hasta_id, olcum_zamani, id;
+        """, params)
+        while True:
+            blok = [r for _, r in zip(range(parti), satirlar)]
+            if not blok:
+                break
+            okunan += len(blok)
+            yeni = siniflandirici.classify_many([_yerel(r[2]) for r in blok])
+            for (o_id, h_id, ts, eski), z_id in zip(blok, yeni):
+                gun = _yerel(ts).date()
+                if (h_id, gun) != anahtar:
+                    anahtar, dolu = (h_id, gun), set()
+                if z_id is not None:
+                    if z_id in dolu:
+                        z_id = None
+                    else:
+                        dolu.add(z_id)
+                if z_id != eski:
+                    degisen.append((z_id, o_id))
+                    gunler.add((h_id, gun))
+
+        if degisen:
+            # Önce hepsi boşaltılır, sonra yeni slotlar yazılır: ara adımda benzersiz
+            # indeks (hasta, gün, slot) çakışmaz (NULL'lar birbirine eşit sayılmaz)
+            _slotlari_yaz(db, [(None, o_id) for _, o_id in degisen])
+            _slotlari_yaz(db, [(z_id, o_id) for z_id, o_id in degisen if z_id is not None])
+            db.refresh_insulin_days(sorted(gunler))
+
+    return dict(okunan=okunan, degisen=len(degisen), gun_sayisi=len(gunler))
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Komut satırı
+# ────────────────────────────────────────────────────────────────────────────────
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m core.slot_classifier",
+        description="Slot aralıkları değiştikten sonra geçmiş ölçümleri yeniden sınıflandırır.",
+    )
+    ap.add_argument("--yeniden-siniflandir", action="store_true", required=True)
+    ap.add_argument("--hasta-id", type=int, help="yalnızca bu hasta (varsayılan: tümü)")
+    args = ap.parse_args(argv)
+
+    from core.database import Database
+    db = Database(); db.connect()
+    try:
+        r = yeniden_siniflandir(db, hasta_id=args.hasta_id)
+    finally:
+        db.close()
+    print(f"{r['okunan']} ölçüm okundu, {r['degisen']} ölçümün slotu değişti, "
+          f"{r['gun_sayisi']} gün yeniden hesaplandı.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,184 @@
+# core/thumbnail_cache.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Profil resimleri için disk üzerinde küçük görsel (thumbnail) önbelleği.
+
+Telefon fotoğrafını her panel açılışında tam çözünürlükte açıp küçültmek
+yüzlerce ms sürer. Burada:
+
+• Her (kaynak yol, değişiklik zamanı, dosya boyu, hedef boyut) için bir PNG
+  üretilir; fotoğraf değişince anahtar da değişir, eski görsel LRU ile silinir
+• Yükleme anında (upload_profile_picture) tüm boyutlar arka planda üretilir
+• Önbellekte olan görsel Tk'ya doğrudan PNG olarak verilir (PIL gerekmez)
+• Olmayan görsel bir iş parçacığında çözülür; etiket o sırada yer tutucusunu
+  gösterir, sonuç Tk iş parçacığına core.async_db.deliver ile gelir
+• Klasördeki dosya sayısı max_files'ı aşınca en eski kullanılanlar silinir
+  (isabetlerde dosyanın mtime'ı güncellenir)
+
+    thumbnail_cache.load_into(img_label, img_path, 80)
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.async_db import deliver
+from data.config import THUMBNAIL_CONFIG
+
+
+class ThumbnailCache:
+    def __init__(self, dir: str = "images/.thumbs", sizes: Iterable[int] = (80, 120, 140),
+                 max_files: int = 300, workers: int = 2):
+        self.dir = dir
+        self.sizes = tuple(sizes)
+        self.max_files = max_files
+        self._workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._kilit = threading.Lock()
+        self._suren: Dict[str, Future] = {}       # hedef PNG → üreten iş (aynı görsel iki kez çözülmez)
+
+    # ------------------------------------------------------------------
+    # Anahtar / isabet
+    # ------------------------------------------------------------------
+    def thumb_path(self, src: str, size: int) -> Optional[str]:
+        """Kaynak için önbellek dosyasının yolu (kaynak yoksa None)."""
+        try:
+            st = os.stat(src)
+        except OSError:
+            return None
+        anahtar = f"{os.path.abspath(src)}|{st.st_mtime_ns}|{st.st_size}|{size}"
+        return os.path.join(self.dir, hashlib.sha1(anahtar.encode()).hexdigest() + ".png")
+
+    def cached(self, src: str, size: int) -> Optional[str]:
+        """Önbellekteki görselin yolu; yoksa None. İsabet LRU sırasını tazeler."""
+        hedef = self.thumb_path(src, size)
+        if hedef is None or not os.path.exists(hedef):
+            return None
+        try:
+            os.utime(hedef)
+        except OSError:
+            pass
+        return hedef
+
+    # ------------------------------------------------------------------
+    # Üretim (iş parçacığında)
+    # ------------------------------------------------------------------
+    def build(self, src: str, size: int) -> Optional[str]:
+        """Kaynağı çözüp size×size PNG olarak kaydeder; yolu döndürür."""
+        hedef = self.thumb_path(src, size)
+        if hedef is None:
+            return None
+        if os.path.exists(hedef):
+            return hedef
+
+        from PIL import Image
+
+        with Image.open(src) as img:
+            img.draft("RGB", (size, size))        # JPEG: küçültülmüş DCT ile çöz (çok daha hızlı)
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+            kucuk = img.resize((size, size))
+
+        os.makedirs(self.dir, exist_ok=True)
+        gecici = f"{hedef}.{threading.get_ident()}.tmp"
+        kucuk.save(gecici, format="PNG")
+        os.replace(gecici, hedef)                 # yarım dosya hiç görünmez
+        self.evict()
+        return hedef
+
+    def _havuz(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._kilit:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self._workers,
+                                                    thread_name_prefix="thumb")
+        return self._pool
+
+    def submit(self, src: str, size: int) -> Future:
+        """build'i arka planda çalıştırır; aynı görsel zaten üretiliyorsa o işi döndürür."""
+        hedef = self.thumb_path(src, size) or f"{src}|{size}"
+        havuz = self._havuz()
+        with self._kilit:
+            is_ = self._suren.get(hedef)
+            if is_ is not None:
+                return is_
+            is_ = self._suren[hedef] = havuz.submit(self.build, src, size)
+
+        def bitti(_f) -> None:
+            with self._kilit:
+                self._suren.pop(hedef, None)
+
+        is_.add_done_callback(bitti)
+        return is_
+
+    def generate(self, src: str, sizes: Optional[Iterable[int]] = None) -> List[Future]:
+        """Yükleme anında tüm boyutları arka planda üretir."""
+        return [self.submit(src, s) for s in (sizes or self.sizes)]
+
+    def evict(self) -> int:
+        """max_files aşıldıysa en eski kullanılan görselleri siler; silinen sayısı."""
+        try:
+            dosyalar: List[Tuple[float, str]] = [
+                (e.stat().st_mtime, e.path) for e in os.scandir(self.dir)
+                if e.is_file() and e.name.endswith(".png")
+            ]
+        except OSError:
+            return 0
+        fazla = len(dosyalar) - self.max_files
+        if fazla <= 0:
+            return 0
+        silinen = 0
+        for _, yol in sorted(dosyalar)[:fazla]:
+            try:
+                os.remove(yol)
+                silinen += 1
+            except OSError:
+                pass                              # başka iş parçacığı silmiş olabilir
+        return silinen
+
+    # ------------------------------------------------------------------
+    # Tk tarafı
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _goster(label, png: str) -> None:
+        import tkinter as tk
+        photo = tk.PhotoImage(file=png, master=label)
+        label.config(image=photo, text="")
+        label.image = photo                      # referans tutulmazsa görsel kaybolur
+
+    def load_into(self, label, src: Optional[str], size: int,
+                  on_missing: Optional[Callable[[], None]] = None) -> None:
+        """
+        Etikete size×size profil resmini koyar. Önbellekteyse hemen; değilse
+        etiket mevcut yer tutucusuyla kalır, görsel arka planda üretilince
+        yerleşir. Kaynak yoksa ya da çözülemezse on_missing çağrılır.
+        """
+        if not src or not os.path.exists(src):
+            if on_missing:
+                on_missing()
+            return
+        isabet = self.cached(src, size)
+        if isabet is not None:
+            self._goster(label, isabet)
+            return
+
+        def hazir(png: Optional[str]) -> None:
+            if png is not None:
+                self._goster(label, png)
+            elif on_missing:
+                on_missing()
+
+        def hatali(e: BaseException) -> None:
+            print(f"Profil resmi okunamadı ({src}): {e}")
+            if on_missing:
+                on_missing()
+
+        deliver(label, self.submit(src, size), hazir, hatali)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Süreç genelinde tek önbellek
+# ────────────────────────────────────────────────────────────────────────────────
+thumbnail_cache = ThumbnailCache(**THUMBNAIL_CONFIG)
@@ -12,22 +12,25 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from core.database import Database
+from core.async_db import show_loading, stream_async
+from core.reference_cache import reference_cache
 
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Yardımcı – doktora bağlı tüm hastaların geçmiş verileri
 # ────────────────────────────────────────────────────────────────────────────────
-def _fetch_patients_for_doctor(db: Database, doctor_id: int) -> List[Dict[str, Any]]:
+def _iter_patients_for_doctor(db: Database, doctor_id: int) -> Iterator[Dict[str, Any]]:
     """
-    Doktora bağlı hastaların TÜM ÖNERİ-AL ölçümlerini getirir:
+    Doktora bağlı hastaların TÜM ÖNERİ-AL ölçümlerini satır satır üretir
+    (Database.fetch_iter; sonuç tek seferde belleğe alınmaz):
         • oneri_kan_sekeri        → tarih, saat, seviye
         • hasta_belirtileri       → seçili belirtiler
         • diyet_takibi / egzersiz_takibi → aynı güne ait son öneriler
     """
-    rows = db.fetch_all(
+    rows = db.fetch_iter(
         """
         SELECT
             h.tc_no,
@@ -77,26 +80,22 @@ def _fetch_patients_for_doctor(db: Database, doctor_id: int) -> List[Dict[str, A
         (doctor_id,),
     )
 
-    patients: List[Dict[str, Any]] = []
     for (
         tc, ad_soyad, dob, cinsiyet, email,
         tarih, saat, seviye, belirtiler, diyet, egzersiz
     ) in rows:
-        patients.append(
-            dict(
-                tc=tc,
-                ad_soyad=ad_soyad,
-                dob=dob,
-                cinsiyet=cinsiyet,
-                email=email,
-                tarih=f"{tarih} {saat}",
-                seviye=seviye,
-                belirtiler=belirtiler,
-                diyet=diyet,
-                egzersiz=egzersiz,
-            )
+        yield dict(
+            tc=tc,
+            ad_soyad=ad_soyad,
+            dob=dob,
+            cinsiyet=cinsiyet,
+            email=email,
+            tarih=f"{tarih} {saat}",
+            seviye=seviye,
+            belirtiler=belirtiler,
+            diyet=diyet,
+            egzersiz=egzersiz,
         )
-    return patients
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -127,10 +126,7 @@ def open_tum_hasta_bilgileri_window(doctor_id: int) -> None:
     cb_symptom = ttk.Combobox(filt_frame, width=22, state="readonly")
     cb_symptom.grid(row=0, column=5, padx=4)
 
-    db = Database(); db.connect()
-    symptom_rows = db.fetch_all("SELECT ad FROM belirtiler ORDER BY ad;")
-    db.close()
-    cb_symptom["values"] = ["Hepsi"] + [r[0] for r in symptom_rows]
+    cb_symptom["values"] = ["Hepsi"] + [ad for _, ad in reference_cache.rows("belirtiler")]
     cb_symptom.current(0)
 
     # ---------------- Tablo ----------------
@@ -151,37 +147,68 @@ def open_tum_hasta_bilgileri_window(doctor_id: int) -> None:
 
     # --------- VERİ YÜKLEME / FİLTRELEME ---------
     patients_cache: List[Dict[str, Any]] = []
+    active_filter: Dict[str, Any] = dict(min_val=None, max_val=None, symptom="Hepsi")
+    cancel_load = None
+
+    def matches(p: Dict[str, Any]) -> bool:
+        sev = p["seviye"]
+        min_val, max_val = active_filter["min_val"], active_filter["max_val"]
+        symptom = active_filter["symptom"]
+        # Kan şekeri filtresi
+        if min_val is not None and (sev is None or sev < min_val):
+            return False
+        if max_val is not None and (sev is None or sev > max_val):
+            return False
+        # Belirti filtresi
+        if symptom != "Hepsi" and symptom.lower() not in p["belirtiler"].lower():
+            return False
+        return True
+
+    def insert_rows(patients: List[Dict[str, Any]]) -> None:
+        for p in patients:
+            if not matches(p):
+                continue
+            tree.insert(
+                "", "end",
+                values=(
+                    p["tc"], p["ad_soyad"], p["dob"], p["cinsiyet"], p["email"],
+                    p["tarih"], p["seviye"], p["belirtiler"], p["diyet"], p["egzersiz"],
+                )
+            )
+
+    def on_chunk(patients: List[Dict[str, Any]]) -> None:
+        patients_cache.extend(patients)
+        insert_rows(patients)
 
     def load_all_patients() -> None:
-        nonlocal patients_cache
-        db = Database(); db.connect()
-        patients_cache = _fetch_patients_for_doctor(db, doctor_id)
-        db.close()
+        """
+        Kayıtları arka planda akıtarak yükler (core/async_db); sorgu çalışırken
+        pencere donmaz, gelen her parça filtreden geçirilip tabloya eklenir.
+        """
+        nonlocal cancel_load
+        if cancel_load:
+            cancel_load()           # süren yüklemeyi bırak
+        patients_cache.clear()
+        tree.delete(*tree.get_children())
+        hide_loading = show_loading(tree)
+
+        def first_chunk(patients: List[Dict[str, Any]]) -> None:
+            hide_loading()
+            on_chunk(patients)
+
+        cancel_load = stream_async(
+            tree, lambda db: _iter_patients_for_doctor(db, doctor_id),
+            first_chunk, on_done=hide_loading
+        )
 
     def populate_table(
         min_val: Optional[float] = None,
         max_val: Optional[float] = None,
         symptom: str = "Hepsi",
     ) -> None:
+        active_filter.update(min_val=min_val, max_val=max_val, symptom=symptom)
         tree.delete(*tree.get_children())
-        for p in patients_cache:
-            sev = p["seviye"]
-            # Kan şekeri filtresi
-            if min_val is not None and (sev is None or sev < min_val):
-                continue
-            if max_val is not None and (sev is None or sev > max_val):
-                continue
-            # Belirti filtresi
-            if symptom != "Hepsi" and symptom.lower() not in p["belirtiler"].lower():
-                continue
-
-            tree.insert(
-                "", "end",
-                values=(
-                    p["tc"], p["ad_soyad"], p["dob"], p["cinsiyet"], p["email"],
-                    p["tarih"], p["seviye"], p["belirtiler"], p["diyet"], p["egzersiz"],
-                )
-            )
+        insert_rows(patients_cache)
 
     # ----- Filtrele butonu -----
     def apply_filters() -> None:
@@ -200,15 +227,14 @@ def open_tum_hasta_bilgileri_window(doctor_id: int) -> None:
 
     # ----- Yenile butonu -----
     def manual_refresh():
-        load_all_patients()
         apply_filters()
+        load_all_patients()
 
     tk.Button(filt_frame, text="Yenile", command=manual_refresh,
               bg="#4CAF50", fg="white").grid(row=0, column=7, padx=6)
 
     # ----- İlk yükleme -----
     load_all_patients()
-    populate_table()
 
     win.focus_force()
     win.mainloop()
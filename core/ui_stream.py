@@ -0,0 +1,139 @@
+# core/ui_stream.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Büyük sorgu sonuçlarını Tk arayüzüne parça parça aktarma.
+
+Database.fetch_iter ile gelen satırlar tek seferde Treeview'a basılmaz;
+ilk parça hemen işlenir (pencere dolu açılır), kalanı olay döngüsünde
+after() ile sırayla eklenir, böylece pencere donmaz.
+
+Geçmiş listeleri (ölçümler, öneriler, uyarılar) ise KeysetPager ile sayfa
+sayfa yüklenir: Database.page_* bir önceki sayfanın son satırından devam
+eder, "Daha Fazla" düğmesi yalnızca yeni sayfayı ister.
+"""
+from __future__ import annotations
+
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+
+def stream_rows(widget, rows: Iterable, on_chunk: Callable[[List], None],
+                chunk_size: int = 500,
+                on_done: Optional[Callable[[], None]] = None) -> Callable[[], None]:
+    """
+    rows yineleyicisini widget'ın olay döngüsünde chunk_size'lık parçalarla tüketir.
+    • Pencere kapanırsa ya da dönen iptal fonksiyonu çağrılırsa akış durur
+    • on_done her durumda bir kez çağrılır (ör. bağlantıyı iade etmek için)
+    Dönüş: iptal fonksiyonu
+    """
+    rows = iter(rows)
+    durum = {"bitti": False, "is": None}
+
+    def bitir() -> None:
+        if durum["bitti"]:
+            return
+        durum["bitti"] = True
+        if durum["is"] is not None:
+            try:
+                widget.after_cancel(durum["is"])
+            except Exception:
+                pass
+        close = getattr(rows, "close", None)     # üreteçse imleci hemen kapat
+        if close:
+            close()
+        if on_done:
+            on_done()
+
+    def adim() -> None:
+        durum["is"] = None
+        if durum["bitti"]:
+            return
+        if not widget.winfo_exists():
+            bitir()
+            return
+        try:
+            parca = list(islice(rows, chunk_size))
+            if parca:
+                on_chunk(parca)
+        except Exception:
+            bitir()
+            raise
+        if len(parca) < chunk_size:
+            bitir()
+        else:
+            durum["is"] = widget.after(1, adim)
+
+    adim()
+    return bitir
+
+
+class KeysetPager:
+    """
+    Anahtar kümesi (keyset) sayfalayıcı.
+    • fetch_page(after, limit) → satır listesi (Database.page_* sarmalayıcısı)
+    • key(satır) → bir sonraki sayfanın after değeri
+    • Sonraki sayfanın var olup olmadığını anlamak için limit+1 satır istenir;
+      yoksa button devre dışı bırakılır
+    • widget verilirse sayfa arka planda istenir (core.async_db.run_async):
+      fetch_page(db, after, limit) yürütücünün bağlantısıyla çalışır, pencere
+      bağlantı tutmaz; yükleme sürerken button devre dışıdır
+    • on_empty → ilk sayfa boş geldiğinde çağrılır ("kayıt yok" mesajı için)
+    """
+
+    def __init__(self, fetch_page: Callable[..., Sequence],
+                 on_rows: Callable[[List], None],
+                 key: Callable[[Sequence], Tuple],
+                 button=None, page_size: int = 100, widget=None,
+                 on_empty: Optional[Callable[[], None]] = None):
+        self.fetch_page = fetch_page
+        self.on_rows = on_rows
+        self.key = key
+        self.button = button
+        self.page_size = page_size
+        self.widget = widget
+        self.on_empty = on_empty
+        self.after: Optional[Tuple] = None
+        self.has_more = True
+        self._yukleniyor = False
+        if button is not None:
+            button.config(command=self.load_more)
+
+    def reset(self) -> None:
+        """Başa döner ve ilk sayfayı yükler (liste temizliği çağırana aittir)."""
+        self.after = None
+        self.has_more = True
+        self.load_more()
+
+    def load_more(self) -> None:
+        if not self.has_more or self._yukleniyor:
+            return
+        if self.widget is None:
+            self._sayfa(self.fetch_page(self.after, self.page_size + 1))
+            return
+
+        from core.async_db import _show_error, run_async
+        self._yukleniyor = True
+        if self.button is not None:
+            self.button.config(state="disabled")
+
+        def hatali(e: BaseException) -> None:
+            self._yukleniyor = False
+            if self.button is not None:
+                self.button.config(state="normal")
+            _show_error(e)
+
+        run_async(self.widget, self.fetch_page, self.after, self.page_size + 1,
+                  on_success=self._sayfa, on_error=hatali)
+
+    def _sayfa(self, rows) -> None:
+        self._yukleniyor = False
+        rows = list(rows)
+        self.has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if rows:
+            self.after = self.key(rows[-1])
+            self.on_rows(rows)
+        elif self.after is None and self.on_empty is not None:
+            self.on_empty()
+        if self.button is not None:
+            self.button.config(state="normal" if self.has_more else "disabled")
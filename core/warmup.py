@@ -0,0 +1,60 @@
+# core/warmup.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Grafik modüllerinin arka planda ısıtılması.
+
+Giriş ekranı ve paneller matplotlib/numpy/PIL yüklemeden açılır; bu modüller
+yalnızca ilk grafik ya da profil resmi gerektiğinde içe aktarılır
+(core/figure_manager.py, core/graph_utils.py). Kullanıcı paneli ilk
+tıklamadan önce genellikle birkaç saniye inceler; start_warmup bu boşlukta
+STARTUP_CONFIG['warmup_modules'] listesini bir daemon iş parçacığında yükler
+ve ilk grafik açılışı soğuk içe aktarmayı beklemez.
+
+    root.after(STARTUP_CONFIG['warmup_delay_ms'], start_warmup)
+
+• Yalnızca modül içe aktarılır; Tk nesnelerine dokunulmaz
+• İçe aktarma kilidi sayesinde ısınma sürerken açılan grafik aynı modülü
+  ikinci kez yüklemez, ısınmanın bitmesini bekler
+• Yüklenemeyen modül (ör. PIL kurulu değil) sessizce atlanır
+"""
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from data.config import STARTUP_CONFIG
+
+_baslatildi = False
+_kilit = threading.Lock()
+sureler: Dict[str, float] = {}          # modül → yükleme süresi (ms), izleme için
+
+
+def _isit(moduller: Iterable[str]) -> None:
+    for ad in moduller:
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(ad)
+        except Exception as e:          # ImportError ya da arka uç hatası: grafik açılınca görünür
+            print(f"Isınma atlandı ({ad}): {e}")
+            continue
+        sureler[ad] = (time.perf_counter() - t0) * 1000
+
+
+def start_warmup(moduller: Optional[Iterable[str]] = None) -> None:
+    """Isınmayı süreç başına bir kez başlatır (panelden panele dönüşte tekrarlanmaz)."""
+    global _baslatildi
+    if not STARTUP_CONFIG.get('warmup', True):
+        return
+    with _kilit:
+        if _baslatildi:
+            return
+        _baslatildi = True
+    liste = list(moduller if moduller is not None else STARTUP_CONFIG['warmup_modules'])
+    threading.Thread(target=_isit, args=(liste,), name="warmup", daemon=True).start()
+
+
+def schedule_warmup(root) -> None:
+    """Panel penceresi çizildikten sonra ısınmayı başlatır."""
+    root.after(STARTUP_CONFIG.get('warmup_delay_ms', 300), start_warmup)
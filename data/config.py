@@ -1,8 +1,122 @@
+# Veritabanı arka ucu: 'postgresql' (çok kullanıcılı kurulum) ya da
+# 'sqlite' (tek doktorlu muayenehane; ayrı sunucu gerektirmez, core/db_backends.py)
+DATABASE_BACKEND = 'postgresql'
+
+# Uygulama saat dilimi: olcum_gunu kolonu (data/migrations/0003) bu dilime göre hesaplanır
+APP_TIMEZONE = 'Europe/Istanbul'
 
 DATABASE_CONFIG = {
     'dbname': 'diyabet_sistemi',
     'user': 'postgres',
     'password': '474747',  # PostgreSQL kurulumu sırasında belirlediğin şifre
     'host': 'localhost',
-    'port': '5432'
-}
\ No newline at end of file
+    'port': '5432',
+    # DATE(olcum_zamani) ile olcum_gunu aynı günü versin diye oturum da bu dilimde açılır
+    'options': f'-c timezone={APP_TIMEZONE}'
+}
+
+# Paylaşılan bağlantı havuzu (core/db_pool.py)
+POOL_CONFIG = {
+    'min_size': 1,              # açılışta hazır tutulan bağlantı sayısı
+    'max_size': 10,             # aynı anda açık olabilecek en fazla bağlantı
+    'checkout_timeout': 10.0,   # boş bağlantı için en fazla bekleme (sn)
+    'health_check_after': 30.0, # bu süreden uzun boşta kalan bağlantı SELECT 1 ile sınanır
+    'connect_retries': 5,       # bağlantı kurulamazsa tekrar deneme sayısı
+    'backoff_base': 0.2,        # ilk bekleme (sn), her denemede iki katına çıkar
+    'backoff_max': 5.0,
+}
+
+# Sık çalışan sorgular için bağlantı başına sunucu tarafı PREPARE/EXECUTE
+# önbelleği (Database.*(..., prepared=True); core/db_backends.py)
+PREPARED_CONFIG = {
+    'prepared': True,           # False → prepared=True çağrılar da düz execute edilir
+    'max_prepared': 64,         # bağlantı başına en fazla hazır ifade (LRU)
+}
+
+# Database.fetch_iter: sunucu tarafı imlecin her round-trip'te getirdiği satır sayısı
+FETCH_ITERSIZE = 2000
+
+# Gömülü SQLite arka ucu (DATABASE_BACKEND = 'sqlite')
+SQLITE_CONFIG = {
+    'path': 'data/diyabet_sistemi.db',
+    'cached_statements': 256,   # bağlantı başına hazırlanmış ifade önbelleği
+    'busy_timeout_ms': 5000,    # yazma kilidi için en fazla bekleme
+    'auto_migrate': True,       # ilk bağlantıda data/migrations/sqlite göçlerini uygula
+    'pragmas': {
+        'journal_mode': 'WAL',      # okuyucular yazıcıyı beklemez
+        'synchronous': 'NORMAL',    # WAL'da güvenli; her commit'te fsync yapılmaz
+        'foreign_keys': 'ON',
+        'temp_store': 'MEMORY',
+        'cache_size': -16000,       # ~16 MB sayfa önbelleği (negatif → KiB)
+        'mmap_size': 134217728,     # 128 MB bellek eşlemeli okuma
+    },
+}
+
+# Sorgu süreleri ve yavaş sorgu günlüğü (core/query_stats.py)
+QUERY_STATS_CONFIG = {
+    'enabled': True,
+    'slow_query_ms': 250,       # bu süreyi aşan sorgu yazdırılır (None → kapalı)
+    'sample_size': 1024,        # p50/p95 için ifade başına saklanan son çağrı sayısı
+    'dump_on_exit': False,      # çıkışta özet tabloyu yazdır
+    'dump_path': None,          # verilirse özet bu dosyaya JSON olarak yazılır
+}
+
+# Arka plan veritabanı yürütücüsü (core/async_db.py)
+DB_EXECUTOR_CONFIG = {
+    'max_workers': 3,           # her birinin kendi bağlantısı olan iş parçacığı sayısı
+    'poll_ms': 25,              # Tk tarafında sonuç yoklama aralığı
+}
+
+# Referans tabloları önbelleği (core/reference_cache.py)
+REFERENCE_CACHE_CONFIG = {
+    'check_interval': 5.0,      # referans_surumu en fazla bu aralıkla (sn) okunur
+}
+
+# Kan şekeri grafikleri (Database.get_glucose_series)
+GRAPH_CONFIG = {
+    'max_points': 60,           # aralık bu kadar günü aşarsa haftalık, haftayı aşarsa aylık özet çizilir
+}
+
+# Açılış süresi (core/warmup.py, benchmarks/startup_benchmark.py)
+STARTUP_CONFIG = {
+    'warmup': True,             # panel açıldıktan sonra grafik modüllerini arka planda yükle
+    'warmup_delay_ms': 300,     # panel ilk kez çizildikten bu kadar sonra başla
+    'warmup_modules': [         # sırayla içe aktarılır; ilk grafik açılışında bekleme kalmaz
+        'numpy',
+        'matplotlib.figure',
+        'matplotlib.dates',
+        'matplotlib.backends.backend_tkagg',
+        'PIL.Image',
+    ],
+    'import_budget_ms': 250,    # "import main" soğuk açılış süresi üst sınırı (benchmark)
+    'deferred_modules': ['matplotlib', 'numpy', 'PIL'],   # açılışta yüklenmemesi gerekenler
+}
+
+# Profil resmi küçük görselleri (core/thumbnail_cache.py)
+THUMBNAIL_CONFIG = {
+    'dir': 'images/.thumbs',    # önbellek klasörü (PNG; Tk PIL olmadan okur)
+    'sizes': [80, 120, 140],    # hasta paneli, profil penceresi, kişi bilgisi
+    'max_files': 300,           # aşılırsa en uzun süredir kullanılmayanlar silinir (LRU)
+    'workers': 2,               # çözme/ölçekleme iş parçacığı sayısı
+}
+
+# Giriş bilgisi e-postaları: kalıcı kuyruk + arka plan göndericisi (core/email_outbox.py)
+EMAIL_CONFIG = {
+    'host': 'smtp.gmail.com',
+    'port': 587,
+    'user': 'elifceler55@gmail.com',    # None → kimlik doğrulamasız (yerel deneme sunucusu)
+    'password': 'dgix xpia tfth qzza',  # Gmail için özel uygulama şifresi alman gerekir
+    'sender': 'elifceler55@gmail.com',
+    'starttls': True,
+    'timeout': 20.0,            # bağlantı/komut zaman aşımı (sn)
+    'idle_timeout': 60.0,       # bu süre boşta kalan SMTP oturumu kapatılır
+    'batch_size': 20,           # bir turda kuyruktan alınan en fazla ileti
+    'poll_interval': 5.0,       # kuyruk boşken yoklama aralığı (yeni ileti göndericiyi hemen uyandırır)
+    'lease': 300.0,             # alınan iletinin kira süresi; her iletiden önce yenilenir, süreç çökerse
+                                # bu süre sonunda yeniden denenir. Tek iletinin en kötü gönderim
+                                # süresinden (bağlan + STARTTLS + AUTH + gönder, her adım timeout) uzun olmalı
+    'max_attempts': 8,          # bu kadar geçici hatadan sonra ileti 'basarisiz' olur
+    'backoff_base': 30.0,       # ilk yeniden deneme beklemesi (sn), her denemede iki katına çıkar
+    'backoff_max': 3600.0,
+    'sample_size': 512,         # gönderim süresi p50/p95 için saklanan son örnek sayısı
+}
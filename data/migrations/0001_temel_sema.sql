@@ -0,0 +1,168 @@
+-- 0001 – Temel şema
+-- Eski schema.sql'deki CREATE/ALTER/DROP adımlarının son hâli.
+-- IF NOT EXISTS kullanıldığı için eski script ile kurulmuş veritabanında da güvenle çalışır.
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+-- 1. kullanicilar
+CREATE TABLE IF NOT EXISTS kullanicilar (
+    id SERIAL PRIMARY KEY,
+    tc_no VARCHAR(11) UNIQUE NOT NULL,
+    ad VARCHAR(50) NOT NULL,
+    soyad VARCHAR(50) NOT NULL,
+    sifre BYTEA NOT NULL,
+    dogum_tarihi DATE NOT NULL,
+    cinsiyet VARCHAR(10) CHECK (cinsiyet IN ('Erkek', 'Kadın', 'Diğer')),
+    email VARCHAR(100) UNIQUE NOT NULL,
+    rol VARCHAR(10) CHECK (rol IN ('doktor', 'hasta')) NOT NULL,
+    profil_resmi BYTEA,
+    profil_resmi_path TEXT,
+    aktif_mi BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+ALTER TABLE kullanicilar ADD COLUMN IF NOT EXISTS profil_resmi_path TEXT;
+
+-- 2. doktor_hasta
+CREATE TABLE IF NOT EXISTS doktor_hasta (
+    id SERIAL PRIMARY KEY,
+    doktor_id INT NOT NULL REFERENCES kullanicilar(id),
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    UNIQUE (doktor_id, hasta_id)
+);
+
+-- 3. belirtiler
+CREATE TABLE IF NOT EXISTS belirtiler (
+    id SERIAL PRIMARY KEY,
+    ad VARCHAR(50) UNIQUE NOT NULL,
+    aciklama TEXT
+);
+
+-- 4. hasta_belirtileri
+CREATE TABLE IF NOT EXISTS hasta_belirtileri (
+    id SERIAL PRIMARY KEY,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    belirti_id INT NOT NULL REFERENCES belirtiler(id),
+    tarih DATE NOT NULL
+);
+
+-- 5. diyet_turleri
+CREATE TABLE IF NOT EXISTS diyet_turleri (
+    id SERIAL PRIMARY KEY,
+    ad VARCHAR(50) UNIQUE NOT NULL,
+    aciklama TEXT
+);
+
+-- 6. egzersiz_turleri
+CREATE TABLE IF NOT EXISTS egzersiz_turleri (
+    id SERIAL PRIMARY KEY,
+    ad VARCHAR(50) UNIQUE NOT NULL,
+    aciklama TEXT
+);
+
+-- 7. diyet_takibi
+CREATE TABLE IF NOT EXISTS diyet_takibi (
+    id SERIAL PRIMARY KEY,
+    hasta_id INTEGER REFERENCES kullanicilar(id),
+    tarih DATE NOT NULL,
+    saat TIME NOT NULL,
+    durum BOOLEAN DEFAULT TRUE,
+    diyet_turu_id INTEGER REFERENCES diyet_turleri(id),
+    hasta_ad TEXT,
+    hasta_tc VARCHAR(11)
+);
+
+-- 8. egzersiz_takibi
+CREATE TABLE IF NOT EXISTS egzersiz_takibi (
+    id SERIAL PRIMARY KEY,
+    hasta_id INTEGER REFERENCES kullanicilar(id),
+    tarih DATE NOT NULL,
+    saat TIME NOT NULL,
+    durum BOOLEAN DEFAULT TRUE,
+    egzersiz_turu_id INTEGER REFERENCES egzersiz_turleri(id),
+    hasta_ad TEXT,
+    hasta_tc VARCHAR(11)
+);
+
+-- 9. olcum_zamanlari
+CREATE TABLE IF NOT EXISTS olcum_zamanlari (
+    id SERIAL PRIMARY KEY,
+    ad VARCHAR(20) UNIQUE NOT NULL,
+    saat_baslangic TIME NOT NULL,
+    saat_bitis TIME NOT NULL
+);
+
+-- 10. kan_sekeri_olcumleri
+CREATE TABLE IF NOT EXISTS kan_sekeri_olcumleri (
+    id SERIAL PRIMARY KEY,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    olcum_zamani TIMESTAMPTZ NOT NULL,
+    olcum_zamani_id INT REFERENCES olcum_zamanlari(id),
+    seviye INT NOT NULL CHECK (seviye >= 0)
+);
+
+-- 11. uyarilar
+CREATE TABLE IF NOT EXISTS uyarilar (
+    id SERIAL PRIMARY KEY,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    tarih DATE NOT NULL,
+    uyari_tipi VARCHAR(30) NOT NULL,
+    mesaj TEXT NOT NULL,
+    bildirildi BOOLEAN DEFAULT FALSE,
+    gosterildi BOOLEAN DEFAULT FALSE
+);
+ALTER TABLE uyarilar ADD COLUMN IF NOT EXISTS gosterildi BOOLEAN DEFAULT FALSE;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uyarilar_unique') THEN
+        DELETE FROM uyarilar a
+        USING uyarilar b
+        WHERE a.ctid < b.ctid
+          AND a.hasta_id = b.hasta_id
+          AND a.tarih = b.tarih
+          AND a.uyari_tipi = b.uyari_tipi
+          AND a.mesaj = b.mesaj;
+
+        ALTER TABLE uyarilar
+        ADD CONSTRAINT uyarilar_unique UNIQUE (hasta_id, tarih, uyari_tipi, mesaj);
+    END IF;
+END $$;
+
+-- 12. loglar
+CREATE TABLE IF NOT EXISTS loglar (
+    id SERIAL PRIMARY KEY,
+    kullanici_id INT REFERENCES kullanicilar(id),
+    islem TEXT NOT NULL,
+    zaman TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 13. hasta_notlari
+CREATE TABLE IF NOT EXISTS hasta_notlari (
+    id SERIAL PRIMARY KEY,
+    doktor_id INT REFERENCES kullanicilar(id),
+    hasta_id INT REFERENCES kullanicilar(id),
+    tarih TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    not_metni TEXT NOT NULL
+);
+
+-- 14. insulin_onerileri
+CREATE TABLE IF NOT EXISTS insulin_onerileri (
+    id SERIAL PRIMARY KEY,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    tarih DATE NOT NULL,
+    ortalama NUMERIC(5,2) NOT NULL,
+    doz_ml INT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (hasta_id, tarih)
+);
+
+-- 15. oneri_kan_sekeri (Öneri Al penceresinde girilen değerler)
+CREATE TABLE IF NOT EXISTS oneri_kan_sekeri (
+    id SERIAL PRIMARY KEY,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    hasta_ad TEXT,
+    tarih DATE NOT NULL,
+    saat TIME NOT NULL,
+    seviye NUMERIC(6,2) NOT NULL
+);
@@ -0,0 +1,25 @@
+-- 0002 – Başlangıç verileri (ölçüm saat aralıkları + örnek kullanıcılar)
+
+INSERT INTO olcum_zamanlari (ad, saat_baslangic, saat_bitis) VALUES
+('Sabah', '07:00', '08:00'),
+('Öğle', '12:00', '13:00'),
+('İkindi', '15:00', '16:00'),
+('Akşam', '18:00', '19:00'),
+('Gece', '22:00', '23:00')
+ON CONFLICT (ad) DO NOTHING;
+
+-- Sabit Doktor Kaydı (TC: 99999999999, Şifre: admin123)
+INSERT INTO kullanicilar (tc_no, ad, soyad, sifre, dogum_tarihi, cinsiyet, email, rol)
+VALUES
+('99999999999', 'Admin', 'Doktor', digest('admin123', 'sha256'), '1980-01-01', 'Erkek', 'admin@example.com', 'doktor'),
+('99999999991', 'Ahmet', 'Yılmaz', digest('d234', 'sha256'), '1980-05-10', 'Erkek', 'ahmet.yilmaz@example.com', 'doktor')
+ON CONFLICT DO NOTHING;
+
+-- Örnek hastalar
+INSERT INTO kullanicilar (tc_no, ad, soyad, sifre, dogum_tarihi, cinsiyet, email, rol)
+VALUES
+('77777777777', 'Ali', 'Veli', digest('456', 'sha256'), '1990-01-01', 'Erkek', 'ali.veli@example.com', 'hasta'),
+('88888888888', 'Ayşe', 'Demir', digest('234', 'sha256'), '1995-06-12', 'Kadın', 'ayse@example.com', 'hasta'),
+('66666666666', 'Furkan', 'Yıldız', digest('135', 'sha256'), '2000-04-17', 'Erkek', 'furkanyildiz@example.com', 'hasta'),
+('88888888881', 'Yavuz', 'Bilgin', digest('178', 'sha256'), '2001-02-04', 'Erkek', 'yavuz@example.com', 'hasta')
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,33 @@
+-- 0003 – Zaman aralığı sorguları için indeksler
+--
+-- Gün bazlı sorgular artık DATE(olcum_zamani) = … yerine yarı açık aralık
+-- (olcum_zamani >= gün AND olcum_zamani < gün + 1) kullanır; bu da
+-- (hasta_id, olcum_zamani) indeksinden yararlanır.
+--
+-- olcum_gunu: ölçümün uygulama saat dilimindeki günü. Saat dilimi
+-- data/config.py → APP_TIMEZONE ile aynı olmalıdır (bağlantılar da bu
+-- dilimle açılır, böylece DATE(olcum_zamani) ile olcum_gunu hep aynı günü verir).
+
+ALTER TABLE kan_sekeri_olcumleri
+    ADD COLUMN IF NOT EXISTS olcum_gunu DATE
+    GENERATED ALWAYS AS ((olcum_zamani AT TIME ZONE 'Europe/Istanbul')::date) STORED;
+
+CREATE INDEX IF NOT EXISTS kan_sekeri_olcumleri_hasta_zaman_idx
+    ON kan_sekeri_olcumleri (hasta_id, olcum_zamani);
+
+-- Aynı gün aynı slotta tek ölçüm kuralı artık veritabanı tarafından korunur.
+-- Eski kayıtlardaki mükerrerler silinmez; ilk kayıt dışındakiler slotsuz
+-- (ortalamaya katılmayan) ölçüme çevrilir.
+UPDATE kan_sekeri_olcumleri a
+SET    olcum_zamani_id = NULL
+FROM   kan_sekeri_olcumleri b
+WHERE  a.id > b.id
+  AND  a.hasta_id = b.hasta_id
+  AND  a.olcum_gunu = b.olcum_gunu
+  AND  a.olcum_zamani_id = b.olcum_zamani_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS kan_sekeri_olcumleri_gun_slot_uidx
+    ON kan_sekeri_olcumleri (hasta_id, olcum_gunu, olcum_zamani_id);
+
+-- uyarilar.tarih zaten DATE; DATE(tarih) = … yerine tarih = … yazıldığında
+-- uyarilar_unique (hasta_id, tarih, …) indeksi kullanılır, ek indeks gerekmez.
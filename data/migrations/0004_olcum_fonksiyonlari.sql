@@ -0,0 +1,103 @@
+-- 0004 – Tek round-trip ölçüm kaydı (Database.ingest_blood_sugar → kan_sekeri_ekle)
+-- Gün bazlı okumalar olcum_gunu üzerinden yapılır ve
+-- kan_sekeri_olcumleri_gun_slot_uidx indeksini kullanır.
+
+-- Database._dose_for_avg ile aynı eşikler
+CREATE OR REPLACE FUNCTION insulin_dozu(p_ortalama NUMERIC) RETURNS INT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE
+        WHEN p_ortalama <= 110 THEN 0
+        WHEN p_ortalama <= 150 THEN 1
+        WHEN p_ortalama <= 200 THEN 2
+        ELSE 3
+    END;
+$$;
+
+-- Bir günün insülin ortalamasını ve eksik/yetersiz ölçüm uyarılarını yeniler
+-- (_update_daily_insulin + check_insulin_data_alert)
+CREATE OR REPLACE FUNCTION insulin_gunu_yenile(p_hasta_id INT, p_gun DATE) RETURNS VOID
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_adet     INT;
+    v_ortalama NUMERIC;
+    v_gun_str  TEXT := TO_CHAR(p_gun, 'DD.MM.YYYY');
+BEGIN
+    SELECT COUNT(*), AVG(seviye) INTO v_adet, v_ortalama
+    FROM kan_sekeri_olcumleri
+    WHERE hasta_id = p_hasta_id
+      AND olcum_gunu = p_gun
+      AND olcum_zamani_id IS NOT NULL;
+
+    IF v_adet > 0 THEN
+        INSERT INTO insulin_onerileri (hasta_id, tarih, ortalama, doz_ml)
+        VALUES (p_hasta_id, p_gun, v_ortalama, insulin_dozu(v_ortalama))
+        ON CONFLICT (hasta_id, tarih) DO UPDATE
+        SET ortalama   = EXCLUDED.ortalama,
+            doz_ml     = EXCLUDED.doz_ml,
+            created_at = CURRENT_TIMESTAMP;
+    END IF;
+
+    DELETE FROM uyarilar
+    WHERE hasta_id = p_hasta_id AND tarih = p_gun
+      AND uyari_tipi IN ('Eksik Ölçüm', 'Yetersiz Ölçüm');
+
+    IF v_adet < 3 THEN
+        INSERT INTO uyarilar (hasta_id, tarih, uyari_tipi, mesaj) VALUES
+            (p_hasta_id, p_gun, 'Yetersiz Ölçüm',
+             v_gun_str || ' tarihli ölçümler yetersiz! Ortalama güvenilir değil.'),
+            (p_hasta_id, p_gun, 'Eksik Ölçüm',
+             v_gun_str || ' tarihinde ' || (5 - v_adet) || ' ölçüm eksik. Ortalama eksik verilere göre hesaplandı.')
+        ON CONFLICT (hasta_id, tarih, uyari_tipi, mesaj) DO NOTHING;
+    ELSIF v_adet < 5 THEN
+        INSERT INTO uyarilar (hasta_id, tarih, uyari_tipi, mesaj)
+        VALUES (p_hasta_id, p_gun, 'Eksik Ölçüm',
+                'Ölçüm eksik! Ortalama alınırken bu ölçüm hesaba katılmadı.')
+        ON CONFLICT (hasta_id, tarih, uyari_tipi, mesaj) DO NOTHING;
+    END IF;
+END;
+$$;
+
+-- Ölçümü kaydeder. sonuc: 'eklendi' | 'mukerrer' (aynı gün aynı slot dolu)
+CREATE OR REPLACE FUNCTION kan_sekeri_ekle(p_hasta_id INT, p_olcum_zamani TIMESTAMPTZ, p_seviye INT)
+RETURNS TABLE (sonuc TEXT, kayit_id INT, zaman_id INT)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_zaman_id INT;
+    v_kayit_id INT;
+    v_gun      DATE;
+BEGIN
+    SELECT oz.id INTO v_zaman_id
+    FROM olcum_zamanlari oz
+    WHERE p_olcum_zamani::time BETWEEN oz.saat_baslangic AND oz.saat_bitis
+    ORDER BY oz.id
+    LIMIT 1;
+
+    -- Slot doluysa kan_sekeri_olcumleri_gun_slot_uidx çakışır, satır eklenmez
+    INSERT INTO kan_sekeri_olcumleri (hasta_id, olcum_zamani, olcum_zamani_id, seviye)
+    VALUES (p_hasta_id, p_olcum_zamani, v_zaman_id, p_seviye)
+    ON CONFLICT (hasta_id, olcum_gunu, olcum_zamani_id) DO NOTHING
+    RETURNING id, olcum_gunu INTO v_kayit_id, v_gun;
+
+    IF v_kayit_id IS NULL THEN
+        RETURN QUERY SELECT 'mukerrer'::TEXT, NULL::INT, v_zaman_id;
+        RETURN;
+    END IF;
+
+    -- Anlık uyarı (check_blood_sugar_alert): kayıt günü tarihiyle
+    IF p_seviye < 70 THEN
+        INSERT INTO uyarilar (hasta_id, tarih, uyari_tipi, mesaj)
+        VALUES (p_hasta_id, CURRENT_DATE, 'Düşük Kan Şekeri',
+                'Kan şekeri seviyesi çok düşük: ' || p_seviye || ' mg/dL')
+        ON CONFLICT (hasta_id, tarih, uyari_tipi, mesaj) DO NOTHING;
+    ELSIF p_seviye > 180 THEN
+        INSERT INTO uyarilar (hasta_id, tarih, uyari_tipi, mesaj)
+        VALUES (p_hasta_id, CURRENT_DATE, 'Yüksek Kan Şekeri',
+                'Kan şekeri seviyesi çok yüksek: ' || p_seviye || ' mg/dL')
+        ON CONFLICT (hasta_id, tarih, uyari_tipi, mesaj) DO NOTHING;
+    END IF;
+
+    PERFORM insulin_gunu_yenile(p_hasta_id, v_gun);
+
+    RETURN QUERY SELECT 'eklendi'::TEXT, v_kayit_id, v_zaman_id;
+END;
+$$;
@@ -0,0 +1,7 @@
+-- 0005 – Okunmamış uyarılar için kısmi indeks
+-- get_alerts tek UPDATE … RETURNING ile yalnızca bildirildi = FALSE satırlarını
+-- işaretler; bu indeks sayesinde hastanın tüm uyarı geçmişi taranmaz.
+
+CREATE INDEX IF NOT EXISTS uyarilar_okunmamis_idx
+    ON uyarilar (hasta_id)
+    WHERE bildirildi = FALSE;
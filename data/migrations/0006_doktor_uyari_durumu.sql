@@ -0,0 +1,13 @@
+-- 0006 – Doktor uyarıları için hasta bazlı işlenme işareti (high-water mark)
+-- generate_all_doctor_alerts yalnızca son_olcum_id'den sonra ölçüm alan
+-- günleri yeniden değerlendirir.
+
+CREATE TABLE IF NOT EXISTS doktor_uyari_durumu (
+    hasta_id      INT PRIMARY KEY REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    son_olcum_id  INT NOT NULL DEFAULT 0,
+    guncellendi   TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Yeni ölçümlerin (id > son_olcum_id) hasta bazında bulunması için
+CREATE INDEX IF NOT EXISTS kan_sekeri_olcumleri_hasta_id_idx
+    ON kan_sekeri_olcumleri (hasta_id, id);
@@ -0,0 +1,82 @@
+-- 0007 – Diyet/egzersiz uyum özeti
+-- get_recommendation_progress ve doktor panelindeki uyum grafiği dört ayrı
+-- COUNT(*) yerine bu tablodan tek satır okur. Sayılar diyet_takibi ve
+-- egzersiz_takibi üzerindeki tetikleyicilerle her ekleme, durum değişikliği
+-- ve silmede güncel tutulur.
+
+CREATE TABLE IF NOT EXISTS uyum_ozeti (
+    hasta_id            INT PRIMARY KEY REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    diyet_toplam        INT NOT NULL DEFAULT 0,
+    diyet_uygulanan     INT NOT NULL DEFAULT 0,
+    egzersiz_toplam     INT NOT NULL DEFAULT 0,
+    egzersiz_uygulanan  INT NOT NULL DEFAULT 0
+);
+
+-- Özet satırına fark ekler (satır yoksa oluşturur)
+CREATE OR REPLACE FUNCTION uyum_ozeti_ekle(p_hasta_id INT, p_diyet BOOLEAN,
+                                           p_toplam INT, p_uygulanan INT) RETURNS VOID
+LANGUAGE sql AS $$
+    INSERT INTO uyum_ozeti (hasta_id, diyet_toplam, diyet_uygulanan,
+                            egzersiz_toplam, egzersiz_uygulanan)
+    VALUES (p_hasta_id,
+            CASE WHEN p_diyet THEN p_toplam    ELSE 0 END,
+            CASE WHEN p_diyet THEN p_uygulanan ELSE 0 END,
+            CASE WHEN p_diyet THEN 0 ELSE p_toplam    END,
+            CASE WHEN p_diyet THEN 0 ELSE p_uygulanan END)
+    ON CONFLICT (hasta_id) DO UPDATE SET
+        diyet_toplam       = uyum_ozeti.diyet_toplam       + EXCLUDED.diyet_toplam,
+        diyet_uygulanan    = uyum_ozeti.diyet_uygulanan    + EXCLUDED.diyet_uygulanan,
+        egzersiz_toplam    = uyum_ozeti.egzersiz_toplam    + EXCLUDED.egzersiz_toplam,
+        egzersiz_uygulanan = uyum_ozeti.egzersiz_uygulanan + EXCLUDED.egzersiz_uygulanan;
+$$;
+
+CREATE OR REPLACE FUNCTION uyum_ozeti_tetikleyici() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_diyet BOOLEAN := TG_TABLE_NAME = 'diyet_takibi';
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.hasta_id IS NOT NULL THEN
+        PERFORM uyum_ozeti_ekle(OLD.hasta_id, v_diyet, -1,
+                                CASE WHEN OLD.durum THEN -1 ELSE 0 END);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.hasta_id IS NOT NULL THEN
+        PERFORM uyum_ozeti_ekle(NEW.hasta_id, v_diyet, 1,
+                                CASE WHEN NEW.durum THEN 1 ELSE 0 END);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS diyet_takibi_uyum_ozeti ON diyet_takibi;
+CREATE TRIGGER diyet_takibi_uyum_ozeti
+    AFTER INSERT OR DELETE OR UPDATE OF hasta_id, durum ON diyet_takibi
+    FOR EACH ROW EXECUTE FUNCTION uyum_ozeti_tetikleyici();
+
+DROP TRIGGER IF EXISTS egzersiz_takibi_uyum_ozeti ON egzersiz_takibi;
+CREATE TRIGGER egzersiz_takibi_uyum_ozeti
+    AFTER INSERT OR DELETE OR UPDATE OF hasta_id, durum ON egzersiz_takibi
+    FOR EACH ROW EXECUTE FUNCTION uyum_ozeti_tetikleyici();
+
+-- Mevcut kayıtlardan ilk doldurma (göç sırasında yazmalar beklesin)
+LOCK TABLE diyet_takibi, egzersiz_takibi IN SHARE MODE;
+
+INSERT INTO uyum_ozeti (hasta_id, diyet_toplam, diyet_uygulanan,
+                        egzersiz_toplam, egzersiz_uygulanan)
+SELECT hasta_id,
+       SUM(diyet_toplam), SUM(diyet_uygulanan),
+       SUM(egzersiz_toplam), SUM(egzersiz_uygulanan)
+FROM (
+    SELECT hasta_id, COUNT(*) AS diyet_toplam,
+           COUNT(*) FILTER (WHERE durum) AS diyet_uygulanan,
+           0 AS egzersiz_toplam, 0 AS egzersiz_uygulanan
+    FROM diyet_takibi WHERE hasta_id IS NOT NULL GROUP BY hasta_id
+    UNION ALL
+    SELECT hasta_id, 0, 0, COUNT(*), COUNT(*) FILTER (WHERE durum)
+    FROM egzersiz_takibi WHERE hasta_id IS NOT NULL GROUP BY hasta_id
+) t
+GROUP BY hasta_id
+ON CONFLICT (hasta_id) DO UPDATE SET
+    diyet_toplam       = EXCLUDED.diyet_toplam,
+    diyet_uygulanan    = EXCLUDED.diyet_uygulanan,
+    egzersiz_toplam    = EXCLUDED.egzersiz_toplam,
+    egzersiz_uygulanan = EXCLUDED.egzersiz_uygulanan;
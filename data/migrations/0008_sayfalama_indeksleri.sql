@@ -0,0 +1,39 @@
+-- 0008 – Anahtar kümesi sayfalaması için kapsayan indeksler
+-- Database.page_* sorguları (hasta_id, sıralama anahtarı) < (önceki sayfanın
+-- son satırı) koşuluyla LIMIT kadar satır okur. Aşağıdaki indeksler hem
+-- sıralamayı hem de seçilen kolonları karşıladığı için her sayfa, hastanın
+-- geçmişi ne kadar uzun olursa olsun aynı sayıda indeks sayfası okur
+-- (index-only scan).
+
+-- Ölçümler: (olcum_zamani, id) DESC. Eski (hasta_id, olcum_zamani) indeksinin
+-- yerini alır; gün aralığı sorguları bu indeksin önekini kullanır.
+CREATE INDEX IF NOT EXISTS kan_sekeri_olcumleri_sayfa_idx
+    ON kan_sekeri_olcumleri (hasta_id, olcum_zamani, id) INCLUDE (seviye);
+DROP INDEX IF EXISTS kan_sekeri_olcumleri_hasta_zaman_idx;
+
+-- Diyet / egzersiz geçmişi: (tarih, saat, id) DESC
+CREATE INDEX IF NOT EXISTS diyet_takibi_sayfa_idx
+    ON diyet_takibi (hasta_id, tarih, saat, id) INCLUDE (diyet_turu_id, durum);
+CREATE INDEX IF NOT EXISTS egzersiz_takibi_sayfa_idx
+    ON egzersiz_takibi (hasta_id, tarih, saat, id) INCLUDE (egzersiz_turu_id, durum);
+
+-- Uygulanmamış öneriler (pending_only): uygulanmış kayıtlar taranmaz
+CREATE INDEX IF NOT EXISTS diyet_takibi_bekleyen_idx
+    ON diyet_takibi (hasta_id, tarih, saat, id) INCLUDE (diyet_turu_id, durum)
+    WHERE durum = FALSE;
+CREATE INDEX IF NOT EXISTS egzersiz_takibi_bekleyen_idx
+    ON egzersiz_takibi (hasta_id, tarih, saat, id) INCLUDE (egzersiz_turu_id, durum)
+    WHERE durum = FALSE;
+
+-- Doktor uyarıları: (tarih, id) DESC. Koşul core/database.py →
+-- _DOKTOR_UYARI_FILTRESI ile aynı olmalı; hastaya gösterilen uyarılar taranmaz.
+CREATE INDEX IF NOT EXISTS uyarilar_doktor_sayfa_idx
+    ON uyarilar (hasta_id, tarih, id) INCLUDE (uyari_tipi, mesaj, bildirildi)
+    WHERE uyari_tipi IN (
+        'Acil Uyarı',
+        'Takip Uyarısı',
+        'İzleme Uyarısı',
+        'Acil Müdahale Uyarısı',
+        'Ölçüm Eksik Uyarısı',
+        'Ölçüm Yetersiz Uyarısı'
+    );
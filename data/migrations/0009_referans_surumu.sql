@@ -0,0 +1,41 @@
+-- 0009 – Referans tabloları için sürüm sayacı
+-- core/reference_cache.py belirtiler, olcum_zamanlari, diyet_turleri ve
+-- egzersiz_turleri tablolarını süreç içinde önbellekte tutar. Bu tablolarda
+-- gerçekten bir satır eklendiğinde/değiştiğinde/silindiğinde sayaç artar;
+-- önbellek tek satırlık sürüm sorgusuyla bayatladığını anlar ve tabloyu
+-- yeniden yükler. (ON CONFLICT DO NOTHING ile eklenmeyen satır sayacı artırmaz.)
+
+CREATE TABLE IF NOT EXISTS referans_surumu (
+    tablo  TEXT PRIMARY KEY,
+    surum  BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO referans_surumu (tablo)
+VALUES ('belirtiler'), ('olcum_zamanlari'), ('diyet_turleri'), ('egzersiz_turleri')
+ON CONFLICT (tablo) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION referans_surumu_artir() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['belirtiler', 'olcum_zamanlari', 'diyet_turleri', 'egzersiz_turleri']
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %1$s_referans_surumu ON %1$s;', t);
+        EXECUTE format('CREATE TRIGGER %1$s_referans_surumu
+                            AFTER INSERT OR UPDATE OR DELETE ON %1$s
+                            FOR EACH ROW EXECUTE FUNCTION referans_surumu_artir();', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS %1$s_referans_surumu_truncate ON %1$s;', t);
+        EXECUTE format('CREATE TRIGGER %1$s_referans_surumu_truncate
+                            AFTER TRUNCATE ON %1$s
+                            FOR EACH STATEMENT EXECUTE FUNCTION referans_surumu_artir();', t);
+    END LOOP;
+END;
+$$;
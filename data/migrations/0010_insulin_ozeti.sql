@@ -0,0 +1,141 @@
+-- 0010 – insulin_onerileri için artımlı günlük toplam/adet
+-- Her (hasta_id, gün) satırı o günün slotlu ölçümlerinin toplamını ve adedini
+-- tutar; ortalama ve doz bu iki değerden türetilir. kan_sekeri_olcumleri
+-- üzerindeki ekleme, güncelleme ve silmeler deyim düzeyindeki tetikleyicilerle
+-- farka dönüştürülür: günün ölçümleri yeniden okunmaz, toplu aktarımda da
+-- (hasta, gün) başına tek güncelleme yapılır. Ölçümü kalmayan günün satırı silinir.
+
+ALTER TABLE insulin_onerileri
+    ADD COLUMN IF NOT EXISTS toplam BIGINT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS adet   INT    NOT NULL DEFAULT 0;
+
+-- (hasta, gün, seviye farkı, adet farkı) dizilerini insulin_onerileri'ne uygular
+CREATE OR REPLACE FUNCTION insulin_ozeti_ekle(p_hasta_id INT[], p_gun DATE[],
+                                              p_toplam BIGINT[], p_adet INT[]) RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO insulin_onerileri AS io (hasta_id, tarih, toplam, adet, ortalama, doz_ml)
+    SELECT hasta_id, gun, SUM(toplam), SUM(adet),
+           COALESCE(SUM(toplam)::NUMERIC / NULLIF(SUM(adet), 0), 0),
+           insulin_dozu(SUM(toplam)::NUMERIC / NULLIF(SUM(adet), 0))
+    FROM unnest(p_hasta_id, p_gun, p_toplam, p_adet) AS t(hasta_id, gun, toplam, adet)
+    GROUP BY hasta_id, gun
+    ON CONFLICT (hasta_id, tarih) DO UPDATE
+    SET toplam     = io.toplam + EXCLUDED.toplam,
+        adet       = io.adet + EXCLUDED.adet,
+        ortalama   = COALESCE((io.toplam + EXCLUDED.toplam)::NUMERIC
+                              / NULLIF(io.adet + EXCLUDED.adet, 0), 0),
+        doz_ml     = insulin_dozu((io.toplam + EXCLUDED.toplam)::NUMERIC
+                                  / NULLIF(io.adet + EXCLUDED.adet, 0)),
+        created_at = CURRENT_TIMESTAMP;
+
+    DELETE FROM insulin_onerileri io
+    USING unnest(p_hasta_id, p_gun) AS t(hasta_id, gun)
+    WHERE io.hasta_id = t.hasta_id AND io.tarih = t.gun AND io.adet <= 0;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION insulin_ozeti_tetikleyici() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_hasta  INT[]    := '{}';
+    v_gun    DATE[]   := '{}';
+    v_toplam BIGINT[] := '{}';
+    v_adet   INT[]    := '{}';
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT v_hasta  || array_agg(hasta_id),
+               v_gun    || array_agg(olcum_gunu),
+               v_toplam || array_agg(-seviye::BIGINT),
+               v_adet   || array_agg(-1)
+        INTO v_hasta, v_gun, v_toplam, v_adet
+        FROM eski WHERE olcum_zamani_id IS NOT NULL;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT v_hasta  || array_agg(hasta_id),
+               v_gun    || array_agg(olcum_gunu),
+               v_toplam || array_agg(seviye::BIGINT),
+               v_adet   || array_agg(1)
+        INTO v_hasta, v_gun, v_toplam, v_adet
+        FROM yeni WHERE olcum_zamani_id IS NOT NULL;
+    END IF;
+
+    IF cardinality(v_hasta) > 0 THEN
+        PERFORM insulin_ozeti_ekle(v_hasta, v_gun, v_toplam, v_adet);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Geçiş tablolu tetikleyici tek olaylı olmalı: her olay için ayrı tetikleyici
+DROP TRIGGER IF EXISTS kan_sekeri_olcumleri_insulin_ekle ON kan_sekeri_olcumleri;
+CREATE TRIGGER kan_sekeri_olcumleri_insulin_ekle
+    AFTER INSERT ON kan_sekeri_olcumleri
+    REFERENCING NEW TABLE AS yeni
+    FOR EACH STATEMENT EXECUTE FUNCTION insulin_ozeti_tetikleyici();
+
+DROP TRIGGER IF EXISTS kan_sekeri_olcumleri_insulin_guncelle ON kan_sekeri_olcumleri;
+CREATE TRIGGER kan_sekeri_olcumleri_insulin_guncelle
+    AFTER UPDATE ON kan_sekeri_olcumleri
+    REFERENCING OLD TABLE AS eski NEW TABLE AS yeni
+    FOR EACH STATEMENT EXECUTE FUNCTION insulin_ozeti_tetikleyici();
+
+DROP TRIGGER IF EXISTS kan_sekeri_olcumleri_insulin_sil ON kan_sekeri_olcumleri;
+CREATE TRIGGER kan_sekeri_olcumleri_insulin_sil
+    AFTER DELETE ON kan_sekeri_olcumleri
+    REFERENCING OLD TABLE AS eski
+    FOR EACH STATEMENT EXECUTE FUNCTION insulin_ozeti_tetikleyici();
+
+-- Ortalama artık tetikleyicilerden gelir; burada yalnızca eksik/yetersiz
+-- ölçüm uyarıları yenilenir (adet O(1) okunur)
+CREATE OR REPLACE FUNCTION insulin_gunu_yenile(p_hasta_id INT, p_gun DATE) RETURNS VOID
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_adet    INT;
+    v_gun_str TEXT := TO_CHAR(p_gun, 'DD.MM.YYYY');
+BEGIN
+    SELECT adet INTO v_adet
+    FROM insulin_onerileri
+    WHERE hasta_id = p_hasta_id AND tarih = p_gun;
+    v_adet := COALESCE(v_adet, 0);
+
+    DELETE FROM uyarilar
+    WHERE hasta_id = p_hasta_id AND tarih = p_gun
+      AND uyari_tipi IN ('Eksik Ölçüm', 'Yetersiz Ölçüm');
+
+    IF v_adet < 3 THEN
+        INSERT INTO uyarilar (hasta_id, tarih, uyari_tipi, mesaj) VALUES
+            (p_hasta_id, p_gun, 'Yetersiz Ölçüm',
+             v_gun_str || ' tarihli ölçümler yetersiz! Ortalama güvenilir değil.'),
+            (p_hasta_id, p_gun, 'Eksik Ölçüm',
+             v_gun_str || ' tarihinde ' || (5 - v_adet) || ' ölçüm eksik. Ortalama eksik verilere göre hesaplandı.')
+        ON CONFLICT (hasta_id, tarih, uyari_tipi, mesaj) DO NOTHING;
+    ELSIF v_adet < 5 THEN
+        INSERT INTO uyarilar (hasta_id, tarih, uyari_tipi, mesaj)
+        VALUES (p_hasta_id, p_gun, 'Eksik Ölçüm',
+                'Ölçüm eksik! Ortalama alınırken bu ölçüm hesaba katılmadı.')
+        ON CONFLICT (hasta_id, tarih, uyari_tipi, mesaj) DO NOTHING;
+    END IF;
+END;
+$$;
+
+-- Mevcut ölçümlerden ilk doldurma; ölçümü silinmiş (bayat) günler temizlenir
+LOCK TABLE kan_sekeri_olcumleri IN SHARE MODE;
+
+DELETE FROM insulin_onerileri io
+WHERE NOT EXISTS (
+    SELECT 1 FROM kan_sekeri_olcumleri k
+    WHERE k.hasta_id = io.hasta_id AND k.olcum_gunu = io.tarih
+      AND k.olcum_zamani_id IS NOT NULL
+);
+
+INSERT INTO insulin_onerileri (hasta_id, tarih, toplam, adet, ortalama, doz_ml)
+SELECT hasta_id, olcum_gunu, SUM(seviye), COUNT(*), AVG(seviye), insulin_dozu(AVG(seviye))
+FROM kan_sekeri_olcumleri
+WHERE olcum_zamani_id IS NOT NULL
+GROUP BY hasta_id, olcum_gunu
+ON CONFLICT (hasta_id, tarih) DO UPDATE
+SET toplam   = EXCLUDED.toplam,
+    adet     = EXCLUDED.adet,
+    ortalama = EXCLUDED.ortalama,
+    doz_ml   = EXCLUDED.doz_ml;
@@ -0,0 +1,149 @@
+-- 0011 – Haftalık/aylık kan şekeri özetleri (uzun dönem grafikleri)
+-- Database.get_glucose_series geçmişin tamamı yüzlerce güne yayıldığında
+-- günlük noktalar yerine bu tablodan hafta ya da ay noktaları okur.
+-- Her (hasta, dönem, başlangıç) satırı o dönemin slotlu ölçümlerinin toplamını,
+-- adedini, en düşük/yüksek değerini ve hedef aralıktaki (70–180 mg/dL) ölçüm
+-- adedini tutar; ortalama ve yüzde okurken türetilir.
+-- • Ekleme: geçiş tablosundan dönem başına tek fark (O(1))
+-- • Güncelleme/silme: en düşük/yüksek geri alınamadığından yalnızca etkilenen
+--   dönemler (hasta, olcum_gunu) indeksiyle yeniden hesaplanır
+
+CREATE TABLE IF NOT EXISTS kan_sekeri_donem_ozeti (
+    hasta_id   INT    NOT NULL REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    donem      TEXT   NOT NULL CHECK (donem IN ('hafta', 'ay')),
+    baslangic  DATE   NOT NULL,
+    toplam     BIGINT NOT NULL DEFAULT 0,
+    adet       INT    NOT NULL DEFAULT 0,
+    en_dusuk   INT,
+    en_yuksek  INT,
+    aralikta   INT    NOT NULL DEFAULT 0,
+    PRIMARY KEY (hasta_id, donem, baslangic)
+);
+
+-- Günün ait olduğu haftanın (pazartesi) ya da ayın ilk günü
+CREATE OR REPLACE FUNCTION donem_baslangic(p_donem TEXT, p_gun DATE) RETURNS DATE
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT date_trunc(CASE p_donem WHEN 'hafta' THEN 'week' ELSE 'month' END,
+                      p_gun::TIMESTAMP)::DATE;
+$$;
+
+CREATE OR REPLACE FUNCTION donem_bitis(p_donem TEXT, p_baslangic DATE) RETURNS DATE
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT (p_baslangic + CASE p_donem WHEN 'hafta' THEN INTERVAL '7 days'
+                                       ELSE INTERVAL '1 month' END)::DATE;
+$$;
+
+-- Verilen (hasta, gün) çiftlerinin hafta ve ay satırlarını ölçümlerden yeniden hesaplar
+CREATE OR REPLACE FUNCTION kan_sekeri_donem_yenile(p_hasta_id INT[], p_gun DATE[]) RETURNS VOID
+LANGUAGE sql AS $$
+    WITH kovalar AS (
+        SELECT DISTINCT t.hasta_id, d.donem, donem_baslangic(d.donem, t.gun) AS baslangic
+        FROM unnest(p_hasta_id, p_gun) AS t(hasta_id, gun)
+        CROSS JOIN (VALUES ('hafta'), ('ay')) AS d(donem)
+    ), hesap AS (
+        SELECT kv.hasta_id, kv.donem, kv.baslangic, o.*
+        FROM kovalar kv
+        CROSS JOIN LATERAL (
+            SELECT COALESCE(SUM(k.seviye), 0) AS toplam,
+                   COUNT(*)                   AS adet,
+                   MIN(k.seviye)              AS en_dusuk,
+                   MAX(k.seviye)              AS en_yuksek,
+                   COUNT(*) FILTER (WHERE k.seviye BETWEEN 70 AND 180) AS aralikta
+            FROM kan_sekeri_olcumleri k
+            WHERE k.hasta_id = kv.hasta_id
+              AND k.olcum_gunu >= kv.baslangic
+              AND k.olcum_gunu <  donem_bitis(kv.donem, kv.baslangic)
+              AND k.olcum_zamani_id IS NOT NULL
+        ) o
+    ), silinen AS (
+        DELETE FROM kan_sekeri_donem_ozeti oz
+        USING hesap h
+        WHERE oz.hasta_id = h.hasta_id AND oz.donem = h.donem
+          AND oz.baslangic = h.baslangic AND h.adet = 0
+    )
+    INSERT INTO kan_sekeri_donem_ozeti AS oz
+           (hasta_id, donem, baslangic, toplam, adet, en_dusuk, en_yuksek, aralikta)
+    SELECT hasta_id, donem, baslangic, toplam, adet, en_dusuk, en_yuksek, aralikta
+    FROM hesap
+    WHERE adet > 0
+    ON CONFLICT (hasta_id, donem, baslangic) DO UPDATE
+    SET toplam    = EXCLUDED.toplam,
+        adet      = EXCLUDED.adet,
+        en_dusuk  = EXCLUDED.en_dusuk,
+        en_yuksek = EXCLUDED.en_yuksek,
+        aralikta  = EXCLUDED.aralikta;
+$$;
+
+CREATE OR REPLACE FUNCTION kan_sekeri_donem_tetikleyici() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_hasta INT[];
+    v_gun   DATE[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO kan_sekeri_donem_ozeti AS oz
+               (hasta_id, donem, baslangic, toplam, adet, en_dusuk, en_yuksek, aralikta)
+        SELECT y.hasta_id, d.donem, donem_baslangic(d.donem, y.olcum_gunu),
+               SUM(y.seviye), COUNT(*), MIN(y.seviye), MAX(y.seviye),
+               COUNT(*) FILTER (WHERE y.seviye BETWEEN 70 AND 180)
+        FROM yeni y
+        CROSS JOIN (VALUES ('hafta'), ('ay')) AS d(donem)
+        WHERE y.olcum_zamani_id IS NOT NULL
+        GROUP BY 1, 2, 3
+        ON CONFLICT (hasta_id, donem, baslangic) DO UPDATE
+        SET toplam    = oz.toplam + EXCLUDED.toplam,
+            adet      = oz.adet + EXCLUDED.adet,
+            en_dusuk  = LEAST(oz.en_dusuk, EXCLUDED.en_dusuk),
+            en_yuksek = GREATEST(oz.en_yuksek, EXCLUDED.en_yuksek),
+            aralikta  = oz.aralikta + EXCLUDED.aralikta;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        SELECT array_agg(hasta_id), array_agg(olcum_gunu) INTO v_hasta, v_gun
+        FROM (SELECT DISTINCT hasta_id, olcum_gunu FROM eski) t;
+    ELSE
+        SELECT array_agg(hasta_id), array_agg(olcum_gunu) INTO v_hasta, v_gun
+        FROM (SELECT hasta_id, olcum_gunu FROM eski
+              UNION
+              SELECT hasta_id, olcum_gunu FROM yeni) t;
+    END IF;
+
+    IF v_hasta IS NOT NULL THEN
+        PERFORM kan_sekeri_donem_yenile(v_hasta, v_gun);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS kan_sekeri_olcumleri_donem_ekle ON kan_sekeri_olcumleri;
+CREATE TRIGGER kan_sekeri_olcumleri_donem_ekle
+    AFTER INSERT ON kan_sekeri_olcumleri
+    REFERENCING NEW TABLE AS yeni
+    FOR EACH STATEMENT EXECUTE FUNCTION kan_sekeri_donem_tetikleyici();
+
+DROP TRIGGER IF EXISTS kan_sekeri_olcumleri_donem_guncelle ON kan_sekeri_olcumleri;
+CREATE TRIGGER kan_sekeri_olcumleri_donem_guncelle
+    AFTER UPDATE ON kan_sekeri_olcumleri
+    REFERENCING OLD TABLE AS eski NEW TABLE AS yeni
+    FOR EACH STATEMENT EXECUTE FUNCTION kan_sekeri_donem_tetikleyici();
+
+DROP TRIGGER IF EXISTS kan_sekeri_olcumleri_donem_sil ON kan_sekeri_olcumleri;
+CREATE TRIGGER kan_sekeri_olcumleri_donem_sil
+    AFTER DELETE ON kan_sekeri_olcumleri
+    REFERENCING OLD TABLE AS eski
+    FOR EACH STATEMENT EXECUTE FUNCTION kan_sekeri_donem_tetikleyici();
+
+-- Mevcut ölçümlerden ilk doldurma
+LOCK TABLE kan_sekeri_olcumleri IN SHARE MODE;
+
+INSERT INTO kan_sekeri_donem_ozeti
+       (hasta_id, donem, baslangic, toplam, adet, en_dusuk, en_yuksek, aralikta)
+SELECT k.hasta_id, d.donem, donem_baslangic(d.donem, k.olcum_gunu),
+       SUM(k.seviye), COUNT(*), MIN(k.seviye), MAX(k.seviye),
+       COUNT(*) FILTER (WHERE k.seviye BETWEEN 70 AND 180)
+FROM kan_sekeri_olcumleri k
+CROSS JOIN (VALUES ('hafta'), ('ay')) AS d(donem)
+WHERE k.olcum_zamani_id IS NOT NULL
+GROUP BY 1, 2, 3
+ON CONFLICT (hasta_id, donem, baslangic) DO NOTHING;
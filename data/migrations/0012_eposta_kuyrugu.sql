@@ -0,0 +1,27 @@
+-- 0012 – Kalıcı e-posta kuyruğu (core/email_outbox.py)
+-- Giriş bilgisi e-postaları Tk iş parçacığında SMTP'ye gönderilmek yerine bu
+-- tabloya yazılır; arka plan göndericisi tek SMTP oturumuyla toplu gönderir.
+-- • bekliyor     → sonraki_deneme geldiğinde alınır
+-- • gonderiliyor → bir gönderici aldı; sonraki_deneme kira bitişidir, süreç
+--                  çökerse kira dolunca satır yeniden alınır
+-- • gonderildi   → govde silinir (şifre tabloda kalmaz)
+-- • basarisiz    → kalıcı hata ya da deneme sınırı aşıldı; son_hata'da neden
+
+CREATE TABLE IF NOT EXISTS eposta_kuyrugu (
+    id              SERIAL PRIMARY KEY,
+    alici           TEXT        NOT NULL,
+    konu            TEXT        NOT NULL,
+    govde           TEXT        NOT NULL,
+    durum           TEXT        NOT NULL DEFAULT 'bekliyor'
+                    CHECK (durum IN ('bekliyor', 'gonderiliyor', 'gonderildi', 'basarisiz')),
+    deneme          INT         NOT NULL DEFAULT 0,
+    sonraki_deneme  TIMESTAMPTZ NOT NULL,
+    son_hata        TEXT,
+    olusturma       TIMESTAMPTZ NOT NULL,
+    gonderim        TIMESTAMPTZ
+);
+
+-- Göndericinin "sırası gelenler" sorgusu yalnızca açık satırları tarar
+CREATE INDEX IF NOT EXISTS eposta_kuyrugu_sira_idx
+    ON eposta_kuyrugu (sonraki_deneme, id)
+    WHERE durum IN ('bekliyor', 'gonderiliyor');
@@ -0,0 +1,74 @@
+-- 0013 – Doktor uyarıları için değişen gün işaretleri (0006'nın yerine)
+-- 0006'daki son_olcum_id işareti iki durumu kaçırıyordu:
+-- • SERIAL id'ler commit sırasında değildir: id'si küçük bir ölçüm, büyük id'li
+--   ölçüm işlendikten sonra commit edilirse işaretin altında kalır
+-- • Güncellenen ya da silinen ölçümün günü hiç yeniden değerlendirilmez
+-- Artık kan_sekeri_olcumleri'ne her yazma, ölçümün (hasta, gün) çiftini aynı
+-- işlemde doktor_uyari_gunleri'ne işler. generate_all_doctor_alerts bu satırları
+-- DELETE … RETURNING ile tüketir; işaret ancak ölçümle birlikte commit edildiği
+-- için görünür olur. ON CONFLICT DO UPDATE satırı kilitler: tüketen işlem, aynı
+-- günü işaretleyen açık bir işlemin commit'ini bekler ve ölçümü görür.
+
+CREATE TABLE IF NOT EXISTS doktor_uyari_gunleri (
+    hasta_id  INT         NOT NULL REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    gun       DATE        NOT NULL,
+    degisti   TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (hasta_id, gun)
+);
+
+CREATE OR REPLACE FUNCTION doktor_uyari_gun_tetikleyici() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO doktor_uyari_gunleri AS g (hasta_id, gun)
+        SELECT DISTINCT hasta_id, olcum_gunu FROM yeni
+        ORDER BY 1, 2                                   -- eşzamanlı yazıcılar aynı sırayla kilitlesin
+        ON CONFLICT (hasta_id, gun) DO UPDATE SET degisti = EXCLUDED.degisti;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO doktor_uyari_gunleri AS g (hasta_id, gun)
+        SELECT DISTINCT hasta_id, olcum_gunu FROM eski
+        ORDER BY 1, 2
+        ON CONFLICT (hasta_id, gun) DO UPDATE SET degisti = EXCLUDED.degisti;
+    ELSE
+        INSERT INTO doktor_uyari_gunleri AS g (hasta_id, gun)
+        SELECT hasta_id, olcum_gunu FROM eski
+        UNION
+        SELECT hasta_id, olcum_gunu FROM yeni
+        ORDER BY 1, 2
+        ON CONFLICT (hasta_id, gun) DO UPDATE SET degisti = EXCLUDED.degisti;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS kan_sekeri_olcumleri_uyari_ekle ON kan_sekeri_olcumleri;
+CREATE TRIGGER kan_sekeri_olcumleri_uyari_ekle
+    AFTER INSERT ON kan_sekeri_olcumleri
+    REFERENCING NEW TABLE AS yeni
+    FOR EACH STATEMENT EXECUTE FUNCTION doktor_uyari_gun_tetikleyici();
+
+DROP TRIGGER IF EXISTS kan_sekeri_olcumleri_uyari_guncelle ON kan_sekeri_olcumleri;
+CREATE TRIGGER kan_sekeri_olcumleri_uyari_guncelle
+    AFTER UPDATE ON kan_sekeri_olcumleri
+    REFERENCING OLD TABLE AS eski NEW TABLE AS yeni
+    FOR EACH STATEMENT EXECUTE FUNCTION doktor_uyari_gun_tetikleyici();
+
+DROP TRIGGER IF EXISTS kan_sekeri_olcumleri_uyari_sil ON kan_sekeri_olcumleri;
+CREATE TRIGGER kan_sekeri_olcumleri_uyari_sil
+    AFTER DELETE ON kan_sekeri_olcumleri
+    REFERENCING OLD TABLE AS eski
+    FOR EACH STATEMENT EXECUTE FUNCTION doktor_uyari_gun_tetikleyici();
+
+-- Eski işaretten devir: işaretin üstündeki ölçümlerin günleri ile hiç
+-- işlenmemiş hastaların tüm günleri bekleyen olarak işaretlenir
+LOCK TABLE kan_sekeri_olcumleri IN SHARE MODE;
+
+INSERT INTO doktor_uyari_gunleri (hasta_id, gun)
+SELECT DISTINCT k.hasta_id, k.olcum_gunu
+FROM kan_sekeri_olcumleri k
+LEFT JOIN doktor_uyari_durumu d ON d.hasta_id = k.hasta_id
+WHERE k.id > COALESCE(d.son_olcum_id, 0)
+ON CONFLICT (hasta_id, gun) DO NOTHING;
+
+DROP TABLE IF EXISTS doktor_uyari_durumu;
+DROP INDEX IF EXISTS kan_sekeri_olcumleri_hasta_id_idx;
@@ -0,0 +1,6 @@
+-- 0014 – Kalıcı olarak başarısız olan iletilerin gövdesi de silinir
+-- Giriş e-postası gövdesi hastanın düz metin şifresini içerir. 0012'den beri
+-- gönderilen iletilerin gövdesi boşaltılıyordu; 'basarisiz' iletiler artık
+-- aynı şekilde işleniyor (core/email_outbox.py). Önceden kalanlar burada temizlenir.
+
+UPDATE eposta_kuyrugu SET govde = '' WHERE durum = 'basarisiz' AND govde <> '';
@@ -0,0 +1,279 @@
+-- 0001 – SQLite temel şema
+-- PostgreSQL göçleri 0001–0007'nin SQLite lehçesindeki karşılığı.
+-- Tür adları (DATE, TIME, TIMESTAMPTZ, BOOLEAN, NUMERIC) bilerek PostgreSQL ile
+-- aynı tutuldu: core/db_backends.py bu adlara göre Python türlerine çevirir.
+-- Tarih/saatler yerel saatle ISO metni olarak saklanır.
+-- SERIAL karşılığı AUTOINCREMENT: silinen en büyük id yeniden verilmez
+-- (doktor_uyari_durumu.son_olcum_id artan id'ye dayanır).
+
+-- 1. kullanicilar
+CREATE TABLE IF NOT EXISTS kullanicilar (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tc_no VARCHAR(11) UNIQUE NOT NULL,
+    ad VARCHAR(50) NOT NULL,
+    soyad VARCHAR(50) NOT NULL,
+    sifre BLOB NOT NULL,
+    dogum_tarihi DATE NOT NULL,
+    cinsiyet VARCHAR(10) CHECK (cinsiyet IN ('Erkek', 'Kadın', 'Diğer')),
+    email VARCHAR(100) UNIQUE NOT NULL,
+    rol VARCHAR(10) CHECK (rol IN ('doktor', 'hasta')) NOT NULL,
+    profil_resmi BLOB,
+    profil_resmi_path TEXT,
+    aktif_mi BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMPTZ DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMPTZ DEFAULT (datetime('now', 'localtime'))
+);
+
+-- 2. doktor_hasta
+CREATE TABLE IF NOT EXISTS doktor_hasta (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doktor_id INT NOT NULL REFERENCES kullanicilar(id),
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    UNIQUE (doktor_id, hasta_id)
+);
+
+-- 3. belirtiler
+CREATE TABLE IF NOT EXISTS belirtiler (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ad VARCHAR(50) UNIQUE NOT NULL,
+    aciklama TEXT
+);
+
+-- 4. hasta_belirtileri
+CREATE TABLE IF NOT EXISTS hasta_belirtileri (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    belirti_id INT NOT NULL REFERENCES belirtiler(id),
+    tarih DATE NOT NULL
+);
+
+-- 5. diyet_turleri
+CREATE TABLE IF NOT EXISTS diyet_turleri (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ad VARCHAR(50) UNIQUE NOT NULL,
+    aciklama TEXT
+);
+
+-- 6. egzersiz_turleri
+CREATE TABLE IF NOT EXISTS egzersiz_turleri (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ad VARCHAR(50) UNIQUE NOT NULL,
+    aciklama TEXT
+);
+
+-- 7. diyet_takibi
+CREATE TABLE IF NOT EXISTS diyet_takibi (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hasta_id INTEGER REFERENCES kullanicilar(id),
+    tarih DATE NOT NULL,
+    saat TIME NOT NULL,
+    durum BOOLEAN DEFAULT TRUE,
+    diyet_turu_id INTEGER REFERENCES diyet_turleri(id),
+    hasta_ad TEXT,
+    hasta_tc VARCHAR(11)
+);
+
+-- 8. egzersiz_takibi
+CREATE TABLE IF NOT EXISTS egzersiz_takibi (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hasta_id INTEGER REFERENCES kullanicilar(id),
+    tarih DATE NOT NULL,
+    saat TIME NOT NULL,
+    durum BOOLEAN DEFAULT TRUE,
+    egzersiz_turu_id INTEGER REFERENCES egzersiz_turleri(id),
+    hasta_ad TEXT,
+    hasta_tc VARCHAR(11)
+);
+
+-- 9. olcum_zamanlari
+CREATE TABLE IF NOT EXISTS olcum_zamanlari (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ad VARCHAR(20) UNIQUE NOT NULL,
+    saat_baslangic TIME NOT NULL,
+    saat_bitis TIME NOT NULL
+);
+
+-- 10. kan_sekeri_olcumleri
+-- olcum_gunu: yerel saatle yazılan zaman damgasının gün kısmı
+CREATE TABLE IF NOT EXISTS kan_sekeri_olcumleri (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    olcum_zamani TIMESTAMPTZ NOT NULL,
+    olcum_zamani_id INT REFERENCES olcum_zamanlari(id),
+    seviye INT NOT NULL CHECK (seviye >= 0),
+    olcum_gunu DATE GENERATED ALWAYS AS (substr(olcum_zamani, 1, 10)) STORED
+);
+
+CREATE INDEX IF NOT EXISTS kan_sekeri_olcumleri_hasta_zaman_idx
+    ON kan_sekeri_olcumleri (hasta_id, olcum_zamani);
+
+CREATE UNIQUE INDEX IF NOT EXISTS kan_sekeri_olcumleri_gun_slot_uidx
+    ON kan_sekeri_olcumleri (hasta_id, olcum_gunu, olcum_zamani_id);
+
+CREATE INDEX IF NOT EXISTS kan_sekeri_olcumleri_hasta_id_idx
+    ON kan_sekeri_olcumleri (hasta_id, id);
+
+-- 11. uyarilar
+CREATE TABLE IF NOT EXISTS uyarilar (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    tarih DATE NOT NULL,
+    uyari_tipi VARCHAR(30) NOT NULL,
+    mesaj TEXT NOT NULL,
+    bildirildi BOOLEAN DEFAULT FALSE,
+    gosterildi BOOLEAN DEFAULT FALSE,
+    CONSTRAINT uyarilar_unique UNIQUE (hasta_id, tarih, uyari_tipi, mesaj)
+);
+
+CREATE INDEX IF NOT EXISTS uyarilar_okunmamis_idx
+    ON uyarilar (hasta_id)
+    WHERE bildirildi = FALSE;
+
+-- 12. loglar
+CREATE TABLE IF NOT EXISTS loglar (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kullanici_id INT REFERENCES kullanicilar(id),
+    islem TEXT NOT NULL,
+    zaman TIMESTAMPTZ DEFAULT (datetime('now', 'localtime'))
+);
+
+-- 13. hasta_notlari
+CREATE TABLE IF NOT EXISTS hasta_notlari (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doktor_id INT REFERENCES kullanicilar(id),
+    hasta_id INT REFERENCES kullanicilar(id),
+    tarih TIMESTAMPTZ DEFAULT (datetime('now', 'localtime')),
+    not_metni TEXT NOT NULL
+);
+
+-- 14. insulin_onerileri
+CREATE TABLE IF NOT EXISTS insulin_onerileri (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    tarih DATE NOT NULL,
+    ortalama NUMERIC(5,2) NOT NULL,
+    doz_ml INT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (hasta_id, tarih)
+);
+
+-- 15. oneri_kan_sekeri
+CREATE TABLE IF NOT EXISTS oneri_kan_sekeri (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hasta_id INT NOT NULL REFERENCES kullanicilar(id),
+    hasta_ad TEXT,
+    tarih DATE NOT NULL,
+    saat TIME NOT NULL,
+    seviye NUMERIC(6,2) NOT NULL
+);
+
+-- 16. doktor_uyari_durumu (PostgreSQL 0006)
+CREATE TABLE IF NOT EXISTS doktor_uyari_durumu (
+    hasta_id      INT PRIMARY KEY REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    son_olcum_id  INT NOT NULL DEFAULT 0,
+    guncellendi   TIMESTAMPTZ DEFAULT (datetime('now', 'localtime'))
+);
+
+-- 17. uyum_ozeti (PostgreSQL 0007) – tetikleyicilerle güncel tutulur
+CREATE TABLE IF NOT EXISTS uyum_ozeti (
+    hasta_id            INT PRIMARY KEY REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    diyet_toplam        INT NOT NULL DEFAULT 0,
+    diyet_uygulanan     INT NOT NULL DEFAULT 0,
+    egzersiz_toplam     INT NOT NULL DEFAULT 0,
+    egzersiz_uygulanan  INT NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS diyet_takibi_uyum_ekle
+AFTER INSERT ON diyet_takibi WHEN NEW.hasta_id IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO uyum_ozeti (hasta_id) VALUES (NEW.hasta_id);
+    UPDATE uyum_ozeti
+    SET diyet_toplam = diyet_toplam + 1,
+        diyet_uygulanan = diyet_uygulanan + (NEW.durum = TRUE)
+    WHERE hasta_id = NEW.hasta_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS diyet_takibi_uyum_sil
+AFTER DELETE ON diyet_takibi WHEN OLD.hasta_id IS NOT NULL
+BEGIN
+    UPDATE uyum_ozeti
+    SET diyet_toplam = diyet_toplam - 1,
+        diyet_uygulanan = diyet_uygulanan - (OLD.durum = TRUE)
+    WHERE hasta_id = OLD.hasta_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS diyet_takibi_uyum_guncelle
+AFTER UPDATE OF hasta_id, durum ON diyet_takibi
+BEGIN
+    UPDATE uyum_ozeti
+    SET diyet_toplam = diyet_toplam - 1,
+        diyet_uygulanan = diyet_uygulanan - (OLD.durum = TRUE)
+    WHERE hasta_id = OLD.hasta_id;
+    INSERT OR IGNORE INTO uyum_ozeti (hasta_id)
+    SELECT NEW.hasta_id WHERE NEW.hasta_id IS NOT NULL;
+    UPDATE uyum_ozeti
+    SET diyet_toplam = diyet_toplam + 1,
+        diyet_uygulanan = diyet_uygulanan + (NEW.durum = TRUE)
+    WHERE hasta_id = NEW.hasta_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS egzersiz_takibi_uyum_ekle
+AFTER INSERT ON egzersiz_takibi WHEN NEW.hasta_id IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO uyum_ozeti (hasta_id) VALUES (NEW.hasta_id);
+    UPDATE uyum_ozeti
+    SET egzersiz_toplam = egzersiz_toplam + 1,
+        egzersiz_uygulanan = egzersiz_uygulanan + (NEW.durum = TRUE)
+    WHERE hasta_id = NEW.hasta_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS egzersiz_takibi_uyum_sil
+AFTER DELETE ON egzersiz_takibi WHEN OLD.hasta_id IS NOT NULL
+BEGIN
+    UPDATE uyum_ozeti
+    SET egzersiz_toplam = egzersiz_toplam - 1,
+        egzersiz_uygulanan = egzersiz_uygulanan - (OLD.durum = TRUE)
+    WHERE hasta_id = OLD.hasta_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS egzersiz_takibi_uyum_guncelle
+AFTER UPDATE OF hasta_id, durum ON egzersiz_takibi
+BEGIN
+    UPDATE uyum_ozeti
+    SET egzersiz_toplam = egzersiz_toplam - 1,
+        egzersiz_uygulanan = egzersiz_uygulanan - (OLD.durum = TRUE)
+    WHERE hasta_id = OLD.hasta_id;
+    INSERT OR IGNORE INTO uyum_ozeti (hasta_id)
+    SELECT NEW.hasta_id WHERE NEW.hasta_id IS NOT NULL;
+    UPDATE uyum_ozeti
+    SET egzersiz_toplam = egzersiz_toplam + 1,
+        egzersiz_uygulanan = egzersiz_uygulanan + (NEW.durum = TRUE)
+    WHERE hasta_id = NEW.hasta_id;
+END;
+
+-- Başlangıç verileri (PostgreSQL 0002). Saatler saniyeli yazılır:
+-- ISO metin karşılaştırmasında '08:00:00' > '08:00' olurdu.
+INSERT INTO olcum_zamanlari (ad, saat_baslangic, saat_bitis) VALUES
+('Sabah', '07:00:00', '08:00:00'),
+('Öğle', '12:00:00', '13:00:00'),
+('İkindi', '15:00:00', '16:00:00'),
+('Akşam', '18:00:00', '19:00:00'),
+('Gece', '22:00:00', '23:00:00')
+ON CONFLICT (ad) DO NOTHING;
+
+-- Şifreler SHA-256 özetleri (pgcrypto digest() karşılığı)
+-- Sabit Doktor Kaydı (TC: 99999999999, Şifre: admin123)
+INSERT INTO kullanicilar (tc_no, ad, soyad, sifre, dogum_tarihi, cinsiyet, email, rol)
+VALUES
+('99999999999', 'Admin', 'Doktor', X'240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9', '1980-01-01', 'Erkek', 'admin@example.com', 'doktor'),
+('99999999991', 'Ahmet', 'Yılmaz', X'6d0ac88ba7be50b12895eb7a7c3dc7b2185bbcd452ec69316992df52b9c8ea0f', '1980-05-10', 'Erkek', 'ahmet.yilmaz@example.com', 'doktor')
+ON CONFLICT DO NOTHING;
+
+-- Örnek hastalar
+INSERT INTO kullanicilar (tc_no, ad, soyad, sifre, dogum_tarihi, cinsiyet, email, rol)
+VALUES
+('77777777777', 'Ali', 'Veli', X'b3a8e0e1f9ab1bfe3a36f231f676f78bb30a519d2b21e6c530c0eee8ebb4a5d0', '1990-01-01', 'Erkek', 'ali.veli@example.com', 'hasta'),
+('88888888888', 'Ayşe', 'Demir', X'114bd151f8fb0c58642d2170da4ae7d7c57977260ac2cc8905306cab6b2acabc', '1995-06-12', 'Kadın', 'ayse@example.com', 'hasta'),
+('66666666666', 'Furkan', 'Yıldız', X'13671077b66a29874a2578b5240319092ef2a1043228e433e9b006b5e53e7513', '2000-04-17', 'Erkek', 'furkanyildiz@example.com', 'hasta'),
+('88888888881', 'Yavuz', 'Bilgin', X'01d54579da446ae1e75cda808cd188438834fa6249b151269db0f9123c9ddc61', '2001-02-04', 'Erkek', 'yavuz@example.com', 'hasta')
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,30 @@
+-- 0002 – Anahtar kümesi sayfalaması için kapsayan indeksler (PostgreSQL 0008)
+-- SQLite'ta INCLUDE yok; seçilen kolonlar anahtarın sonuna eklenir.
+-- id (rowid) zaten her indekste bulunur, sıralama için açıkça yazıldı.
+
+CREATE INDEX IF NOT EXISTS kan_sekeri_olcumleri_sayfa_idx
+    ON kan_sekeri_olcumleri (hasta_id, olcum_zamani, id, seviye);
+DROP INDEX IF EXISTS kan_sekeri_olcumleri_hasta_zaman_idx;
+
+CREATE INDEX IF NOT EXISTS diyet_takibi_sayfa_idx
+    ON diyet_takibi (hasta_id, tarih, saat, id, diyet_turu_id, durum);
+CREATE INDEX IF NOT EXISTS egzersiz_takibi_sayfa_idx
+    ON egzersiz_takibi (hasta_id, tarih, saat, id, egzersiz_turu_id, durum);
+
+CREATE INDEX IF NOT EXISTS diyet_takibi_bekleyen_idx
+    ON diyet_takibi (hasta_id, tarih, saat, id, diyet_turu_id)
+    WHERE durum = FALSE;
+CREATE INDEX IF NOT EXISTS egzersiz_takibi_bekleyen_idx
+    ON egzersiz_takibi (hasta_id, tarih, saat, id, egzersiz_turu_id)
+    WHERE durum = FALSE;
+
+CREATE INDEX IF NOT EXISTS uyarilar_doktor_sayfa_idx
+    ON uyarilar (hasta_id, tarih, id, uyari_tipi, bildirildi, mesaj)
+    WHERE uyari_tipi IN (
+        'Acil Uyarı',
+        'Takip Uyarısı',
+        'İzleme Uyarısı',
+        'Acil Müdahale Uyarısı',
+        'Ölçüm Eksik Uyarısı',
+        'Ölçüm Yetersiz Uyarısı'
+    );
@@ -0,0 +1,83 @@
+-- 0003 – Referans tabloları için sürüm sayacı (PostgreSQL 0009)
+-- core/reference_cache.py bu sayaçla önbelleğin bayatladığını anlar.
+
+CREATE TABLE IF NOT EXISTS referans_surumu (
+    tablo  TEXT PRIMARY KEY,
+    surum  INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO referans_surumu (tablo)
+VALUES ('belirtiler'), ('olcum_zamanlari'), ('diyet_turleri'), ('egzersiz_turleri')
+ON CONFLICT (tablo) DO NOTHING;
+
+CREATE TRIGGER IF NOT EXISTS belirtiler_referans_surumu_ekle
+AFTER INSERT ON belirtiler
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'belirtiler';
+END;
+
+CREATE TRIGGER IF NOT EXISTS belirtiler_referans_surumu_guncelle
+AFTER UPDATE ON belirtiler
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'belirtiler';
+END;
+
+CREATE TRIGGER IF NOT EXISTS belirtiler_referans_surumu_sil
+AFTER DELETE ON belirtiler
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'belirtiler';
+END;
+
+CREATE TRIGGER IF NOT EXISTS olcum_zamanlari_referans_surumu_ekle
+AFTER INSERT ON olcum_zamanlari
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'olcum_zamanlari';
+END;
+
+CREATE TRIGGER IF NOT EXISTS olcum_zamanlari_referans_surumu_guncelle
+AFTER UPDATE ON olcum_zamanlari
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'olcum_zamanlari';
+END;
+
+CREATE TRIGGER IF NOT EXISTS olcum_zamanlari_referans_surumu_sil
+AFTER DELETE ON olcum_zamanlari
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'olcum_zamanlari';
+END;
+
+CREATE TRIGGER IF NOT EXISTS diyet_turleri_referans_surumu_ekle
+AFTER INSERT ON diyet_turleri
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'diyet_turleri';
+END;
+
+CREATE TRIGGER IF NOT EXISTS diyet_turleri_referans_surumu_guncelle
+AFTER UPDATE ON diyet_turleri
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'diyet_turleri';
+END;
+
+CREATE TRIGGER IF NOT EXISTS diyet_turleri_referans_surumu_sil
+AFTER DELETE ON diyet_turleri
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'diyet_turleri';
+END;
+
+CREATE TRIGGER IF NOT EXISTS egzersiz_turleri_referans_surumu_ekle
+AFTER INSERT ON egzersiz_turleri
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'egzersiz_turleri';
+END;
+
+CREATE TRIGGER IF NOT EXISTS egzersiz_turleri_referans_surumu_guncelle
+AFTER UPDATE ON egzersiz_turleri
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'egzersiz_turleri';
+END;
+
+CREATE TRIGGER IF NOT EXISTS egzersiz_turleri_referans_surumu_sil
+AFTER DELETE ON egzersiz_turleri
+BEGIN
+    UPDATE referans_surumu SET surum = surum + 1 WHERE tablo = 'egzersiz_turleri';
+END;
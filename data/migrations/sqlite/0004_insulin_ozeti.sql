@@ -0,0 +1,82 @@
+-- 0004 – insulin_onerileri için artımlı günlük toplam/adet (PostgreSQL 0010)
+-- SQLite'ta geçiş tablosu olmadığından tetikleyiciler satır düzeyindedir;
+-- her yazma (hasta, gün) satırını O(1) günceller. Doz eşikleri
+-- Database._dose_for_avg / insulin_dozu ile aynıdır.
+
+ALTER TABLE insulin_onerileri ADD COLUMN toplam INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE insulin_onerileri ADD COLUMN adet INTEGER NOT NULL DEFAULT 0;
+
+CREATE TRIGGER IF NOT EXISTS kan_sekeri_olcumleri_insulin_ekle
+AFTER INSERT ON kan_sekeri_olcumleri WHEN NEW.olcum_zamani_id IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO insulin_onerileri (hasta_id, tarih, ortalama, doz_ml)
+    VALUES (NEW.hasta_id, NEW.olcum_gunu, 0, 0);
+    UPDATE insulin_onerileri
+    SET toplam = toplam + NEW.seviye,
+        adet = adet + 1
+    WHERE hasta_id = NEW.hasta_id AND tarih = NEW.olcum_gunu;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kan_sekeri_olcumleri_insulin_sil
+AFTER DELETE ON kan_sekeri_olcumleri WHEN OLD.olcum_zamani_id IS NOT NULL
+BEGIN
+    UPDATE insulin_onerileri
+    SET toplam = toplam - OLD.seviye,
+        adet = adet - 1
+    WHERE hasta_id = OLD.hasta_id AND tarih = OLD.olcum_gunu;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kan_sekeri_olcumleri_insulin_guncelle
+AFTER UPDATE OF hasta_id, olcum_zamani, olcum_zamani_id, seviye ON kan_sekeri_olcumleri
+BEGIN
+    UPDATE insulin_onerileri
+    SET toplam = toplam - OLD.seviye,
+        adet = adet - 1
+    WHERE hasta_id = OLD.hasta_id AND tarih = OLD.olcum_gunu
+      AND OLD.olcum_zamani_id IS NOT NULL;
+    INSERT OR IGNORE INTO insulin_onerileri (hasta_id, tarih, ortalama, doz_ml)
+    SELECT NEW.hasta_id, NEW.olcum_gunu, 0, 0 WHERE NEW.olcum_zamani_id IS NOT NULL;
+    UPDATE insulin_onerileri
+    SET toplam = toplam + NEW.seviye,
+        adet = adet + 1
+    WHERE hasta_id = NEW.hasta_id AND tarih = NEW.olcum_gunu
+      AND NEW.olcum_zamani_id IS NOT NULL;
+END;
+
+-- Toplam/adet değişince ortalama ve doz türetilir; ölçümü kalmayan gün silinir
+CREATE TRIGGER IF NOT EXISTS insulin_onerileri_turet
+AFTER UPDATE OF toplam, adet ON insulin_onerileri
+BEGIN
+    DELETE FROM insulin_onerileri WHERE id = NEW.id AND NEW.adet <= 0;
+    UPDATE insulin_onerileri
+    SET ortalama = ROUND(CAST(NEW.toplam AS REAL) / NEW.adet, 2),
+        doz_ml = CASE
+            WHEN CAST(NEW.toplam AS REAL) / NEW.adet <= 110 THEN 0
+            WHEN CAST(NEW.toplam AS REAL) / NEW.adet <= 150 THEN 1
+            WHEN CAST(NEW.toplam AS REAL) / NEW.adet <= 200 THEN 2
+            ELSE 3
+        END,
+        created_at = datetime('now', 'localtime')
+    WHERE id = NEW.id AND NEW.adet > 0;
+END;
+
+-- Mevcut ölçümlerden ilk doldurma; ölçümü silinmiş (bayat) günler temizlenir
+DELETE FROM insulin_onerileri
+WHERE NOT EXISTS (
+    SELECT 1 FROM kan_sekeri_olcumleri k
+    WHERE k.hasta_id = insulin_onerileri.hasta_id AND k.olcum_gunu = insulin_onerileri.tarih
+      AND k.olcum_zamani_id IS NOT NULL
+);
+
+INSERT OR IGNORE INTO insulin_onerileri (hasta_id, tarih, ortalama, doz_ml)
+SELECT DISTINCT hasta_id, olcum_gunu, 0, 0
+FROM kan_sekeri_olcumleri
+WHERE olcum_zamani_id IS NOT NULL;
+
+UPDATE insulin_onerileri
+SET (toplam, adet) = (
+    SELECT SUM(seviye), COUNT(*)
+    FROM kan_sekeri_olcumleri k
+    WHERE k.hasta_id = insulin_onerileri.hasta_id AND k.olcum_gunu = insulin_onerileri.tarih
+      AND k.olcum_zamani_id IS NOT NULL
+);
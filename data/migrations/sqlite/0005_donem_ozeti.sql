@@ -0,0 +1,97 @@
+-- 0005 – Haftalık/aylık kan şekeri özetleri (PostgreSQL 0011)
+-- Hafta pazartesi başlar: date(gün, 'weekday 0', '-6 days').
+-- Ekleme artımlıdır; güncelleme/silmede etkilenen dönemler yeniden hesaplanır.
+
+CREATE TABLE IF NOT EXISTS kan_sekeri_donem_ozeti (
+    hasta_id   INT     NOT NULL REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    donem      TEXT    NOT NULL CHECK (donem IN ('hafta', 'ay')),
+    baslangic  DATE    NOT NULL,
+    toplam     INTEGER NOT NULL DEFAULT 0,
+    adet       INTEGER NOT NULL DEFAULT 0,
+    en_dusuk   INT,
+    en_yuksek  INT,
+    aralikta   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (hasta_id, donem, baslangic)
+);
+
+CREATE TRIGGER IF NOT EXISTS kan_sekeri_olcumleri_donem_ekle
+AFTER INSERT ON kan_sekeri_olcumleri WHEN NEW.olcum_zamani_id IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO kan_sekeri_donem_ozeti (hasta_id, donem, baslangic) VALUES
+        (NEW.hasta_id, 'hafta', date(NEW.olcum_gunu, 'weekday 0', '-6 days')),
+        (NEW.hasta_id, 'ay',    date(NEW.olcum_gunu, 'start of month'));
+    UPDATE kan_sekeri_donem_ozeti
+    SET toplam    = toplam + NEW.seviye,
+        adet      = adet + 1,
+        en_dusuk  = CASE WHEN en_dusuk IS NULL OR NEW.seviye < en_dusuk THEN NEW.seviye ELSE en_dusuk END,
+        en_yuksek = CASE WHEN en_yuksek IS NULL OR NEW.seviye > en_yuksek THEN NEW.seviye ELSE en_yuksek END,
+        aralikta  = aralikta + (NEW.seviye BETWEEN 70 AND 180)
+    WHERE hasta_id = NEW.hasta_id
+      AND ((donem = 'hafta' AND baslangic = date(NEW.olcum_gunu, 'weekday 0', '-6 days'))
+        OR (donem = 'ay'    AND baslangic = date(NEW.olcum_gunu, 'start of month')));
+END;
+
+-- Dönem satırını ölçümlerden yeniden hesaplar (toplam/adet değişince 0 adetliler silinir)
+CREATE TRIGGER IF NOT EXISTS kan_sekeri_olcumleri_donem_sil
+AFTER DELETE ON kan_sekeri_olcumleri WHEN OLD.olcum_zamani_id IS NOT NULL
+BEGIN
+    UPDATE kan_sekeri_donem_ozeti
+    SET (toplam, adet, en_dusuk, en_yuksek, aralikta) = (
+        SELECT COALESCE(SUM(k.seviye), 0), COUNT(*), MIN(k.seviye), MAX(k.seviye),
+               COALESCE(SUM(k.seviye BETWEEN 70 AND 180), 0)
+        FROM kan_sekeri_olcumleri k
+        WHERE k.hasta_id = kan_sekeri_donem_ozeti.hasta_id
+          AND k.olcum_gunu >= kan_sekeri_donem_ozeti.baslangic
+          AND k.olcum_gunu < date(kan_sekeri_donem_ozeti.baslangic,
+                                  CASE kan_sekeri_donem_ozeti.donem WHEN 'hafta' THEN '+7 days' ELSE '+1 month' END)
+          AND k.olcum_zamani_id IS NOT NULL
+    )
+    WHERE hasta_id = OLD.hasta_id
+      AND ((donem = 'hafta' AND baslangic = date(OLD.olcum_gunu, 'weekday 0', '-6 days'))
+        OR (donem = 'ay'    AND baslangic = date(OLD.olcum_gunu, 'start of month')));
+    DELETE FROM kan_sekeri_donem_ozeti WHERE hasta_id = OLD.hasta_id AND adet = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kan_sekeri_olcumleri_donem_guncelle
+AFTER UPDATE OF hasta_id, olcum_zamani, olcum_zamani_id, seviye ON kan_sekeri_olcumleri
+BEGIN
+    INSERT OR IGNORE INTO kan_sekeri_donem_ozeti (hasta_id, donem, baslangic)
+    SELECT NEW.hasta_id, 'hafta', date(NEW.olcum_gunu, 'weekday 0', '-6 days')
+    WHERE NEW.olcum_zamani_id IS NOT NULL
+    UNION ALL
+    SELECT NEW.hasta_id, 'ay', date(NEW.olcum_gunu, 'start of month')
+    WHERE NEW.olcum_zamani_id IS NOT NULL;
+    UPDATE kan_sekeri_donem_ozeti
+    SET (toplam, adet, en_dusuk, en_yuksek, aralikta) = (
+        SELECT COALESCE(SUM(k.seviye), 0), COUNT(*), MIN(k.seviye), MAX(k.seviye),
+               COALESCE(SUM(k.seviye BETWEEN 70 AND 180), 0)
+        FROM kan_sekeri_olcumleri k
+        WHERE k.hasta_id = kan_sekeri_donem_ozeti.hasta_id
+          AND k.olcum_gunu >= kan_sekeri_donem_ozeti.baslangic
+          AND k.olcum_gunu < date(kan_sekeri_donem_ozeti.baslangic,
+                                  CASE kan_sekeri_donem_ozeti.donem WHEN 'hafta' THEN '+7 days' ELSE '+1 month' END)
+          AND k.olcum_zamani_id IS NOT NULL
+    )
+    WHERE (hasta_id = OLD.hasta_id
+           AND ((donem = 'hafta' AND baslangic = date(OLD.olcum_gunu, 'weekday 0', '-6 days'))
+             OR (donem = 'ay'    AND baslangic = date(OLD.olcum_gunu, 'start of month'))))
+       OR (hasta_id = NEW.hasta_id
+           AND ((donem = 'hafta' AND baslangic = date(NEW.olcum_gunu, 'weekday 0', '-6 days'))
+             OR (donem = 'ay'    AND baslangic = date(NEW.olcum_gunu, 'start of month'))));
+    DELETE FROM kan_sekeri_donem_ozeti
+    WHERE hasta_id IN (OLD.hasta_id, NEW.hasta_id) AND adet = 0;
+END;
+
+-- Mevcut ölçümlerden ilk doldurma
+INSERT OR IGNORE INTO kan_sekeri_donem_ozeti
+       (hasta_id, donem, baslangic, toplam, adet, en_dusuk, en_yuksek, aralikta)
+SELECT hasta_id, donem, baslangic,
+       SUM(seviye), COUNT(*), MIN(seviye), MAX(seviye), SUM(seviye BETWEEN 70 AND 180)
+FROM (
+    SELECT hasta_id, 'hafta' AS donem, date(olcum_gunu, 'weekday 0', '-6 days') AS baslangic, seviye
+    FROM kan_sekeri_olcumleri WHERE olcum_zamani_id IS NOT NULL
+    UNION ALL
+    SELECT hasta_id, 'ay', date(olcum_gunu, 'start of month'), seviye
+    FROM kan_sekeri_olcumleri WHERE olcum_zamani_id IS NOT NULL
+)
+GROUP BY hasta_id, donem, baslangic;
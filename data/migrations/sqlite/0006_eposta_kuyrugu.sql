@@ -0,0 +1,19 @@
+-- 0006 – Kalıcı e-posta kuyruğu (PostgreSQL 0012)
+
+CREATE TABLE IF NOT EXISTS eposta_kuyrugu (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    alici           TEXT        NOT NULL,
+    konu            TEXT        NOT NULL,
+    govde           TEXT        NOT NULL,
+    durum           TEXT        NOT NULL DEFAULT 'bekliyor'
+                    CHECK (durum IN ('bekliyor', 'gonderiliyor', 'gonderildi', 'basarisiz')),
+    deneme          INT         NOT NULL DEFAULT 0,
+    sonraki_deneme  TIMESTAMPTZ NOT NULL,
+    son_hata        TEXT,
+    olusturma       TIMESTAMPTZ NOT NULL,
+    gonderim        TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS eposta_kuyrugu_sira_idx
+    ON eposta_kuyrugu (sonraki_deneme, id)
+    WHERE durum IN ('bekliyor', 'gonderiliyor');
@@ -0,0 +1,47 @@
+-- 0007 – Doktor uyarıları için değişen gün işaretleri (PostgreSQL 0013)
+-- Satır düzeyinde tetikleyiciler; SQLite tek yazıcılı olduğundan kilit sırası
+-- gerekmez.
+
+CREATE TABLE IF NOT EXISTS doktor_uyari_gunleri (
+    hasta_id  INT         NOT NULL REFERENCES kullanicilar(id) ON DELETE CASCADE,
+    gun       DATE        NOT NULL,
+    degisti   TIMESTAMPTZ NOT NULL DEFAULT (datetime('now', 'localtime')),
+    PRIMARY KEY (hasta_id, gun)
+);
+
+CREATE TRIGGER IF NOT EXISTS kan_sekeri_olcumleri_uyari_ekle
+AFTER INSERT ON kan_sekeri_olcumleri
+BEGIN
+    INSERT INTO doktor_uyari_gunleri (hasta_id, gun)
+    VALUES (NEW.hasta_id, NEW.olcum_gunu)
+    ON CONFLICT (hasta_id, gun) DO UPDATE SET degisti = excluded.degisti;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kan_sekeri_olcumleri_uyari_sil
+AFTER DELETE ON kan_sekeri_olcumleri
+BEGIN
+    INSERT INTO doktor_uyari_gunleri (hasta_id, gun)
+    VALUES (OLD.hasta_id, OLD.olcum_gunu)
+    ON CONFLICT (hasta_id, gun) DO UPDATE SET degisti = excluded.degisti;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kan_sekeri_olcumleri_uyari_guncelle
+AFTER UPDATE ON kan_sekeri_olcumleri
+BEGIN
+    INSERT INTO doktor_uyari_gunleri (hasta_id, gun)
+    VALUES (OLD.hasta_id, OLD.olcum_gunu)
+    ON CONFLICT (hasta_id, gun) DO UPDATE SET degisti = excluded.degisti;
+    INSERT INTO doktor_uyari_gunleri (hasta_id, gun)
+    VALUES (NEW.hasta_id, NEW.olcum_gunu)
+    ON CONFLICT (hasta_id, gun) DO UPDATE SET degisti = excluded.degisti;
+END;
+
+INSERT INTO doktor_uyari_gunleri (hasta_id, gun)
+SELECT DISTINCT k.hasta_id, k.olcum_gunu
+FROM kan_sekeri_olcumleri k
+LEFT JOIN doktor_uyari_durumu d ON d.hasta_id = k.hasta_id
+WHERE k.id > COALESCE(d.son_olcum_id, 0)
+ON CONFLICT (hasta_id, gun) DO NOTHING;
+
+DROP TABLE IF EXISTS doktor_uyari_durumu;
+DROP INDEX IF EXISTS kan_sekeri_olcumleri_hasta_id_idx;
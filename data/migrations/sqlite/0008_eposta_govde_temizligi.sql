@@ -0,0 +1,3 @@
+-- 0008 – Kalıcı olarak başarısız olan iletilerin gövdesi de silinir (PostgreSQL 0014)
+
+UPDATE eposta_kuyrugu SET govde = '' WHERE durum = 'basarisiz' AND govde <> '';
@@ -2,8 +2,6 @@
 # ────────────────────────────────────────────────────────────────────────────────
 import tkinter as tk
 from tkinter import ttk, messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
 
 from core.database import Database
 from core.user_management import add_patient, delete_patient
@@ -15,6 +13,11 @@ from gui.patient_window import show_progress
 from core.graph_utils import show_combined_graph
 from core.tum_hasta_bilgileri_window import open_tum_hasta_bilgileri_window
 from gui.kisi_bilgisi_window import open_kisi_bilgisi_window
+from core.ui_stream import KeysetPager
+from core.async_db import run_async
+from core.figure_manager import figure_manager
+from core.warmup import schedule_warmup
+from core.email_outbox import email_outbox
 from gui.profil_window import upload_profile_picture
 # ────────────────────────────────────────────────────────────────────────────────
 
@@ -152,7 +155,7 @@ def run_doctor(info: dict) -> None:
             from core.email_utils import send_login_email
             try:
                 send_login_email(email, password, tc)
-                messagebox.showinfo("Bilgi", "Hasta eklendi ve şifre e-posta adresine gönderildi.")
+                messagebox.showinfo("Bilgi", "Hasta eklendi; giriş bilgileri e-posta ile gönderilecek.")
             except Exception as e:
                 messagebox.showwarning("E-posta Hatası",
                                        f"Hasta kaydedildi ancak e-posta gönderilemedi.\n{e}")
@@ -192,24 +195,41 @@ def run_doctor(info: dict) -> None:
             messagebox.showwarning("Uyarı", "Önce bir hasta seçin!")
             return
         hasta_id = int(sel[0])
-        db = Database(); db.connect()
-        db.generate_all_doctor_alerts(hasta_id)
-        db.check_first_time_measurement_alert(hasta_id)
-        alerts = db.get_doctor_alerts(hasta_id)
-        db.close()
 
         alert_win = tk.Toplevel(); alert_win.title("Uyarılar"); alert_win.geometry("600x400")
         tk.Label(alert_win, text="Hastaya Ait Doktor Uyarıları",
                  font=("Arial", 14)).pack(pady=10)
-        txt = tk.Text(alert_win, width=80, height=20, wrap="word")
+        more_btn = tk.Button(alert_win, text="Daha Fazla")
+        more_btn.pack(side="bottom", pady=4)
+        txt = tk.Text(alert_win, width=80, height=20, wrap="word", state="disabled")
         txt.pack(padx=10, pady=10, fill="both", expand=True)
-        if not alerts:
-            txt.insert("1.0", "Bu hastaya ait kayıtlı uyarı bulunamadı.")
-        else:
-            for _, tarih, tipi, mesaj, _ in alerts:
+
+        def add_alerts(rows):
+            txt.config(state="normal")
+            for _, tarih, tipi, mesaj, _ in rows:
                 tarih_str = tarih.strftime("%d.%m.%Y") if not isinstance(tarih, str) else tarih
                 txt.insert("end", f"{tarih_str} | {tipi}: {mesaj}\n")
-        txt.config(state="disabled")
+            txt.config(state="disabled")
+
+        def no_alerts() -> None:
+            txt.config(state="normal")
+            txt.insert("1.0", "Bu hastaya ait kayıtlı uyarı bulunamadı.")
+            txt.config(state="disabled")
+
+        # "Daha Fazla" sayfaları arka plandaki yürütücüde istenir; pencere bağlantı tutmaz
+        more_btn.config(state="disabled")
+        pager = KeysetPager(
+            lambda db_, after, limit: db_.page_doctor_alerts(hasta_id, after, limit),
+            add_alerts, key=lambda r: (r[1], r[0]), button=more_btn,
+            widget=alert_win, on_empty=no_alerts)
+
+        def generate(db_: Database) -> None:
+            db_.generate_all_doctor_alerts(hasta_id)
+            db_.check_first_time_measurement_alert(hasta_id)
+
+        # Uyarı üretimi uzun sürebilir; panel donmasın diye arka planda çalışır
+        run_async(alert_win, generate, on_success=lambda _: pager.reset(),
+                  loading_text="Uyarılar hesaplanıyor…")
 
     def open_recommendation() -> None:
         sel = tree.selection()
@@ -236,32 +256,24 @@ def run_doctor(info: dict) -> None:
         show_progress(int(sel[0]))
 
     def show_patient_adherence_graph(hasta_id: int):
-        db = Database(); db.connect()
-        total_diet = db.fetch_one("SELECT COUNT(*) FROM diyet_takibi WHERE hasta_id=%s",
-                                  (hasta_id,))[0]
-        done_diet  = db.fetch_one(
-            "SELECT COUNT(*) FROM diyet_takibi WHERE hasta_id=%s AND durum=TRUE",
-            (hasta_id,))[0]
-        total_ex   = db.fetch_one("SELECT COUNT(*) FROM egzersiz_takibi WHERE hasta_id=%s",
-                                  (hasta_id,))[0]
-        done_ex    = db.fetch_one(
-            "SELECT COUNT(*) FROM egzersiz_takibi WHERE hasta_id=%s AND durum=TRUE",
-            (hasta_id,))[0]
-        db.close()
-
-        diet_percent = round((done_diet / total_diet) * 100, 2) if total_diet else 0
-        ex_percent   = round((done_ex   / total_ex)   * 100, 2) if total_ex   else 0
-
         win = tk.Toplevel(); win.title("Uygulama Oranı"); win.geometry("600x400")
-        fig, ax = plt.subplots(figsize=(6, 4))
-        ax.bar(["Diyet", "Egzersiz"], [diet_percent, ex_percent],
-               color=["#4CAF50", "#2196F3"])
-        ax.set_ylim(0, 100); ax.set_ylabel("Uygulanma Oranı (%)")
-        ax.set_title("Diyet ve Egzersiz Önerilerinin Uygulanma Oranı")
-        for i, val in enumerate([diet_percent, ex_percent]):
-            ax.text(i, val + 2, f"{val}%", ha="center", fontweight="bold")
-        fig.tight_layout()
-        FigureCanvasTkAgg(fig, master=win).draw()
+
+        def draw(oranlar) -> None:
+            diet_percent, ex_percent = oranlar
+            # Figür pencereyle birlikte bırakılır (pyplot kayıt defterine girmez)
+            panel = figure_manager.panel(win, "uyum", figsize=(6, 4), fill=tk.BOTH, expand=True)
+            ax = panel.ax
+            ax.bar(["Diyet", "Egzersiz"], [diet_percent, ex_percent],
+                   color=["#4CAF50", "#2196F3"])
+            ax.set_ylim(0, 100); ax.set_ylabel("Uygulanma Oranı (%)")
+            ax.set_title("Diyet ve Egzersiz Önerilerinin Uygulanma Oranı")
+            for i, val in enumerate([diet_percent, ex_percent]):
+                ax.text(i, val + 2, f"{val}%", ha="center", fontweight="bold")
+            panel.figure.tight_layout()
+            panel.redraw()
+
+        run_async(win, lambda db: db.get_recommendation_progress(hasta_id, ndigits=2),
+                  on_success=draw)
 
     def view_adherence_graph():
         sel = tree.selection()
@@ -325,6 +337,8 @@ def run_doctor(info: dict) -> None:
               font=("Arial", 10, "bold"), command=lambda: back_to_login(root)).grid(
         row=3, column=1, padx=6, pady=(10, 0), sticky="ew")
 
+    schedule_warmup(root)     # grafik modülleri ilk tıklamadan önce arka planda yüklenir
+    email_outbox.start()      # önceki oturumdan kalan e-postalar arka planda gönderilir
     root.mainloop()
 
 
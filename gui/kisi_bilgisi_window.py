@@ -1,7 +1,7 @@
 import tkinter as tk
-from PIL import Image, ImageTk
 import os
 from core.database import Database
+from core.thumbnail_cache import thumbnail_cache
 from gui.profil_window import upload_profile_picture
 
 def open_kisi_bilgisi_window(user_id: int):
@@ -30,14 +30,15 @@ def open_kisi_bilgisi_window(user_id: int):
     img_label = tk.Label(outer, bg="#F8F9FA")
     img_label.pack(pady=(30, 10))
 
+    def fotograf_yok() -> None:
+        img_label.config(text="Profil fotoğrafı yok", fg="gray", font=("Segoe UI", 9, "italic"))
+
     if img_path and os.path.exists(img_path):
-        img = Image.open(img_path)
-        img = img.resize((140, 140))
-        photo = ImageTk.PhotoImage(img)
-        img_label.config(image=photo)
-        img_label.image = photo
+        # Önbellekte yoksa görsel arka planda küçültülür; o sırada yer tutucu görünür
+        img_label.config(text="Yükleniyor…", fg="gray", font=("Segoe UI", 9, "italic"))
+        thumbnail_cache.load_into(img_label, img_path, 140, on_missing=fotograf_yok)
     else:
-        img_label.config(text="Profil fotoğrafı yok", fg="gray", font=("Segoe UI", 9, "italic"))
+        fotograf_yok()
 
     # Kart görünümünde bilgileri tut
     card = tk.Frame(outer, bg="white", bd=1, relief="solid")
@@ -58,7 +59,7 @@ def open_kisi_bilgisi_window(user_id: int):
     tk.Button(
         outer,
         text="Profil Fotoğrafı Yükle",
-        command=lambda: upload_profile_picture(user_id, img_label),
+        command=lambda: upload_profile_picture(user_id, img_label, 140),
         bg="#2196F3", fg="white",
         font=("Segoe UI", 10, "bold"),
         activebackground="#1976D2",
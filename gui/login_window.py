@@ -1,8 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
 from core.database import Database
-from gui.doctor_window import run_doctor
-from gui.patient_window import run_patient
 
 def run_login(expected_role: str):
     db = Database()
@@ -24,9 +22,12 @@ def run_login(expected_role: str):
             return
 
         root.destroy()
+        # Paneller yalnızca giriş başarılı olunca yüklenir (açılış süresi)
         if info["rol"] == "doktor":
+            from gui.doctor_window import run_doctor
             run_doctor(info)
         else:
+            from gui.patient_window import run_patient
             run_patient(info)
 
     # ---------- UI ----------
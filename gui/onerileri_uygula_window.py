@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import date
 from core.database import Database
+from core.ui_stream import KeysetPager
 
 def open_pending_recommendations(hasta_id: int):
     win = tk.Toplevel()
@@ -19,15 +20,13 @@ def open_pending_recommendations(hasta_id: int):
         diet_tree.column(col, width=200, anchor="center")
     diet_tree.pack()
 
-    diyetler = db.fetch_all("""
-        SELECT dt.id, dt.tarih, dtr.ad
-        FROM diyet_takibi dt
-        JOIN diyet_turleri dtr ON dt.diyet_turu_id = dtr.id
-        WHERE dt.hasta_id = %s AND dt.durum = FALSE
-        ORDER BY dt.tarih DESC;
-    """, (hasta_id,))
-    for id_, tarih, ad in diyetler:
-        diet_tree.insert("", "end", iid=f"diyet_{id_}", values=(tarih.strftime("%d.%m.%Y"), ad))
+    diet_btn = tk.Button(win, text="Daha Fazla")
+    diet_btn.pack(pady=2)
+    KeysetPager(
+        lambda after, limit: db.page_diet_history(hasta_id, after, limit, pending_only=True),
+        lambda rows: [diet_tree.insert("", "end", iid=f"diyet_{id_}", values=(tarih.strftime("%d.%m.%Y"), ad))
+                      for id_, tarih, _, ad, _ in rows],
+        key=lambda r: (r[1], r[2], r[0]), button=diet_btn, page_size=50).reset()
 
     # Egzersiz
     tk.Label(win, text="Uygulanmamış Egzersizler", font=("Arial", 12, "bold")).pack(pady=6)
@@ -37,62 +36,71 @@ def open_pending_recommendations(hasta_id: int):
         ex_tree.column(col, width=200, anchor="center")
     ex_tree.pack()
 
-    egzersizler = db.fetch_all("""
-        SELECT et.id, et.tarih, etr.ad
-        FROM egzersiz_takibi et
-        JOIN egzersiz_turleri etr ON et.egzersiz_turu_id = etr.id
-        WHERE et.hasta_id = %s AND et.durum = FALSE
-        ORDER BY et.tarih DESC;
-    """, (hasta_id,))
-    for id_, tarih, ad in egzersizler:
-        ex_tree.insert("", "end", iid=f"egzersiz_{id_}", values=(tarih.strftime("%d.%m.%Y"), ad))
+    ex_btn = tk.Button(win, text="Daha Fazla")
+    ex_btn.pack(pady=2)
+    KeysetPager(
+        lambda after, limit: db.page_exercise_history(hasta_id, after, limit, pending_only=True),
+        lambda rows: [ex_tree.insert("", "end", iid=f"egzersiz_{id_}", values=(tarih.strftime("%d.%m.%Y"), ad))
+                      for id_, tarih, _, ad, _ in rows],
+        key=lambda r: (r[1], r[2], r[0]), button=ex_btn, page_size=50).reset()
 
     def isaretle():
         db = Database(); db.connect()
         selected_diyet = diet_tree.selection()
         selected_egz = ex_tree.selection()
-        count = 0
+        isaretlenen = []   # commit sonrası tablodan silinecek satırlar
+        atlanan = []       # aynı gün zaten bildirilmiş öneriler
 
-        for iid in selected_diyet:
-            id_ = int(iid.split("_")[1])
-            tarih_row = db.fetch_one("SELECT tarih FROM diyet_takibi WHERE id = %s", (id_,))
-            if tarih_row:
-                tarih = tarih_row[0]
-                # Aynı gün için zaten yapılmışsa atla
-                var_mi = db.fetch_one("""
-                    SELECT 1 FROM diyet_takibi
-                    WHERE hasta_id = %s AND tarih = %s AND durum = TRUE
-                """, (hasta_id, tarih))
-                if var_mi:
-                    messagebox.showinfo("Bilgi", f"{tarih.strftime('%d.%m.%Y')} için zaten diyet bildirimi yapılmış.")
-                    continue
+        try:
+            with db.transaction():
+                for iid in selected_diyet:
+                    id_ = int(iid.split("_")[1])
+                    tarih_row = db.fetch_one("SELECT tarih FROM diyet_takibi WHERE id = %s", (id_,))
+                    if tarih_row:
+                        tarih = tarih_row[0]
+                        # Aynı gün için zaten yapılmışsa atla
+                        var_mi = db.fetch_one("""
+                            SELECT 1 FROM diyet_takibi
+                            WHERE hasta_id = %s AND tarih = %s AND durum = TRUE
+                        """, (hasta_id, tarih))
+                        if var_mi:
+                            atlanan.append(f"{tarih.strftime('%d.%m.%Y')} için zaten diyet bildirimi yapılmış.")
+                            continue
 
-            db.execute_query("UPDATE diyet_takibi SET durum = TRUE WHERE id = %s", (id_,))
-            diet_tree.delete(iid)
-            count += 1
+                    db.execute_query("UPDATE diyet_takibi SET durum = TRUE WHERE id = %s", (id_,))
+                    isaretlenen.append((diet_tree, iid))
 
-        for iid in selected_egz:
-            id_ = int(iid.split("_")[1])
-            tarih_row = db.fetch_one("SELECT tarih FROM egzersiz_takibi WHERE id = %s", (id_,))
-            if tarih_row:
-                tarih = tarih_row[0]
-                var_mi = db.fetch_one("""
-                    SELECT 1 FROM egzersiz_takibi
-                    WHERE hasta_id = %s AND tarih = %s AND durum = TRUE
-                """, (hasta_id, tarih))
-                if var_mi:
-                    messagebox.showinfo("Bilgi", f"{tarih.strftime('%d.%m.%Y')} için zaten egzersiz bildirimi yapılmış.")
-                    continue
+                for iid in selected_egz:
+                    id_ = int(iid.split("_")[1])
+                    tarih_row = db.fetch_one("SELECT tarih FROM egzersiz_takibi WHERE id = %s", (id_,))
+                    if tarih_row:
+                        tarih = tarih_row[0]
+                        var_mi = db.fetch_one("""
+                            SELECT 1 FROM egzersiz_takibi
+                            WHERE hasta_id = %s AND tarih = %s AND durum = TRUE
+                        """, (hasta_id, tarih))
+                        if var_mi:
+                            atlanan.append(f"{tarih.strftime('%d.%m.%Y')} için zaten egzersiz bildirimi yapılmış.")
+                            continue
 
-            db.execute_query("UPDATE egzersiz_takibi SET durum = TRUE WHERE id = %s", (id_,))
-            ex_tree.delete(iid)
-            count += 1
+                    db.execute_query("UPDATE egzersiz_takibi SET durum = TRUE WHERE id = %s", (id_,))
+                    isaretlenen.append((ex_tree, iid))
+        except Exception as e:
+            messagebox.showerror("Hata", f"Öneriler kaydedilemedi:\n{e}")
+            return
+        finally:
+            db.close()
 
-        db.close()
+        for tree, iid in isaretlenen:
+            tree.delete(iid)
+        if atlanan:
+            messagebox.showinfo("Bilgi", "\n".join(atlanan))
 
+        count = len(isaretlenen)
         if count > 0:
             messagebox.showinfo("Başarılı", f"{count} öneri 'uygulandı' olarak işaretlendi.")
 
     tk.Button(win, text="Seçilenleri Günlük Uygulandı Olarak Kaydet", command=isaretle, bg="green", fg="white").pack(pady=12)
 
-    db.close()
+    # Sayfalayıcılar "Daha Fazla" için bağlantıyı pencere açık kaldıkça kullanır
+    win.protocol("WM_DELETE_WINDOW", lambda: (db.close(), win.destroy()))
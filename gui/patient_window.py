@@ -6,15 +6,16 @@ action's UI on the right-hand side of the same screen instead of separate
 pop-up windows. Pop‑up açan eski modüller de, geçici bir Toplevel yamasıyla
 gömülü olarak aynı panelde gösterilir.
 """
-import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
 from core.database import Database
+from core.async_db import run_async
+from core.figure_manager import figure_manager
+from core.warmup import schedule_warmup
+from core.thumbnail_cache import thumbnail_cache
+from core.graph_utils import DONEM_ADLARI, donem_etiketi
 from core.blood_sugar_ui import show  # Ölçüm‑liste & insülin penceresi
 from gui.onerileri_uygula_window import open_pending_recommendations
 from gui.kisi_bilgisi_window import open_kisi_bilgisi_window
@@ -129,50 +130,29 @@ def add_blood_sugar_ui(hasta_id: int, parent: tk.Widget | None = None) -> None:
             except ValueError:
                 raise ValueError("Tarih/Saat biçimi GG.AA.YYYY ve HH:MM olmalıdır.")
 
-            db = Database();
+            # Slot tespiti, mükerrer kontrolü, uyarılar ve günlük ortalama
+            # veritabanında tek çağrıda yapılır (kan_sekeri_ekle)
+            db = Database()
             db.connect()
+            try:
+                sonuc, _, zaman_id = db.ingest_blood_sugar(hasta_id, olcum_dt, seviye)
+            finally:
+                db.close()
 
-            zaman_kayitlari = db.fetch_all(
-                "SELECT id, saat_baslangic, saat_bitis FROM olcum_zamanlari"
-            )
-            zaman_id: int | None = None
-
-            for z_id, bas_str, bit_str in zaman_kayitlari:
-                bas = datetime.strptime(str(bas_str), "%H:%M:%S").time()
-                bit = datetime.strptime(str(bit_str), "%H:%M:%S").time()
-                if bas <= olcum_dt.time() <= bit:
-                    zaman_id = z_id
-                    break
-
-            # Aynı gün aynı zaman aralığı kontrolü
-            if zaman_id is not None:
-                var_mi = db.fetch_one(
-                    """
-                    SELECT id FROM kan_sekeri_olcumleri
-                    WHERE hasta_id = %s AND DATE(olcum_zamani) = %s AND olcum_zamani_id = %s
-                    """,
-                    (hasta_id, olcum_dt.date(), zaman_id),
+            if sonuc == "mukerrer":
+                messagebox.showerror(
+                    "Hata", "Bu zaman aralığına ait bir ölçüm zaten mevcut.", parent=container
                 )
-                if var_mi:
-                    db.close()
-                    messagebox.showerror(
-                        "Hata", "Bu zaman aralığına ait bir ölçüm zaten mevcut.", parent=container
-                    )
-                    return
+                return
 
             if zaman_id is None:
                 messagebox.showwarning(
                     "Uyarı",
                     "Girilen saat tanımlı aralıkların dışında.\n"
-                    "Ölçüm kaydedilecek fakat ortalama hesaplamasına katılmayacak.",
+                    "Ölçüm kaydedildi fakat ortalama hesaplamasına katılmayacak.",
                     parent=container,
                 )
 
-            # Veritabanına ekle
-            db.add_blood_sugar_log(hasta_id, olcum_dt, zaman_id, seviye)
-            db.check_insulin_data_alert(hasta_id, olcum_dt.date())
-            db.close()
-
             messagebox.showinfo("Başarılı", "Kan şekeri kaydedildi.", parent=container)
 
             # Pop‑up ise pencereyi kapat; gömülü ise sadece alanı temizle
@@ -213,22 +193,19 @@ def run_patient(info: dict) -> None:
     profile_frame = ttk.Frame(left)
     profile_frame.pack(pady=(0, 20))
 
-    # Profil resmi (varsayılan ya da yüklenmişse)
-    result = Database().fetch_one("SELECT profil_resmi_path FROM kullanicilar WHERE id = %s", (info["id"],))
-    img_path = result[0] if result else None
-
-    if img_path and os.path.exists(img_path):
-        from PIL import Image, ImageTk
-        img = Image.open(img_path).resize((80, 80))
-        photo = ImageTk.PhotoImage(img)
-    else:
-        # Boş avatar simgesi
-        photo = tk.PhotoImage(width=80, height=80)
-
+    # Profil resmi: boş avatar hemen çizilir; yol arka planda okunur, küçük
+    # görsel önbellekte yoksa iş parçacığında üretilip yerleştirilir
+    photo = tk.PhotoImage(width=80, height=80)
     img_label = tk.Label(profile_frame, image=photo)
     img_label.image = photo
     img_label.pack()
 
+    run_async(img_label,
+              lambda db: db.fetch_one("SELECT profil_resmi_path FROM kullanicilar WHERE id = %s",
+                                      (info["id"],)),
+              on_success=lambda row: thumbnail_cache.load_into(img_label, row[0] if row else None, 80),
+              loading_text=None)
+
     # Ad Soyad
     tk.Label(profile_frame, text=f"{info['ad']} {info['soyad']}", font=("Segoe UI", 10, "bold")).pack(pady=(6, 0))
 
@@ -278,9 +255,9 @@ def run_patient(info: dict) -> None:
             tk.Toplevel = orig_toplevel  # Patch'i geri al
 
     # Sağ panel kullanan fonksiyonlar
-    def show_in_right(builder):
-        for child in right.winfo_children():
-            child.destroy()
+    def show_in_right(builder, figur=None):
+        # Aynı grafik yeniden açılırsa tuvali korunur, yalnızca verisi güncellenir
+        figure_manager.clear(right, keep=figur)
         builder()
 
     # Ana işlemler & komutlar
@@ -291,8 +268,8 @@ def run_patient(info: dict) -> None:
             "Diyet / Egzersiz Önerilerini Uygula",
             lambda: embed_external(lambda: open_pending_recommendations(info["id"])),
         ),
-        ("Öneri Uygulama Durumu", lambda: show_in_right(lambda: show_progress(info["id"], right))),
-        ("Kan Şekeri Grafiğini Göster", lambda: show_in_right(lambda: show_blood_sugar_graph(info["id"], right))),
+        ("Öneri Uygulama Durumu", lambda: show_in_right(lambda: show_progress(info["id"], right), "ilerleme")),
+        ("Kan Şekeri Grafiğini Göster", lambda: show_in_right(lambda: show_blood_sugar_graph(info["id"], right), "kan_sekeri")),
         ("Hasta Bilgisi", lambda: embed_external(lambda: open_kisi_bilgisi_window(info["id"]))),
     ]
 
@@ -322,6 +299,7 @@ def run_patient(info: dict) -> None:
 
     ttk.Button(left, text="Çıkış", command=root.destroy).pack(pady=(14, 0))
 
+    schedule_warmup(root)     # grafik modülleri ilk tıklamadan önce arka planda yüklenir
     root.mainloop()
 
 
@@ -330,11 +308,6 @@ def run_patient(info: dict) -> None:
 # ---------------------------------------------------------------------------
 
 def show_progress(hasta_id: int, parent: tk.Widget | None = None):
-    db = Database();
-    db.connect()
-    diyet_oran, egzersiz_oran = db.get_recommendation_progress(hasta_id)
-    db.close()
-
     if parent is None:
         win = tk.Toplevel()
         win.title("Öneri Uygulama Yüzdesi")
@@ -342,37 +315,45 @@ def show_progress(hasta_id: int, parent: tk.Widget | None = None):
         create_style()
         container = win
     else:
-        for child in parent.winfo_children():
-            child.destroy()
+        figure_manager.clear(parent, keep="ilerleme")
         container = parent
 
-    fig, ax = plt.subplots(figsize=(5, 3.5))
-    kategoriler = ["Diyet", "Egzersiz"]
+    # Oranlar arka planda okunur; bu sırada panelde "Yükleniyor…" görünür
+    run_async(container, lambda db: db.get_recommendation_progress(hasta_id),
+              on_success=lambda oranlar: _draw_progress(container, *oranlar))
+
+
+def _draw_progress(container: tk.Widget, diyet_oran, egzersiz_oran) -> None:
+    panel = figure_manager.panel(container, "ilerleme", figsize=(5, 3.5),
+                                 fill=tk.BOTH, expand=True, padx=10, pady=10)
+    ax = panel.ax
     oranlar = [diyet_oran, egzersiz_oran]
-    colors = ["#4CAF50", "#2196F3"]
 
-    bars = ax.bar(kategoriler, oranlar, color=colors)
-    ax.set_ylim(0, 100)
-    ax.set_ylabel("Uygulama Oranı (%)")
-    ax.set_title("Diyet ve Egzersiz Uygulama Yüzdesi")
+    if "cubuklar" not in panel.artists:
+        kategoriler = ["Diyet", "Egzersiz"]
+        colors = ["#4CAF50", "#2196F3"]
+
+        bars = ax.bar(kategoriler, oranlar, color=colors)
+        ax.set_ylim(0, 100)
+        ax.set_ylabel("Uygulama Oranı (%)")
+        ax.set_title("Diyet ve Egzersiz Uygulama Yüzdesi")
 
-    for bar, oran in zip(bars, oranlar):
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width() / 2.0,
-            height + 3,
-            f"{oran:.0f}%",
-            ha="center",
-            va="bottom",
-            fontsize=10,
-        )
+        yazilar = [
+            ax.text(bar.get_x() + bar.get_width() / 2.0, 0, "",
+                    ha="center", va="bottom", fontsize=10)
+            for bar in bars
+        ]
+        panel.artists.update(cubuklar=bars, yazilar=yazilar)
 
-    canvas = FigureCanvasTkAgg(fig, master=container)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        if isinstance(container, tk.Toplevel):
+            ttk.Button(container, text="Kapat", command=container.destroy).pack(pady=6)
 
-    if isinstance(container, tk.Toplevel):
-        ttk.Button(container, text="Kapat", command=container.destroy).pack(pady=6)
+    # Yenilemede yalnızca yükseklikler ve etiketler değişir
+    for bar, yazi, oran in zip(panel.artists["cubuklar"], panel.artists["yazilar"], oranlar):
+        bar.set_height(oran)
+        yazi.set_y(oran + 3)
+        yazi.set_text(f"{oran:.0f}%")
+    panel.redraw()
 
 
 # ---------------------------------------------------------------------------
@@ -380,18 +361,6 @@ def show_progress(hasta_id: int, parent: tk.Widget | None = None):
 # ---------------------------------------------------------------------------
 
 def show_blood_sugar_graph(hasta_id: int, parent: tk.Widget | None = None):
-    db = Database();
-    db.connect()
-    data = db.get_insulin_averages_for_graph(hasta_id)
-    db.close()
-
-    if not data:
-        messagebox.showinfo("Bilgi", "Gösterilecek kan şekeri verisi bulunamadı.")
-        return
-
-    tarih_list = [row[0].strftime("%d.%m.%Y") for row in data]
-    ortalama_list = [float(row[1]) for row in data]
-
     if parent is None:
         win = tk.Toplevel()
         win.title("Günlük Kan Şekeri Grafiği")
@@ -399,23 +368,58 @@ def show_blood_sugar_graph(hasta_id: int, parent: tk.Widget | None = None):
         create_style()
         container = win
     else:
-        for child in parent.winfo_children():
-            child.destroy()
+        figure_manager.clear(parent, keep="kan_sekeri")
         container = parent
 
-    fig, ax = plt.subplots(figsize=(6, 4))
-    ax.plot(tarih_list, ortalama_list, marker="o", linestyle="-", color="blue")
-    ax.set_title("Günlük Ortalama Kan Şekeri Seviyesi")
-    ax.set_xlabel("Tarih")
-    ax.set_ylabel("Ortalama Seviye (mg/dL)")
-    ax.tick_params(axis="x", rotation=45)
+    # Uzun geçmişte günlük yerine haftalık/aylık özet gelir (GRAPH_CONFIG['max_points'])
+    run_async(container, lambda db: db.get_glucose_series(hasta_id),
+              on_success=lambda sonuc: _draw_blood_sugar_graph(container, *sonuc))
 
-    canvas = FigureCanvasTkAgg(fig, master=container)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-    if isinstance(container, tk.Toplevel):
-        ttk.Button(container, text="Kapat", command=container.destroy).pack(pady=6)
+def _draw_blood_sugar_graph(container: tk.Widget, donem: str, data) -> None:
+    if not data:
+        figure_manager.release(container, "kan_sekeri")
+        messagebox.showinfo("Bilgi", "Gösterilecek kan şekeri verisi bulunamadı.")
+        if isinstance(container, tk.Toplevel):
+            container.destroy()
+        return
+
+    tarih_list = [donem_etiketi(row[0], donem) for row in data]
+    ortalama_list = [float(row[1]) for row in data]
+    x = list(range(len(data)))
+
+    panel = figure_manager.panel(container, "kan_sekeri", figsize=(6, 4),
+                                 fill=tk.BOTH, expand=True, padx=10, pady=10)
+    ax = panel.ax
+    if "cizgi" not in panel.artists:
+        (panel.artists["cizgi"],) = ax.plot(x, ortalama_list, marker="o", linestyle="-", color="blue")
+        ax.set_xlabel("Tarih")
+        ax.set_ylabel("Ortalama Seviye (mg/dL)")
+        ax.tick_params(axis="x", rotation=45)
+        if isinstance(container, tk.Toplevel):
+            ttk.Button(container, text="Kapat", command=container.destroy).pack(pady=6)
+    else:
+        panel.artists["cizgi"].set_data(x, ortalama_list)
+
+    # Dönem değişmiş olabilir: bant ve lejant her yenilemede yeniden kurulur
+    eski_bant = panel.artists.pop("bant", None)
+    if eski_bant is not None:
+        eski_bant.remove()
+    if ax.get_legend() is not None:
+        ax.get_legend().remove()
+    ax.relim()
+    if donem != "gun":
+        # Hafta/ay noktalarında dönemin en düşük–en yüksek aralığı
+        panel.artists["bant"] = ax.fill_between(
+            x, [row[2] for row in data], [row[3] for row in data],
+            color="blue", alpha=0.15, label="En düşük – en yüksek")
+        ax.legend(loc="best")
+    ax.autoscale_view()
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(tarih_list)
+    ax.set_title(f"{DONEM_ADLARI[donem]} Ortalama Kan Şekeri Seviyesi")
+    panel.redraw()
 
 
 # ---------------------------------------------------------------------------
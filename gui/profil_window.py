@@ -1,13 +1,13 @@
 # gui/profil_window.py
 import tkinter as tk
 from tkinter import filedialog
-from PIL import Image, ImageTk
 import os
 import shutil
 
 from core.database import Database
+from core.thumbnail_cache import thumbnail_cache
 
-def upload_profile_picture(user_id: int, img_label: tk.Label):
+def upload_profile_picture(user_id: int, img_label: tk.Label, size: int = 120):
     filepath = filedialog.askopenfilename(
         title="Profil Fotoğrafı Seç",
         filetypes=[("Resim Dosyaları", "*.png *.jpg *.jpeg *.gif")]
@@ -31,16 +31,13 @@ def upload_profile_picture(user_id: int, img_label: tk.Label):
     )
     db.close()
 
-    load_profile_picture(target_path, img_label)
+    # Küçük görseller bir kez, şimdi üretilir; paneller sonra önbellekten okur
+    thumbnail_cache.generate(target_path)
+    load_profile_picture(target_path, img_label, size)
 
-def load_profile_picture(img_path: str, label: tk.Label):
+def load_profile_picture(img_path: str, label: tk.Label, size: int = 120):
     full_path = os.path.join(os.getcwd(), img_path)
-    if os.path.exists(full_path):
-        img = Image.open(full_path)
-        img = img.resize((120, 120))
-        photo = ImageTk.PhotoImage(img)
-        label.config(image=photo)
-        label.image = photo
+    thumbnail_cache.load_into(label, full_path, size)
 
 
 def open_profile_window(user_id: int):
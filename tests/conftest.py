@@ -0,0 +1,28 @@
+# tests/conftest.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""Testlerin ortak fikstürleri."""
+import pytest
+
+from core.database import Database
+from core.db_backends import create_backend
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """
+    Geçici klasörde, göçleri uygulanmış SQLite veritabanına bağlı Database üretir:
+        db = sqlite_db("uyari.db")
+    Test bitince bağlantılar iade edilip kapatılır.
+    """
+    acilanlar = []
+
+    def ac(dosya_adi: str) -> Database:
+        db = Database(backend=create_backend("sqlite", path=str(tmp_path / dosya_adi)))
+        db.connect()
+        acilanlar.append(db)
+        return db
+
+    yield ac
+    for db in acilanlar:
+        db.close()
+        db.backend.closeall()
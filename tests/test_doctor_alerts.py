@@ -0,0 +1,64 @@
+# tests/test_doctor_alerts.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Database.generate_all_doctor_alerts: değişen gün işaretleri (data/migrations/sqlite/0007).
+
+Geçici SQLite veritabanında eklenen, güncellenen ve silinen ölçümlerin
+günlerinin yeniden değerlendirildiği; değişmeyen günlere dokunulmadığı denetlenir.
+"""
+from datetime import date, datetime
+
+import pytest
+
+_GUN = date(2025, 3, 10)
+
+
+@pytest.fixture
+def db(sqlite_db):
+    db = sqlite_db("doktor.db")
+    db.add_user("10000000011", "Deneme", "Hasta", "sifre", date(1980, 1, 1),
+                "Erkek", "doktor-uyari@example.invalid", "hasta")
+    return db
+
+
+def _hasta(db):
+    return db.get_user_by_tc("10000000011")[0]
+
+
+def _olcum(db, hasta_id, saat, seviye, gun=_GUN):
+    db.ingest_blood_sugar(hasta_id, datetime.combine(gun, datetime.min.time()).replace(hour=saat), seviye)
+
+
+def _tipler(db, hasta_id, gun=_GUN):
+    return {r[2] for r in db.get_doctor_alerts(hasta_id) if r[1] == gun}
+
+
+def test_yalnizca_degisen_gunler(db):
+    hasta_id = _hasta(db)
+    for saat, seviye in ((7, 90), (12, 95), (18, 100)):
+        _olcum(db, hasta_id, saat, seviye)
+    _olcum(db, hasta_id, 7, 90, gun=date(2025, 3, 11))
+
+    assert db.generate_all_doctor_alerts(hasta_id) == 2
+    assert db.generate_all_doctor_alerts(hasta_id) == 0
+    assert _tipler(db, hasta_id) == set()
+    assert _tipler(db, hasta_id, date(2025, 3, 11)) == {"Ölçüm Yetersiz Uyarısı"}
+
+
+def test_guncellenen_ve_silinen_olcum(db):
+    hasta_id = _hasta(db)
+    for saat, seviye in ((7, 90), (12, 95), (18, 250)):
+        _olcum(db, hasta_id, saat, seviye)
+    db.generate_all_doctor_alerts(hasta_id)
+    assert _tipler(db, hasta_id) == {"Acil Müdahale Uyarısı"}
+
+    # Yanlış girilen ölçüm düzeltildi: gün yeniden değerlendirilir, eski uyarı kalkar
+    with db.transaction():
+        db.execute_query("UPDATE kan_sekeri_olcumleri SET seviye = 140 WHERE hasta_id = %s AND seviye = 250;",
+                         (hasta_id,))
+    assert db.generate_all_doctor_alerts(hasta_id) == 1
+    assert _tipler(db, hasta_id) == {"Takip Uyarısı"}
+
+    db.delete_blood_sugar(hasta_id, datetime.combine(_GUN, datetime.min.time()).replace(hour=12))
+    assert db.generate_all_doctor_alerts(hasta_id) == 1
+    assert _tipler(db, hasta_id) == {"Takip Uyarısı", "Ölçüm Yetersiz Uyarısı"}
@@ -0,0 +1,107 @@
+# tests/test_email_outbox.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+EmailOutbox: kira (lease) partiden kısa olsa da hiçbir ileti iki kez gönderilmez.
+
+Süreç içinde yavaş bir deneme SMTP sunucusu açılır (her DATA yanıtı
+gecikmeli). Aynı SQLite kuyruğunu iki gönderici (iki doktor istemcisi)
+birlikte boşaltır; partinin süresi kiranın birkaç katıdır. Sunucuya ulaşan
+her alıcı tam bir kez görülmelidir.
+"""
+import io
+import contextlib
+import socketserver
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from core.email_outbox import EmailOutbox
+
+_ILETI = 12
+_GECIKME = 0.25          # ileti başına sunucu gecikmesi (sn)
+_KIRA = 0.8              # parti süresi ≈ 12 × 0.25 = 3 sn
+
+
+class _YavasIsleyici(socketserver.StreamRequestHandler):
+    def yaz(self, satir: str) -> None:
+        self.wfile.write((satir + "\r\n").encode())
+
+    def handle(self) -> None:
+        self.yaz("220 deneme ESMTP")
+        alicilar = []
+        while True:
+            satir = self.rfile.readline()
+            if not satir:
+                return
+            komut = satir.decode(errors="replace").strip()
+            ust = komut.upper()
+            if ust.startswith("EHLO"):
+                self.yaz("250-deneme")
+                self.yaz("250 8BITMIME")
+            elif ust.startswith("RCPT"):
+                alicilar.append(komut.split(":", 1)[1].strip(" <>"))
+                self.yaz("250 OK")
+            elif ust == "DATA":
+                self.yaz("354 devam")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                time.sleep(_GECIKME)
+                with self.server.kilit:
+                    self.server.alinan.extend(alicilar)
+                alicilar = []
+                self.yaz("250 OK")
+            elif ust == "QUIT":
+                self.yaz("221 güle güle")
+                return
+            else:
+                self.yaz("250 OK")
+
+
+class _YavasSunucu(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _YavasIsleyici)
+        self.alinan = []
+        self.kilit = threading.Lock()
+
+
+@pytest.fixture
+def sunucu():
+    s = _YavasSunucu()
+    threading.Thread(target=s.serve_forever, daemon=True).start()
+    yield s
+    s.shutdown()
+    s.server_close()
+
+
+def _gonderici(backend, port):
+    return EmailOutbox(sender="test@example.invalid", host="127.0.0.1", port=port, user=None,
+                       password=None, starttls=False, timeout=5.0, batch_size=_ILETI,
+                       poll_interval=0.05, lease=_KIRA, backend=backend)
+
+
+def test_kira_partiden_kisa_iken_tekrar_gonderim_yok(sqlite_db, sunucu):
+    db = sqlite_db("eposta.db")
+    port = sunucu.server_address[1]
+    a, b = _gonderici(db.backend, port), _gonderici(db.backend, port)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        alicilar = [f"hasta{i}@example.invalid" for i in range(_ILETI)]
+        a.enqueue_many([(alici, "Giriş", "şifre: 1234") for alici in alicilar], db)
+        db.connection.commit()
+        a.start()
+        time.sleep(_KIRA * 1.5)            # a partinin tamamını aldı; kira dolmak üzere
+        b.start()
+        son = time.monotonic() + 30
+        while time.monotonic() < son and a.queue_depth(db).get("gonderildi", 0) < _ILETI:
+            time.sleep(0.1)
+        a.stop()
+        b.stop()
+
+    assert a.queue_depth(db) == {"gonderildi": _ILETI}
+    assert Counter(sunucu.alinan) == Counter(alicilar)     # her alıcı tam bir kez
+    assert db.fetch_all("SELECT govde FROM eposta_kuyrugu WHERE govde <> '';") == []
@@ -0,0 +1,66 @@
+# tests/test_get_alerts.py
+# ────────────────────────────────────────────────────────────────────────────────
+"""
+Database.get_alerts: bekleyen uyarı sayısından bağımsız sabit sorgu sayısı.
+
+Geçici klasördeki SQLite veritabanında 1 ve 50 okunmamış uyarı için
+get_alerts çağrılır; bağlantının sqlite3 iz (trace) geri çağrısıyla sunucuya
+giden ifadeler sayılır. İki durumda da sayı aynı olmalı.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def db(sqlite_db):
+    return sqlite_db("uyari.db")
+
+
+def _hasta(db, tc_no):
+    db.add_user(tc_no, "Deneme", "Hasta", "sifre", date(1980, 1, 1),
+                "Kadın", f"{tc_no}@example.invalid", "hasta")
+    return db.get_user_by_tc(tc_no)[0]
+
+
+def _uyari_ekle(db, hasta_id, adet):
+    bugun = date.today()
+    db.execute_values("""
+        INSERT INTO uyarilar (hasta_id, tarih, uyari_tipi, mesaj, bildirildi)
+        VALUES %s;
+    """, [(hasta_id, bugun - timedelta(days=i), "Takip Uyarısı", f"uyarı {i}", False)
+          for i in range(adet)])
+    db.connection.commit()
+
+
+def _sorgu_sayisi(db, hasta_id):
+    ifadeler = []
+    db.connection.set_trace_callback(ifadeler.append)
+    try:
+        rows = db.get_alerts(hasta_id)
+    finally:
+        db.connection.set_trace_callback(None)
+    return rows, len(ifadeler)
+
+
+def test_get_alerts_sorgu_sayisi_sabit(db):
+    az, cok = _hasta(db, "10000000001"), _hasta(db, "10000000002")
+    _uyari_ekle(db, az, 1)
+    _uyari_ekle(db, cok, 50)
+    db.get_alerts(_hasta(db, "10000000003"))        # ifade önbelleği ısınsın
+
+    rows_az, sayi_az = _sorgu_sayisi(db, az)
+    rows_cok, sayi_cok = _sorgu_sayisi(db, cok)
+
+    assert len(rows_az) == 1 and len(rows_cok) == 50
+    assert sayi_az == sayi_cok
+    assert [r[3] for r in rows_cok] == [f"uyarı {i}" for i in range(50)]     # yeniden eskiye
+
+
+def test_get_alerts_isaretler(db):
+    hasta_id = _hasta(db, "10000000004")
+    _uyari_ekle(db, hasta_id, 3)
+
+    assert all(r[4] is False for r in db.get_alerts(hasta_id))
+    assert db.get_alerts(hasta_id) == []
+    assert db.fetch_one("SELECT COUNT(*) FROM uyarilar WHERE bildirildi = FALSE;")[0] == 0